@@ -1,25 +1,144 @@
 from __future__ import annotations
 
+import argparse
+import importlib
+import os
+import sqlite3
 import sys
-from PyQt6.QtWidgets import QApplication
-from router_qt import AppShellQt, PALETTE  # type: ignore
-from qfluentwidgets import setTheme, Theme, setThemeColor
+import threading
+from typing import Optional
 
+from pages_logic import startup_trace
+
+STARTUP_BUDGET_MS = 3000.0  # --startup-check: launch -> first paint
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gym_management.db")
+
+
+def _parse_args(argv):
+    ap = argparse.ArgumentParser(description="GymPro")
+    ap.add_argument("--trace", metavar="FILE", help=f"write a Chrome-trace JSON of startup (or set {startup_trace.ENV_VAR})")
+    ap.add_argument("--startup-check", action="store_true",
+                    help="offscreen launch, exit after first paint; exit code 1 when over --budget-ms")
+    ap.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    ap.add_argument("--db", default=DB_PATH, help="GymPro database (default: %(default)s)")
+    return ap.parse_known_args(argv)[0]
+
+
+class _LazyService:
+    """
+    Stands in for a service until it is opened. Attribute lookups are answered from the service
+    class, so the pages' hasattr() checks (GUI thread) never touch the database; the first call
+    opens it on the calling thread, which for queries is the fetch pool. A service that cannot
+    open (e.g. a database without the accounting tables) raises that error from every call, and
+    the pages fall back to demo data as on any query error.
+    """
+    def __init__(self, module: str, cls_name: str, *args):
+        self._module, self._cls_name, self._args = module, cls_name, args
+        self._lock = threading.Lock()
+        self._service = None
+        self._error: Optional[sqlite3.Error] = None
+
+    def _cls(self):
+        return getattr(importlib.import_module(self._module), self._cls_name)
+
+    def open(self):
+        with self._lock:  # first calls may race on pool threads
+            if self._service is None and self._error is None:
+                try:
+                    self._service = self._cls()(*self._args)
+                except sqlite3.Error as e:
+                    self._error = e
+            if self._error is not None:
+                raise self._error
+            return self._service
+
+    def __getattr__(self, name):
+        attr = getattr(self._cls(), name)  # AttributeError: hasattr() is False, nothing opened
+        if not callable(attr):
+            return getattr(self.open(), name)
+
+        def call(*args, **kwargs):
+            return getattr(self.open(), name)(*args, **kwargs)
+        return call
+
+
+class Services:
+    """
+    What the pages reach through `services`. Pages check hasattr() before using a service and
+    fall back to demo data otherwise. Services open on their first query (a fetch pool thread)
+    or, sooner, from warm(), which the shell calls once the first page has painted.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.accounting = _LazyService("pages_logic.accounting_service", "AccountingService", db_path)
+        self.members = _LazyService("pages_logic.member_service", "MemberService", db_path)
+
+    def warm(self) -> None:
+        """Open every service on the fetch pool's report lane (errors surface on first use)."""
+        from pages_logic import fetch_pool
+        for svc in (self.accounting, self.members):
+            fetch_pool.shared().submit(svc.open, lane="report", key=None, interruptible=False)
+
+
+def _startup_check(app: QApplication, budget_ms: float) -> None:
+    """Quit once the first page has painted; report and compare against the budget."""
+    from PyQt6.QtCore import QTimer
+
+    def poll():
+        first = startup_trace.elapsed_ms("first-paint")
+        if first is None:
+            QTimer.singleShot(10, poll)
+            return
+        s = startup_trace.summary()
+        print(f"first paint: {first:.0f} ms (budget {budget_ms:.0f} ms)")
+        print(f"imports:     {s['import_ms']:.0f} ms")
+        for name, ms in s["slowest_imports"][:8]:
+            print(f"  {ms:8.1f} ms  {name}")
+        for name, ms in s["spans"]:
+            print(f"  {ms:8.1f} ms  {name}")
+        path = startup_trace.write()
+        if path:
+            print(f"trace: {path}")
+        app.exit(0 if first <= budget_ms else 1)
+
+    QTimer.singleShot(0, poll)
+
+
+def main(argv=None):
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    if args.startup_check:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # tracer first, so PyQt6 / qfluentwidgets imports are timed too
+    if args.trace or args.startup_check:
+        startup_trace.enable(args.trace or os.environ.get(startup_trace.ENV_VAR))
+    else:
+        startup_trace.enable_from_env()
+
+    with startup_trace.span("imports: Qt + shell", "startup"):
+        from PyQt6.QtWidgets import QApplication
+        from router_qt import AppShellQt, PALETTE  # type: ignore
+        from qfluentwidgets import setTheme, Theme, setThemeColor
 
-def main():
     app = QApplication(sys.argv)
     # Apply Fluent Material theme in dark mode to match existing visual identity
-    try:
-        setTheme(Theme.DARK)
-        if isinstance(PALETTE, dict) and 'accent' in PALETTE:
-            # Use app accent from router palette
-            from PyQt6.QtGui import QColor
-            setThemeColor(QColor(PALETTE['accent']))
-    except Exception:
-        pass
-    shell = AppShellQt(services=None, start_route="Home")
-    shell.show()
-    sys.exit(app.exec())
+    with startup_trace.span("theme", "startup"):
+        try:
+            setTheme(Theme.DARK)
+            if isinstance(PALETTE, dict) and 'accent' in PALETTE:
+                # Use app accent from router palette
+                from PyQt6.QtGui import QColor
+                setThemeColor(QColor(PALETTE['accent']))
+        except Exception:
+            pass
+    with startup_trace.span("shell", "startup"):
+        shell = AppShellQt(services=Services(args.db), start_route="Home")
+        shell.show()
+    if args.startup_check:
+        _startup_check(app, args.budget_ms)
+    code = app.exec()
+    if startup_trace.enabled() and not args.startup_check:
+        startup_trace.write()
+    sys.exit(code)
 
 
 if __name__ == "__main__":
@@ -4,8 +4,15 @@ from __future__ import annotations
 
 import csv
 import datetime as dt
+import functools
 import sqlite3
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pages_logic import search_index
+from pages_logic.db_pool import ConnectionPool, require_tables
+from pages_logic.export_service import ExportJob
+from pages_logic.permissions import ACCOUNTING, Z_EXPORT, requires
+from pages_logic.query_cache import MISS, QueryCache
 
 # -------- date helpers --------
 def _iso(date_like: dt.date | dt.datetime | str) -> str:
@@ -31,37 +38,457 @@ def _month_bounds(anchor: dt.date) -> Tuple[str, str]:
         end = (start.replace(month=start.month + 1, day=1) - dt.timedelta(days=1))
     return f"{start:%Y-%m-%d} 00:00:00", f"{end:%Y-%m-%d} 23:59:59"
 
+def _half_open(start: str, end: str) -> Tuple[str, str]:
+    """
+    Inclusive 'YYYY-MM-DD hh:mm:ss' bounds -> half-open [first_day, day_after_end).
+    Compared against the raw date columns so idx_*_date can drive a SEARCH.
+    """
+    last = dt.date.fromisoformat(str(end)[:10])
+    return str(start)[:10], (last + dt.timedelta(days=1)).isoformat()
+
+# -------- invoice fragments (aliases: o = pos_orders, pay = payments, m = members) --------
+_FULL_NAME = "TRIM(COALESCE(m.first_name,'')||' '||COALESCE(m.last_name,''))"
+_POS_STAMP = "(o.order_date || ' ' || COALESCE(o.order_time,''))"  # matches idx_pos_orders_stamp
+# paid / method come from the trigger-maintained pos_orders payment summary (see below)
+_POS_PAID = "o.paid_total"
+_POS_METHOD = "CASE WHEN o.succeeded_method_count > 1 THEN 'Mixed' ELSE COALESCE(o.primary_method,'—') END"
+_POS_STATUS_T = ("CASE WHEN {r}paid_total >= COALESCE({r}total_amount,0) AND COALESCE({r}total_amount,0) > 0 THEN 'paid' "
+                 "WHEN {r}paid_total > 0 THEN 'partial' ELSE 'open' END")
+_POS_STATUS = _POS_STATUS_T.format(r="o.")  # same expression as idx_pos_orders_paystatus
+# payment row status -> invoice status (pending/failed/refunded are all 'open')
+_SUB_STATUS = "CASE WHEN pay.status = 'succeeded' THEN 'paid' ELSE 'open' END"
+
+# -------- Z-report statements (range params: first_day, day_after_end) --------
+Z_POS_ORDERS_SQL = """
+SELECT COALESCE(SUM(o.total_amount),0)
+FROM pos_orders o
+WHERE o.order_date >= ? AND o.order_date < ?
+"""
+
+# POS: receipts = orders whose first succeeded payment falls in the window. An order paid over
+# several days is one receipt, on its first payment day, so receipts add up across days and
+# the daily rollup (pos_orders.first_paid_day) gives the same count for any span.
+Z_POS_PAYMENTS_SQL = """
+SELECT
+  COALESCE(SUM(CASE WHEN pp.status='refunded' THEN pp.amount END),0) AS refunds,
+  COALESCE(SUM(CASE WHEN pp.status='succeeded' AND pp.method='Cash' THEN pp.amount END),0) AS cash,
+  COALESCE(SUM(CASE WHEN pp.status='succeeded' AND pp.method='Card' THEN pp.amount END),0) AS card,
+  COALESCE(SUM(CASE WHEN pp.status='succeeded' AND pp.method='Transfer' THEN pp.amount END),0) AS transfer,
+  COUNT(DISTINCT CASE WHEN pp.status='succeeded' THEN CASE WHEN NOT EXISTS (
+      SELECT 1 FROM pos_payments x
+      WHERE x.order_id = pp.order_id AND x.status = 'succeeded'
+        AND x.payment_date < substr(pp.payment_date,1,10)
+    ) THEN pp.order_id END END) AS receipts
+FROM pos_payments pp
+WHERE pp.payment_date >= ? AND pp.payment_date < ?
+"""
+
+# Subscriptions: gross = succeeded payments, receipts = succeeded payment rows
+Z_PAYMENTS_SQL = """
+SELECT
+  COALESCE(SUM(CASE WHEN p.status='succeeded' THEN p.amount END),0) AS gross,
+  COALESCE(SUM(CASE WHEN p.status='refunded' THEN p.amount END),0) AS refunds,
+  COALESCE(SUM(CASE WHEN p.status='succeeded' AND p.method='Cash' THEN p.amount END),0) AS cash,
+  COALESCE(SUM(CASE WHEN p.status='succeeded' AND p.method='Card' THEN p.amount END),0) AS card,
+  COALESCE(SUM(CASE WHEN p.status='succeeded' AND p.method='Transfer' THEN p.amount END),0) AS transfer,
+  COUNT(CASE WHEN p.status='succeeded' THEN 1 END) AS receipts
+FROM payments p
+WHERE p.payment_date >= ? AND p.payment_date < ?
+"""
+
+# Period buckets over a raw timestamp column (bucket = first day of the period, as z_report)
+_BUCKETS = {
+    "Daily": "substr({c},1,10)",
+    "Weekly": "date(substr({c},1,10), 'weekday 0', '-6 days')",  # Monday, as _week_bounds
+    "Monthly": "substr({c},1,7) || '-01'",
+}
+
+def _grouped(sql: str, col: str, period: str) -> str:
+    """A Z statement above -> the same aggregates per period bucket of `col` (one GROUP BY, same index range)."""
+    bucket = _BUCKETS[period].format(c=col)
+    return sql.replace("SELECT", f"SELECT {bucket} AS bucket,", 1) + "GROUP BY bucket\n"
+
+def _period_span(period: str, anchor: dt.date) -> Tuple[dt.date, dt.date]:
+    bounds = {"Weekly": _week_bounds, "Monthly": _month_bounds}.get(period, _day_bounds)
+    s, e = bounds(anchor)
+    return dt.date.fromisoformat(s[:10]), dt.date.fromisoformat(e[:10])
+
+def _z_metrics(*, pos_gross, sub_gross, refunds, cash, card, transfer, count) -> Dict[str, Any]:
+    """Raw sums -> the numeric part of a Z-report dict (net derived, types normalized)."""
+    pos_gross = pos_gross or 0
+    sub_gross = sub_gross or 0
+    refunds = refunds or 0
+    return {
+        "pos_gross": float(pos_gross),
+        "sub_gross": float(sub_gross),
+        "refunds": float(refunds),
+        "net": float(max(0, pos_gross + sub_gross - refunds)),
+        "cash": float(cash or 0),
+        "card": float(card or 0),
+        "transfer": float(transfer or 0),
+        "count": int(count or 0),
+    }
+
+INVOICE_COLUMNS = ("no", "date", "typ", "who", "method", "total", "paid", "status")
+Z_DAY_COLUMNS = ("day", "pos_gross", "sub_gross", "refunds", "net", "cash", "card", "transfer", "count")
+
+# -------- daily rollup --------
+# daily_rollup holds one row per (day, source, method, status):
+#   sub          payments rows                  amount_sum = amounts,      receipt_count = rows
+#   pos          pos_payments rows              amount_sum = amounts,      receipt_count = rows
+#   pos_order    pos_orders (method '')         amount_sum = total_amount, receipt_count = orders
+#   pos_receipt  pos_orders by first_paid_day ('' / 'succeeded')
+#                                               amount_sum = 0,            receipt_count = orders first paid that day
+# Triggers apply +/- deltas on every insert/update/delete of the source tables; pos_receipt
+# follows pos_orders.first_paid_day, which the payment-summary triggers keep current.
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_rollup(
+  day TEXT NOT NULL,
+  source TEXT NOT NULL,
+  method TEXT NOT NULL DEFAULT '',
+  status TEXT NOT NULL DEFAULT '',
+  amount_sum REAL NOT NULL DEFAULT 0,
+  receipt_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY(day, source, method, status)
+) WITHOUT ROWID;
+"""
+
+# Full recomputation from the raw tables (backfill & consistency check)
+ROLLUP_SELECT_SQL = """
+SELECT substr(p.payment_date,1,10) AS day, 'sub' AS source, COALESCE(p.method,'') AS method,
+       COALESCE(p.status,'') AS status, SUM(COALESCE(p.amount,0)) AS amount_sum, COUNT(1) AS receipt_count
+FROM payments p WHERE p.payment_date IS NOT NULL GROUP BY 1, 3, 4
+UNION ALL
+SELECT substr(pp.payment_date,1,10), 'pos', COALESCE(pp.method,''), COALESCE(pp.status,''),
+       SUM(COALESCE(pp.amount,0)), COUNT(1)
+FROM pos_payments pp WHERE pp.payment_date IS NOT NULL GROUP BY 1, 3, 4
+UNION ALL
+SELECT substr(o.order_date,1,10), 'pos_order', '', COALESCE(o.status,''),
+       SUM(COALESCE(o.total_amount,0)), COUNT(1)
+FROM pos_orders o WHERE o.order_date IS NOT NULL GROUP BY 1, 4
+UNION ALL
+SELECT o.first_paid_day, 'pos_receipt', '', 'succeeded', 0, COUNT(1)
+FROM pos_orders o WHERE o.first_paid_day IS NOT NULL GROUP BY 1
+"""
+
+# Per-day Z-report metrics from the rollup (params: first_day, last_day inclusive)
+Z_ROLLUP_DAYS_SQL = """
+SELECT
+  day,
+  SUM(CASE WHEN source='pos_order' THEN amount_sum END) AS pos_gross,
+  SUM(CASE WHEN source='sub' AND status='succeeded' THEN amount_sum END) AS sub_gross,
+  SUM(CASE WHEN source IN ('sub','pos') AND status='refunded' THEN amount_sum END) AS refunds,
+  SUM(CASE WHEN source IN ('sub','pos') AND status='succeeded' AND method='Cash' THEN amount_sum END) AS cash,
+  SUM(CASE WHEN source IN ('sub','pos') AND status='succeeded' AND method='Card' THEN amount_sum END) AS card,
+  SUM(CASE WHEN source IN ('sub','pos') AND status='succeeded' AND method='Transfer' THEN amount_sum END) AS transfer,
+  SUM(CASE WHEN source='pos_receipt' OR (source='sub' AND status='succeeded') THEN receipt_count END) AS count
+FROM daily_rollup
+WHERE day >= ? AND day <= ?
+GROUP BY day
+ORDER BY day
+"""
+
+_ROLLUP_DELTA = """
+  INSERT INTO daily_rollup(day, source, method, status, amount_sum, receipt_count)
+  SELECT substr({day},1,10), '{source}', {method}, {status}, {sign}COALESCE({amount},0), {sign}{count}
+  WHERE {day} IS NOT NULL{extra}
+  ON CONFLICT(day, source, method, status) DO UPDATE SET
+    amount_sum = amount_sum + excluded.amount_sum,
+    receipt_count = receipt_count + excluded.receipt_count;
+  DELETE FROM daily_rollup
+  WHERE day = substr({day},1,10) AND source = '{source}' AND receipt_count <= 0;"""
+
+def _receipt_delta(r: str, sign: str) -> str:
+    """Add (sign '') or remove (sign '-') the receipt of pos_orders row `r` (NEW / OLD)."""
+    return _ROLLUP_DELTA.format(day=f"{r}.first_paid_day", source="pos_receipt", method="''",
+                                status="'succeeded'", amount="0", count="1", sign=sign, extra="")
+
+
+def _rollup_deltas(table: str, r: str, sign: str) -> str:
+    """Trigger body statements that add (sign '') or remove (sign '-') row `r` from daily_rollup."""
+    if table == "payments":
+        return _ROLLUP_DELTA.format(day=f"{r}.payment_date", source="sub", method=f"COALESCE({r}.method,'')",
+                                    status=f"COALESCE({r}.status,'')", amount=f"{r}.amount", count="1",
+                                    sign=sign, extra="")
+    if table == "pos_orders":
+        return _ROLLUP_DELTA.format(day=f"{r}.order_date", source="pos_order", method="''",
+                                    status=f"COALESCE({r}.status,'')", amount=f"{r}.total_amount", count="1",
+                                    sign=sign, extra="")
+    return _ROLLUP_DELTA.format(day=f"{r}.payment_date", source="pos", method=f"COALESCE({r}.method,'')",
+                                status=f"COALESCE({r}.status,'')", amount=f"{r}.amount", count="1",
+                                sign=sign, extra="")
+
+
+def _rollup_triggers() -> str:
+    out = []
+    for table in ("payments", "pos_payments", "pos_orders"):
+        out.append(f"CREATE TRIGGER IF NOT EXISTS trg_rollup_{table}_ai AFTER INSERT ON {table} BEGIN"
+                   f"{_rollup_deltas(table, 'NEW', '')}\nEND;")
+        out.append(f"CREATE TRIGGER IF NOT EXISTS trg_rollup_{table}_ad AFTER DELETE ON {table} BEGIN"
+                   f"{_rollup_deltas(table, 'OLD', '-')}\nEND;")
+        # pos_orders: only the rolled-up columns (payment-summary refreshes must not churn the rollup)
+        cols = " OF order_date, status, total_amount" if table == "pos_orders" else ""
+        out.append(f"CREATE TRIGGER IF NOT EXISTS trg_rollup_{table}_au AFTER UPDATE{cols} ON {table} BEGIN"
+                   f"{_rollup_deltas(table, 'OLD', '-')}{_rollup_deltas(table, 'NEW', '')}\nEND;")
+    # receipts: an order enters / leaves / moves between days with its first_paid_day
+    out.append(f"CREATE TRIGGER IF NOT EXISTS trg_rollup_receipt_ai AFTER INSERT ON pos_orders BEGIN"
+               f"{_receipt_delta('NEW', '')}\nEND;")
+    out.append(f"CREATE TRIGGER IF NOT EXISTS trg_rollup_receipt_ad AFTER DELETE ON pos_orders BEGIN"
+               f"{_receipt_delta('OLD', '-')}\nEND;")
+    out.append("CREATE TRIGGER IF NOT EXISTS trg_rollup_receipt_au AFTER UPDATE OF first_paid_day ON pos_orders "
+               f"WHEN OLD.first_paid_day IS NOT NEW.first_paid_day BEGIN"
+               f"{_receipt_delta('OLD', '-')}{_receipt_delta('NEW', '')}\nEND;")
+    return "\n".join(out)
+
+# -------- pos_orders payment summary --------
+# Denormalized from the order's succeeded pos_payments, so invoice paid/status/method are
+# plain column reads (and the status filter an index search) instead of per-order aggregates:
+#   paid_total              SUM(amount)
+#   succeeded_method_count  COUNT(DISTINCT method)
+#   primary_method          method carrying the largest amount (ties: alphabetical)
+#   first_paid_day          day of the first payment (the day its receipt counts)
+# Triggers recompute the summary of every order a pos_payments write touches.
+POS_SUMMARY_COLUMNS = (
+    ("paid_total", "REAL NOT NULL DEFAULT 0"),
+    ("succeeded_method_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("primary_method", "TEXT"),
+    ("first_paid_day", "TEXT"),
+)
+
+_POS_SUMMARY_SET = """
+    paid_total = (SELECT COALESCE(SUM(x.amount),0) FROM pos_payments x
+                  WHERE x.order_id = pos_orders.order_id AND x.status = 'succeeded'),
+    succeeded_method_count = (SELECT COUNT(DISTINCT x.method) FROM pos_payments x
+                              WHERE x.order_id = pos_orders.order_id AND x.status = 'succeeded'),
+    primary_method = (SELECT x.method FROM pos_payments x
+                      WHERE x.order_id = pos_orders.order_id AND x.status = 'succeeded' AND x.method IS NOT NULL
+                      GROUP BY x.method ORDER BY SUM(x.amount) DESC, x.method LIMIT 1),
+    first_paid_day = (SELECT MIN(substr(x.payment_date,1,10)) FROM pos_payments x
+                      WHERE x.order_id = pos_orders.order_id AND x.status = 'succeeded')"""
+
+# Set-based backfill (one pass over pos_payments instead of three lookups per order)
+POS_SUMMARY_BACKFILL_SQL = """
+UPDATE pos_orders SET paid_total = 0, succeeded_method_count = 0, primary_method = NULL, first_paid_day = NULL;
+UPDATE pos_orders SET paid_total = a.paid, succeeded_method_count = a.n, primary_method = a.pm, first_paid_day = a.day
+FROM (
+  SELECT order_id, COALESCE(SUM(amt),0) AS paid, COUNT(method) AS n,
+         MAX(CASE WHEN rk = 1 THEN method END) AS pm, MIN(day) AS day
+  FROM (
+    SELECT order_id, method, SUM(amount) AS amt, MIN(substr(payment_date,1,10)) AS day,
+           ROW_NUMBER() OVER (PARTITION BY order_id ORDER BY method IS NULL, SUM(amount) DESC, method) AS rk
+    FROM pos_payments WHERE status = 'succeeded'
+    GROUP BY order_id, method
+  )
+  GROUP BY order_id
+) a
+WHERE a.order_id = pos_orders.order_id;
+"""
+
+
+def _pos_summary_triggers() -> str:
+    refresh = "UPDATE pos_orders SET{set} WHERE order_id IN ({ids});"
+    return "\n".join(
+        f"CREATE TRIGGER IF NOT EXISTS trg_paysum_pos_payments_{suffix} AFTER {event} ON pos_payments BEGIN "
+        + refresh.format(set=_POS_SUMMARY_SET, ids=ids) + " END;"
+        for suffix, event, ids in (("ai", "INSERT", "NEW.order_id"), ("ad", "DELETE", "OLD.order_id"),
+                                   ("au", "UPDATE", "OLD.order_id, NEW.order_id"))
+    )
+
+# -------- invoice statements --------
+INVOICE_SQL_VARIANTS = 16  # fts x status x method x cursor
+
+@functools.lru_cache(maxsize=INVOICE_SQL_VARIANTS)
+def _invoice_sql(use_fts: bool, by_status: bool, by_method: bool, paged: bool) -> str:
+    """
+    The invoice statement for one filter shape. Values are always bound parameters, so the 16
+    shapes are the only texts ever produced: built once here, and each connection's sqlite3
+    statement cache then keeps them prepared across calls.
+    """
+    # ---- POS arm (one row per order; payments looked up per order) ----
+    if use_fts:
+        pos_where = """
+      AND (
+            o.member_id IN (SELECT ref FROM search_fts WHERE body LIKE :like AND kind = 'name') OR
+            o.order_id IN (SELECT ref FROM search_fts WHERE body LIKE :like AND kind = 'pos')
+          )"""
+    else:
+        pos_where = """
+      AND (
+            :q = '' OR
+            o.order_id LIKE :like OR
+            """ + _FULL_NAME + """ LIKE :like
+          )"""
+    if by_status:
+        pos_where += f" AND ({_POS_STATUS}) = :status"
+    if by_method:
+        # Include orders that have at least one succeeded payment in that method;
+        # only mixed-method orders need to look at their payments
+        pos_where += """
+      AND (
+            o.primary_method = :method OR (
+              o.succeeded_method_count > 1 AND EXISTS (
+                SELECT 1 FROM pos_payments pp
+                WHERE pp.order_id = o.order_id
+                  AND pp.status = 'succeeded'
+                  AND pp.method = :method
+              )
+            )
+          )"""
+
+    # ---- Subscriptions arm (each succeeded/pending/failed/refunded payment row) ----
+    if use_fts:
+        sub_where = """
+      AND (
+            pay.subscription_id IN (
+              SELECT s2.subscription_id FROM subscriptions s2
+              WHERE s2.member_id IN (SELECT ref FROM search_fts WHERE body LIKE :like AND kind = 'name')
+            ) OR
+            pay.payment_id IN (SELECT ref FROM search_fts WHERE body LIKE :like AND kind = 'sub')
+          )"""
+    else:
+        sub_where = """
+      AND (
+            :q = '' OR
+            pay.payment_id LIKE :like OR
+            """ + _FULL_NAME + """ LIKE :like
+          )"""
+    if by_status:
+        sub_where += f" AND ({_SUB_STATUS}) = :status"
+    if by_method:
+        sub_where += " AND COALESCE(pay.method,'—') = :method"
+
+    if paged:
+        # the plain <= keeps each arm an index range; the row value breaks ties
+        pos_where += f"""
+      AND {_POS_STAMP} <= :c_date
+      AND ({_POS_STAMP}, 'POS', o.order_id) < (:c_date, :c_typ, :c_no)"""
+        sub_where += """
+      AND pay.payment_date <= :c_date
+      AND (pay.payment_date, 'Subscription', pay.payment_id) < (:c_date, :c_typ, :c_no)"""
+
+    sql = f"""
+    SELECT
+      o.order_id AS no,
+      {_POS_STAMP} AS date,
+      'POS' AS typ,
+      COALESCE(NULLIF({_FULL_NAME},''), 'Walk-in') AS who,
+      {_POS_METHOD} AS method,
+      COALESCE(o.total_amount, 0) AS total,
+      {_POS_PAID} AS paid,
+      {_POS_STATUS} AS status
+    FROM pos_orders o
+    LEFT JOIN members m ON m.member_id = o.member_id
+    WHERE 1=1{pos_where}
+
+    UNION ALL
+
+    SELECT
+      pay.payment_id AS no,
+      pay.payment_date AS date,
+      'Subscription' AS typ,
+      COALESCE(NULLIF({_FULL_NAME},''), '—') AS who,
+      COALESCE(pay.method,'—') AS method,
+      pay.amount AS total,
+      CASE WHEN pay.status = 'succeeded' THEN pay.amount ELSE 0 END AS paid,
+      {_SUB_STATUS} AS status
+    FROM payments pay
+    LEFT JOIN subscriptions s ON s.subscription_id = pay.subscription_id
+    LEFT JOIN members m ON m.member_id = s.member_id
+    WHERE 1=1{sub_where}
+
+    ORDER BY date DESC, typ DESC, no DESC
+    LIMIT :lim
+    """
+    return sql
+
+
+# -------- data version --------
+# Bumped by every insert/update/delete on the tables the accounting reads depend on;
+# cached results are only served while the version they were computed at is current.
+DATA_VERSION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS data_version(
+  name TEXT PRIMARY KEY,
+  version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO data_version(name, version) VALUES ('accounting', 0);
+"""
+
+
+# table -> columns whose updates matter ("" = any); members / subscriptions only feed the
+# invoice "who" column, so a status or phone change does not drop cached reports
+_VERSIONED = {
+    "payments": "", "pos_payments": "", "pos_orders": "",
+    "members": "first_name, last_name", "subscriptions": "member_id",
+}
+
+
+def _version_triggers() -> str:
+    bump = "UPDATE data_version SET version = version + 1 WHERE name = 'accounting';"
+    return "\n".join(
+        f"CREATE TRIGGER IF NOT EXISTS trg_version_{table}_{suffix} AFTER {event} ON {table} BEGIN {bump} END;"
+        for table, cols in _VERSIONED.items()
+        for suffix, event in (("ai", "INSERT"), ("ad", "DELETE"), ("au", f"UPDATE OF {cols}" if cols else "UPDATE"))
+    )
+
 # -------- service --------
+REQUIRED_TABLES = ("members", "subscriptions", "payments", "pos_orders", "pos_payments")
+
+
 class AccountingService:
     """
     Methods:
-      - search_invoices(q, status, method, limit)
+      - search_invoices(q, status, method, limit, after) / invoice_cursor(row)
       - z_report(period, anchor_date)
+      - z_report_range(start, end, per_day)
+      - z_matrix(period, start, end, anchors) -> one Z row per day/week/month
       - export_z(period, anchor_date, path)
+      - export_invoices(path, q, status, method) / export_z_days(path, start, end) -> ExportJob
+      - rebuild_rollup() / check_rollup(start, end) / rebuild_pos_summary()
+      - data_version() / cache_stats() / clear_cache()
+
+    search_invoices, z_report and z_report_range are served from an LRU+TTL cache while the
+    accounting data version is unchanged (results are shared: treat them as read-only).
 
     Data model used:
       members(member_id, first_name, last_name)
       subscriptions(subscription_id, member_id, start_date, end_date, status, created_at, updated_at)
       payments(payment_id, subscription_id, amount, payment_date, method, status, created_at, updated_at)
 
-      pos_orders(order_id, member_id, order_date, order_time, status, total_amount, created_at, updated_at)
+      pos_orders(order_id, member_id, order_date, order_time, status, total_amount, created_at, updated_at,
+                 paid_total, succeeded_method_count, primary_method)   <- maintained from pos_payments
       pos_order_lines(line_id, order_id, product_id, quantity, unit_price, line_total)
       pos_payments(pos_payment_id, order_id, amount, payment_date, method, status, created_at, updated_at)
     """
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, *, cache_size: int = 256, cache_ttl: float = 60.0):
         self.db_path = db_path
-        self._conn = sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-        self._conn.row_factory = sqlite3.Row
+        require_tables(db_path, REQUIRED_TABLES)
+        # safe to share across threads: reads use a per-thread connection, writes are serialized
+        self._pool = ConnectionPool(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+        self._cache = QueryCache(cache_size, cache_ttl)  # cache_size=0 disables
         self._ensure_indexes()
+        self._ensure_pos_summary()
+        self._ensure_rollup()  # receipts are rolled up from pos_orders.first_paid_day
+        self._ensure_data_version()
+        with self._pool.writer() as conn:
+            self._fts = search_index.ensure_search_index(conn)
 
     # ---------- infra ----------
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """The calling thread's read connection."""
+        return self._pool.reader()
+
+    def close(self) -> None:
+        self._pool.close()
+
     def _ensure_indexes(self):
-        cur = self._conn.cursor()
-        cur.executescript(
+        with self._pool.writer() as conn:
+            conn.executescript(
             """
             -- POS
             CREATE INDEX IF NOT EXISTS idx_pos_orders_date ON pos_orders(order_date, order_time);
             CREATE INDEX IF NOT EXISTS idx_pos_orders_member ON pos_orders(member_id);
+            CREATE INDEX IF NOT EXISTS idx_pos_orders_stamp ON pos_orders((order_date || ' ' || COALESCE(order_time,'')));
             CREATE INDEX IF NOT EXISTS idx_pos_payments_order ON pos_payments(order_id);
             CREATE INDEX IF NOT EXISTS idx_pos_payments_date ON pos_payments(payment_date, status, method);
 
@@ -74,13 +501,116 @@ class AccountingService:
             CREATE INDEX IF NOT EXISTS idx_members_name ON members(last_name, first_name);
             """
         )
-        self._conn.commit()
+
+    def _ensure_rollup(self):
+        with self._pool.writer() as conn:
+            existed = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='daily_rollup'"
+            ).fetchone() is not None
+            conn.executescript(ROLLUP_SCHEMA + _rollup_triggers())
+        if not existed:
+            self.rebuild_rollup()
+
+    def _ensure_pos_summary(self):
+        with self._pool.writer() as conn:
+            present = {r[1] for r in conn.execute("PRAGMA table_info(pos_orders)").fetchall()}
+            missing = [(c, decl) for c, decl in POS_SUMMARY_COLUMNS if c not in present]
+            for col, decl in missing:
+                conn.execute(f"ALTER TABLE pos_orders ADD COLUMN {col} {decl}")
+            conn.executescript(
+                _pos_summary_triggers()
+                + "\nCREATE INDEX IF NOT EXISTS idx_pos_orders_paystatus ON pos_orders("
+                + _POS_STATUS_T.format(r="") + ", (order_date || ' ' || COALESCE(order_time,'')));"
+            )
+        if missing:
+            self.rebuild_pos_summary()
+
+    def rebuild_pos_summary(self) -> int:
+        """Recompute paid_total / succeeded_method_count / primary_method for every order. Returns orders with payments."""
+        with self._pool.writer() as conn:
+            conn.executescript("BEGIN;" + POS_SUMMARY_BACKFILL_SQL + "COMMIT;")
+            return conn.execute("SELECT COUNT(1) FROM pos_orders WHERE succeeded_method_count > 0 OR paid_total != 0").fetchone()[0]
+
+    def _ensure_data_version(self):
+        with self._pool.writer() as conn:
+            conn.executescript(DATA_VERSION_SCHEMA + _version_triggers())
+
+    def data_version(self) -> int:
+        """
+        Counter bumped by every write to payments / pos_payments / pos_orders, and by member
+        renames / subscription moves (any connection).
+        """
+        row = self._conn.execute("SELECT version FROM data_version WHERE name = 'accounting'").fetchone()
+        return row[0] if row else 0
+
+    def _cached(self, key: Tuple[Any, ...], compute):
+        if not self._cache.enabled:
+            return compute()
+        # version read before the query: a result newer than its version only costs a recompute
+        version = self.data_version()
+        value = self._cache.get(key, version)
+        if value is MISS:
+            value = compute()
+            self._cache.put(key, version, value)
+        return value
+
+    def cache_stats(self) -> Dict[str, int]:
+        """{size, hits, misses, evictions, expired, invalidated} of the result cache."""
+        return self._cache.stats()
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def rebuild_rollup(self) -> int:
+        """Recompute daily_rollup from the raw tables (backfill / repair). Returns the row count."""
+        with self._pool.writer() as conn:
+            conn.execute("DELETE FROM daily_rollup")
+            conn.execute(
+                "INSERT INTO daily_rollup(day, source, method, status, amount_sum, receipt_count) "
+                + ROLLUP_SELECT_SQL
+            )
+            return conn.execute("SELECT COUNT(1) FROM daily_rollup").fetchone()[0]
+
+    def check_rollup(self, start: Optional[dt.date] = None, end: Optional[dt.date] = None) -> List[Dict[str, Any]]:
+        """
+        Compares daily_rollup with a fresh recomputation (optionally limited to [start, end]).
+        Returns one dict per mismatching key: {day, source, method, status, stored, expected};
+        an empty list means the rollup is consistent.
+        """
+        lo = _iso(start) if start else "0000-00-00"
+        hi = _iso(end) if end else "9999-99-99"
+        conn = self._conn
+        conn.execute("BEGIN")  # one snapshot for both reads, even with concurrent writers
+        try:
+            fresh = {
+                tuple(r[:4]): (round(r[4], 2), r[5])
+                for r in conn.execute(
+                    f"SELECT * FROM ({ROLLUP_SELECT_SQL}) WHERE day BETWEEN ? AND ?", (lo, hi)
+                ).fetchall()
+            }
+            stored = {
+                tuple(r[:4]): (round(r[4], 2), r[5])
+                for r in conn.execute(
+                    "SELECT day, source, method, status, amount_sum, receipt_count "
+                    "FROM daily_rollup WHERE day BETWEEN ? AND ?", (lo, hi)
+                ).fetchall()
+            }
+        finally:
+            conn.rollback()
+        out = []
+        for key in sorted(fresh.keys() | stored.keys()):
+            if fresh.get(key) != stored.get(key):
+                day, source, method, status = key
+                out.append({"day": day, "source": source, "method": method, "status": status,
+                            "stored": stored.get(key), "expected": fresh.get(key)})
+        return out
 
     def _q(self) -> sqlite3.Cursor:
         return self._conn.cursor()
 
     # ---------- invoices search ----------
-    def search_invoices(self, q: str = "", status: str = "Any", method: str = "Any", limit: int = 120) -> List[Dict[str, Any]]:
+    def search_invoices(self, q: str = "", status: str = "Any", method: str = "Any", limit: int = 120,
+                        after: Optional[Tuple[str, str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Returns a mixed list of POS orders and Subscription payments normalized to:
           {no, date, typ, who, method, total, paid, status}
@@ -88,148 +618,46 @@ class AccountingService:
           paid = SUM(successful pos_payments.amount)
           status derived from paid vs total; method = 'Mixed' if >1 successful methods seen, else method
         - Subscription "invoice" is each payment row (payments table) with status mapping.
+
+        Rows come newest first, ordered by (date, typ, no) DESC. Keyset pagination:
+        pass after=invoice_cursor(last_row) to fetch the page that follows it.
         """
         q = (q or "").strip()
         status = (status or "Any").lower()
         method = (method or "Any").capitalize()
 
-        like = f"%{q}%"
+        limit = int(limit)
+        after = tuple(after) if after else None
 
-        cur = self._q()
+        def run() -> List[Dict[str, Any]]:
+            sql, params = self._invoice_query(q, status, method, limit, after)
+            return [dict(r) for r in self._q().execute(sql, params).fetchall()]
 
-        # ---- POS block (aggregate by order) ----
-        # paid_total & methods (distinct) computed from pos_payments (status=succeeded)
-        pos_sql = """
-        WITH pay AS (
-          SELECT
-            p.order_id,
-            SUM(CASE WHEN p.status='succeeded' THEN p.amount ELSE 0 END) AS paid_total,
-            COUNT(DISTINCT CASE WHEN p.status='succeeded' THEN p.method END) AS mcount,
-            MIN(CASE WHEN p.status='succeeded' THEN p.method END) AS one_method -- if mcount=1 use this
-          FROM pos_payments p
-          GROUP BY p.order_id
-        ),
-        who AS (
-          SELECT m.member_id,
-                 TRIM(COALESCE(m.first_name,'')||' '||COALESCE(m.last_name,'')) AS full_name
-          FROM members m
-        )
-        SELECT
-          o.order_id AS no,
-          (o.order_date || ' ' || COALESCE(o.order_time,'')) AS date,
-          'POS' AS typ,
-          COALESCE(NULLIF(w.full_name,''), 'Walk-in') AS who,
-          CASE WHEN COALESCE(pay.mcount,0) > 1 THEN 'Mixed'
-               WHEN COALESCE(pay.mcount,0) = 1 THEN pay.one_method
-               ELSE '—' END AS method,
-          COALESCE(o.total_amount, 0) AS total,
-          COALESCE(pay.paid_total, 0) AS paid,
-          CASE
-            WHEN COALESCE(pay.paid_total,0) >= COALESCE(o.total_amount,0) AND COALESCE(o.total_amount,0) > 0 THEN 'paid'
-            WHEN COALESCE(pay.paid_total,0) > 0 THEN 'partial'
-            ELSE 'open'
-          END AS status
-        FROM pos_orders o
-        LEFT JOIN pay ON pay.order_id = o.order_id
-        LEFT JOIN who w ON w.member_id = o.member_id
-        WHERE 1=1
-          AND (
-                :q = '' OR
-                o.order_id LIKE :like OR
-                COALESCE(w.full_name,'') LIKE :like
-              )
-        """
+        return self._cached(("search_invoices", q, status, method, limit, after), run)
 
-        pos_params = {"q": q, "like": like}
-
-        if status != "any":
-            pos_sql += " AND (CASE WHEN COALESCE(pay.paid_total,0) >= COALESCE(o.total_amount,0) AND COALESCE(o.total_amount,0) > 0 THEN 'paid' WHEN COALESCE(pay.paid_total,0) > 0 THEN 'partial' ELSE 'open' END) = :pstatus"
-            pos_params["pstatus"] = status
+    @staticmethod
+    def invoice_cursor(row: Dict[str, Any]) -> Tuple[str, str, Any]:
+        """Keyset cursor of an invoice row, for search_invoices(after=...)."""
+        return (row["date"], row["typ"], row["no"])
 
-        if method != "Any":
-            # Include orders that have at least one succeeded payment in that method
-            pos_sql += """
-                AND EXISTS (
-                    SELECT 1 FROM pos_payments pp
-                    WHERE pp.order_id = o.order_id
-                      AND pp.status = 'succeeded'
-                      AND pp.method = :pmethod
-                )
-            """
-            pos_params["pmethod"] = method
-
-        pos_sql += " ORDER BY date DESC LIMIT :lim"
-        pos_params["lim"] = int(limit)
-
-        pos_rows = [dict(r) for r in cur.execute(pos_sql, pos_params).fetchall()]
-
-        # ---- Subscriptions block (each succeeded/pending/failed/refunded payment row) ----
-        # We treat each payment row as one invoice-like record.
-        sub_sql = """
-        WITH who AS (
-          SELECT m.member_id,
-                 TRIM(COALESCE(m.first_name,'')||' '||COALESCE(m.last_name,'')) AS full_name
-          FROM members m
-        )
-        SELECT
-          pay.payment_id AS no,
-          pay.payment_date AS date,
-          'Subscription' AS typ,
-          COALESCE(NULLIF(w.full_name,''), '—') AS who,
-          COALESCE(pay.method,'—') AS method,
-          pay.amount AS total,
-          CASE
-            WHEN pay.status = 'succeeded' THEN pay.amount
-            WHEN pay.status = 'pending' THEN 0
-            WHEN pay.status = 'failed' THEN 0
-            WHEN pay.status = 'refunded' THEN 0
-            ELSE 0
-          END AS paid,
-          CASE
-            WHEN pay.status = 'succeeded' THEN 'paid'
-            WHEN pay.status = 'pending' THEN 'open'
-            WHEN pay.status = 'failed' THEN 'open'
-            WHEN pay.status = 'refunded' THEN 'open'
-            ELSE 'open'
-          END AS status
-        FROM payments pay
-        LEFT JOIN subscriptions s ON s.subscription_id = pay.subscription_id
-        LEFT JOIN who w ON w.member_id = s.member_id
-        WHERE 1=1
-          AND (
-                :q = '' OR
-                pay.payment_id LIKE :like OR
-                COALESCE(w.full_name,'') LIKE :like
-              )
+    def _invoice_query(self, q: str, status: str, method: str, limit: int,
+                       after: Optional[Tuple[str, str, Any]] = None) -> Tuple[str, Dict[str, Any]]:
         """
-        sub_params = {"q": q, "like": like}
-
+        One UNION ALL statement over both sources; inputs already normalized by search_invoices.
+        Each arm walks its date index newest first (idx_pos_orders_stamp / idx_payments_date) and
+        SQLite merges the two ordered streams, so a page costs ~limit rows whatever its depth.
+        Filters apply to the order rows themselves; payments are only summed for orders that pass.
+        """
+        params: Dict[str, Any] = {"q": q, "like": f"%{q}%", "lim": int(limit)}
+        use_fts = bool(q and self._fts and search_index.use_index(q))
         if status != "any":
-            # map to our normalized 'status' alias above
-            sub_sql += """
-                AND (CASE
-                       WHEN pay.status='succeeded' THEN 'paid'
-                       WHEN pay.status='pending' THEN 'open'
-                       WHEN pay.status='failed' THEN 'open'
-                       WHEN pay.status='refunded' THEN 'open'
-                       ELSE 'open'
-                     END) = :sstatus
-            """
-            sub_params["sstatus"] = status
-
+            params["status"] = status
         if method != "Any":
-            sub_sql += " AND COALESCE(pay.method,'—') = :smethod"
-            sub_params["smethod"] = method
-
-        sub_sql += " ORDER BY date DESC LIMIT :lim"
-        sub_params["lim"] = int(limit)
-
-        sub_rows = [dict(r) for r in cur.execute(sub_sql, sub_params).fetchall()]
-
-        # Merge + top limit across both, sorted by date desc
-        combined = pos_rows + sub_rows
-        combined.sort(key=lambda r: r.get("date") or "", reverse=True)
-        return combined[:limit]
+            params["method"] = method
+        if after is not None:
+            params["c_date"], params["c_typ"], params["c_no"] = after
+        sql = _invoice_sql(use_fts, status != "any", method != "Any", after is not None)
+        return sql, params
 
     # ---------- Z-Report ----------
     def z_report(self, period: str, anchor_date: dt.date) -> Dict[str, Any]:
@@ -252,130 +680,7 @@ class AccountingService:
         else:
             start, end = _day_bounds(anchor_date)
 
-        cur = self._q()
-
-        # POS gross from orders in date window
-        pos_gross = cur.execute(
-            """
-            SELECT COALESCE(SUM(o.total_amount),0)
-            FROM pos_orders o
-            WHERE (o.order_date || ' ' || COALESCE(o.order_time,'')) BETWEEN ? AND ?
-            """,
-            (start, end),
-        ).fetchone()[0] or 0
-
-        # Subscriptions gross from succeeded payments
-        sub_gross = cur.execute(
-            """
-            SELECT COALESCE(SUM(p.amount),0)
-            FROM payments p
-            WHERE p.status='succeeded'
-              AND (p.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """,
-            (start, end),
-        ).fetchone()[0] or 0
-
-        # Refunds (both sources)
-        pos_refunds = cur.execute(
-            """
-            SELECT COALESCE(SUM(pp.amount),0)
-            FROM pos_payments pp
-            WHERE pp.status='refunded'
-              AND (pp.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """,
-            (start, end),
-        ).fetchone()[0] or 0
-
-        sub_refunds = cur.execute(
-            """
-            SELECT COALESCE(SUM(p.amount),0)
-            FROM payments p
-            WHERE p.status='refunded'
-              AND (p.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """,
-            (start, end),
-        ).fetchone()[0] or 0
-
-        refunds = (pos_refunds or 0) + (sub_refunds or 0)
-        net = max(0, (pos_gross or 0) + (sub_gross or 0) - (refunds or 0))
-
-        # Payment method totals (succeeded only)
-        cash_pos = cur.execute(
-            """
-            SELECT COALESCE(SUM(pp.amount),0)
-            FROM pos_payments pp
-            WHERE pp.status='succeeded' AND pp.method='Cash'
-              AND (pp.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """, (start, end)
-        ).fetchone()[0] or 0
-        card_pos = cur.execute(
-            """
-            SELECT COALESCE(SUM(pp.amount),0)
-            FROM pos_payments pp
-            WHERE pp.status='succeeded' AND pp.method='Card'
-              AND (pp.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """, (start, end)
-        ).fetchone()[0] or 0
-        transfer_pos = cur.execute(
-            """
-            SELECT COALESCE(SUM(pp.amount),0)
-            FROM pos_payments pp
-            WHERE pp.status='succeeded' AND pp.method='Transfer'
-              AND (pp.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """, (start, end)
-        ).fetchone()[0] or 0
-
-        cash_sub = cur.execute(
-            """
-            SELECT COALESCE(SUM(p.amount),0)
-            FROM payments p
-            WHERE p.status='succeeded' AND p.method='Cash'
-              AND (p.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """, (start, end)
-        ).fetchone()[0] or 0
-        card_sub = cur.execute(
-            """
-            SELECT COALESCE(SUM(p.amount),0)
-            FROM payments p
-            WHERE p.status='succeeded' AND p.method='Card'
-              AND (p.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """, (start, end)
-        ).fetchone()[0] or 0
-        transfer_sub = cur.execute(
-            """
-            SELECT COALESCE(SUM(p.amount),0)
-            FROM payments p
-            WHERE p.status='succeeded' AND p.method='Transfer'
-              AND (p.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """, (start, end)
-        ).fetchone()[0] or 0
-
-        cash = (cash_pos or 0) + (cash_sub or 0)
-        card = (card_pos or 0) + (card_sub or 0)
-        transfer = (transfer_pos or 0) + (transfer_sub or 0)
-
-        # Count of receipts:
-        # - POS: only orders that have at least one succeeded payment in window
-        pos_count = cur.execute(
-            """
-            SELECT COUNT(DISTINCT pp.order_id)
-            FROM pos_payments pp
-            WHERE pp.status='succeeded'
-              AND (pp.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """, (start, end)
-        ).fetchone()[0] or 0
-
-        # - Subscriptions: count of succeeded payment rows in window
-        sub_count = cur.execute(
-            """
-            SELECT COUNT(1)
-            FROM payments p
-            WHERE p.status='succeeded'
-              AND (p.payment_date || ' 00:00:00') BETWEEN ? AND ?
-            """, (start, end)
-        ).fetchone()[0] or 0
-
-        count = (pos_count or 0) + (sub_count or 0)
+        totals = self._cached(("z_totals", start, end), lambda: self._z_totals(start, end))
 
         # Parse start/end back to dates for UI
         s_date = dt.date.fromisoformat(start[:10])
@@ -385,17 +690,134 @@ class AccountingService:
             "period": period,
             "start": s_date,
             "end": e_date,
-            "pos_gross": float(pos_gross or 0),
-            "sub_gross": float(sub_gross or 0),
-            "refunds": float(refunds or 0),
-            "net": float(net or 0),
-            "cash": float(cash or 0),
-            "card": float(card or 0),
-            "transfer": float(transfer or 0),
-            "count": int(count or 0),
+            **totals,
         }
 
+    def _z_totals(self, start: str, end: str) -> Dict[str, Any]:
+        """
+        Single-pass aggregation engine behind z_report.
+        One scan of pos_orders for the gross, then one conditional-aggregation
+        scan per payment table (keyed by status and method) for everything else.
+        """
+        cur = self._q()
+        rng = _half_open(start, end)
+
+        pos_gross = cur.execute(Z_POS_ORDERS_SQL, rng).fetchone()[0] or 0
+        pos = cur.execute(Z_POS_PAYMENTS_SQL, rng).fetchone()
+        sub = cur.execute(Z_PAYMENTS_SQL, rng).fetchone()
+        return self._z_combine(pos_gross, pos, sub)
+
+    @staticmethod
+    def _z_combine(pos_gross: Any, pos: Optional[sqlite3.Row], sub: Optional[sqlite3.Row]) -> Dict[str, Any]:
+        """Z_POS_ORDERS / Z_POS_PAYMENTS / Z_PAYMENTS results -> Z metrics (missing rows count as zero)."""
+        def g(r, k):
+            return (r[k] or 0) if r is not None else 0
+        return _z_metrics(
+            pos_gross=pos_gross or 0,
+            sub_gross=g(sub, "gross"),
+            refunds=g(pos, "refunds") + g(sub, "refunds"),
+            cash=g(pos, "cash") + g(sub, "cash"),
+            card=g(pos, "card") + g(sub, "card"),
+            transfer=g(pos, "transfer") + g(sub, "transfer"),
+            count=g(pos, "receipts") + g(sub, "receipts"),
+        )
+
+    def z_report_range(self, start: dt.date, end: dt.date, per_day: bool = False) -> Dict[str, Any]:
+        """
+        Z-report over any inclusive [start, end] span, read from daily_rollup
+        (one PK range search, at most one group of rows per day).
+        Same keys as z_report with period='Range'; with per_day=True also
+        'days': [{day, pos_gross, ..., count}] for every day in the span (zeros included).
+        A POS order is one receipt, on the day of its first succeeded payment, as in z_report,
+        so the totals equal z_report over the same span.
+        """
+        if isinstance(start, str):
+            start = dt.date.fromisoformat(start[:10])
+        if isinstance(end, str):
+            end = dt.date.fromisoformat(end[:10])
+        if end < start:
+            start, end = end, start
+        return self._cached(("z_report_range", start, end, bool(per_day)),
+                            lambda: self._z_range(start, end, per_day))
+
+    def _z_range(self, start: dt.date, end: dt.date, per_day: bool) -> Dict[str, Any]:
+        rows = self._q().execute(Z_ROLLUP_DAYS_SQL, (_iso(start), _iso(end))).fetchall()
+
+        keys = ("pos_gross", "sub_gross", "refunds", "cash", "card", "transfer", "count")
+        sums = dict.fromkeys(keys, 0)
+        for r in rows:
+            for k in keys:
+                sums[k] += r[k] or 0
+
+        out = {"period": "Range", "start": start, "end": end, **_z_metrics(**sums)}
+        if per_day:
+            by_day = {r["day"]: r for r in rows}
+            days = []
+            d = start
+            while d <= end:
+                r = by_day.get(d.isoformat())
+                day_sums = {k: (r[k] or 0) if r else 0 for k in keys}
+                days.append({"day": d, **_z_metrics(**day_sums)})
+                d += dt.timedelta(days=1)
+            out["days"] = days
+        return out
+
+    def z_matrix(self, period: str = "Daily", start: Optional[dt.date] = None, end: Optional[dt.date] = None,
+                 *, anchors: Optional[List[dt.date]] = None, exact: bool = False) -> List[Dict[str, Any]]:
+        """
+        Many Z-reports in one call, oldest first: one row per Daily/Weekly/Monthly period covering
+        [start, end], or one per distinct period containing each of `anchors`. Rows are shaped like
+        z_report(period, row['start']): {period, start, end, pos_gross, ..., count}; quiet periods are zeros.
+
+        Reads the daily rollup once and folds days into periods, so the cost barely depends on the
+        number of periods. exact=True instead runs one GROUP BY per source table over the raw rows
+        (slower; the same numbers, as receipts count on the order's first payment day either way).
+        """
+        period = (period or "Daily").capitalize()
+        if period not in _BUCKETS:
+            period = "Daily"
+        if anchors is not None:
+            spans = sorted({_period_span(period, a) for a in anchors})
+        else:
+            if start is None or end is None:
+                raise ValueError("z_matrix needs start and end, or anchors")
+            if end < start:
+                start, end = end, start
+            spans, d = [], start
+            while d <= end:
+                spans.append(_period_span(period, d))
+                d = spans[-1][1] + dt.timedelta(days=1)
+        if not spans:
+            return []
+        return self._cached(("z_matrix", period, tuple(spans), exact),
+                            lambda: self._z_matrix(period, spans, exact))
+
+    def _z_matrix(self, period: str, spans: List[Tuple[dt.date, dt.date]], exact: bool) -> List[Dict[str, Any]]:
+        first, last = spans[0][0], spans[-1][1]
+        cur = self._q()
+        if not exact:
+            keys = ("pos_gross", "sub_gross", "refunds", "cash", "card", "transfer", "count")
+            sums = {s: dict.fromkeys(keys, 0) for s, _e in spans}
+            for r in cur.execute(Z_ROLLUP_DAYS_SQL, (_iso(first), _iso(last))):
+                acc = sums.get(_period_span(period, dt.date.fromisoformat(r["day"]))[0])
+                if acc is not None:  # anchors mode: days between the requested periods
+                    for k in keys:
+                        acc[k] += r[k] or 0
+            metrics = lambda s: _z_metrics(**sums[s])
+        else:
+            rng = _half_open(_iso(first), _iso(last))
+            gross = {r["bucket"]: r[1] for r in
+                     cur.execute(_grouped(Z_POS_ORDERS_SQL, "o.order_date", period), rng).fetchall()}
+            pos = {r["bucket"]: r for r in
+                   cur.execute(_grouped(Z_POS_PAYMENTS_SQL, "pp.payment_date", period), rng).fetchall()}
+            sub = {r["bucket"]: r for r in
+                   cur.execute(_grouped(Z_PAYMENTS_SQL, "p.payment_date", period), rng).fetchall()}
+            metrics = lambda s: self._z_combine(gross.get(s.isoformat()), pos.get(s.isoformat()),
+                                                sub.get(s.isoformat()))
+        return [{"period": period, "start": s, "end": e, **metrics(s)} for s, e in spans]
+
     # ---------- export ----------
+    @requires(Z_EXPORT)
     def export_z(self, period: str, anchor_date: dt.date, path: str) -> None:
         data = self.z_report(period, anchor_date)
         with open(path, "w", newline="", encoding="utf-8") as f:
@@ -408,3 +830,73 @@ class AccountingService:
                 if isinstance(v, dt.date):
                     v = v.isoformat()
                 w.writerow([k, v])
+
+
+    # ---------- streaming export ----------
+    def iter_invoices(self, q: str = "", status: str = "Any", method: str = "Any",
+                      chunk: int = 500) -> Iterator[Tuple[Any, ...]]:
+        """Every matching invoice as an INVOICE_COLUMNS tuple, newest first, streamed from the cursor."""
+        q = (q or "").strip()
+        status = (status or "Any").lower()
+        method = (method or "Any").capitalize()
+        sql, params = self._invoice_query(q, status, method, -1)  # LIMIT -1: no limit
+        cur = self._q().execute(sql, params)
+        while True:
+            rows = cur.fetchmany(chunk)
+            if not rows:
+                break
+            for r in rows:
+                yield tuple(r)
+
+    def iter_z_days(self, start: dt.date, end: dt.date) -> Iterator[Tuple[Any, ...]]:
+        """Per-day Z-report series over [start, end] as Z_DAY_COLUMNS tuples (quiet days included)."""
+        keys = ("pos_gross", "sub_gross", "refunds", "cash", "card", "transfer", "count")
+        zero = _z_metrics(**dict.fromkeys(keys, 0))
+        d = start
+        for r in self._q().execute(Z_ROLLUP_DAYS_SQL, (_iso(start), _iso(end))):
+            day = dt.date.fromisoformat(r["day"])
+            for _ in range((day - d).days):
+                yield (d.isoformat(), *(zero[k] for k in Z_DAY_COLUMNS[1:]))
+                d += dt.timedelta(days=1)
+            m = _z_metrics(**{k: r[k] for k in keys})
+            yield (r["day"], *(m[k] for k in Z_DAY_COLUMNS[1:]))
+            d = day + dt.timedelta(days=1)
+        for _ in range((end - d).days + 1):
+            yield (d.isoformat(), *(zero[k] for k in Z_DAY_COLUMNS[1:]))
+            d += dt.timedelta(days=1)
+
+    @requires(ACCOUNTING)
+    def export_invoices(self, path: str, q: str = "", status: str = "Any", method: str = "Any", *,
+                        fmt: Optional[str] = None, on_progress=None, on_done=None) -> ExportJob:
+        """Starts a background export of the invoice list (CSV, or gzip CSV for '.gz' paths / fmt='csv.gz')."""
+        return ExportJob(path, INVOICE_COLUMNS, lambda: self.iter_invoices(q, status, method),
+                         fmt=fmt, on_progress=on_progress, on_done=on_done).start()
+
+    @requires(Z_EXPORT)
+    def export_z_days(self, path: str, start: dt.date, end: dt.date, *,
+                      fmt: Optional[str] = None, on_progress=None, on_done=None) -> ExportJob:
+        """Starts a background export of the per-day Z-report series."""
+        return ExportJob(path, Z_DAY_COLUMNS, lambda: self.iter_z_days(start, end),
+                         fmt=fmt, on_progress=on_progress, on_done=on_done).start()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m pages_logic.accounting_service")
+    ap.add_argument("command", choices=["rollup-rebuild", "rollup-check"])
+    ap.add_argument("--db", default="gym_management.db")
+    args = ap.parse_args(argv)
+
+    svc = AccountingService(args.db)
+    if args.command == "rollup-rebuild":
+        print(f"daily_rollup rebuilt: {svc.rebuild_rollup()} rows")
+    else:
+        bad = svc.check_rollup()
+        for row in bad[:50]:
+            print(row)
+        print(f"{len(bad)} inconsistent rollup rows")
+        raise SystemExit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# pages_logic/async_accounting.py
+# GymPro — asyncio facade over AccountingService (shared fetch pool, request coalescing, supersede)
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import weakref
+from typing import Any, Callable, Coroutine, Dict, Optional, Tuple
+
+from pages_logic import fetch_pool
+
+
+class _Shared:
+    """One executor job and the number of awaiters still interested in it."""
+    __slots__ = ("job", "waiters")
+
+    def __init__(self, job: concurrent.futures.Future):
+        self.job = job
+        self.waiters = 0
+
+
+def _settle(waiter: asyncio.Future, job: concurrent.futures.Future) -> None:
+    # runs on the waiter's loop
+    if waiter.done():
+        return
+    if job.cancelled():
+        waiter.cancel()
+    elif job.exception() is not None:
+        waiter.set_exception(job.exception())
+    else:
+        waiter.set_result(job.result())
+
+
+class AsyncAccounting:
+    """
+    Methods (coroutines):
+      - search_invoices(q, status, method, limit, after)   lane "invoices", pool lane "page"
+      - z_report(period, anchor_date)                       pool lane "report"
+      - z_report_range(start, end, per_day)                lane "z", pool lane "report"
+      - submit(coro, on_result, on_error) -> concurrent Future (for callers without a running loop)
+
+    Queries run on the application-wide FetchPool (fetch_pool.shared()), never on the caller's
+    loop, so a Z report queues behind scans and page refreshes like every other report.
+    - Identical calls already in flight share one job (results are shared: treat as read-only).
+    - Calls in a lane supersede each other: the previous awaiter gets CancelledError and its
+      job, when nobody else is waiting on it, is dropped from the queue or has its query
+      interrupted.
+    - Qt pages have no asyncio loop: submit() runs the coroutine on a private loop thread and
+      fires the callbacks there, so pages relay them through a signal. Under a qasync-style
+      loop the coroutines can be awaited directly instead.
+    """
+    def __init__(self, service: Any, *, pool: Optional[fetch_pool.FetchPool] = None):
+        self.service = service
+        self._pool = pool or fetch_pool.shared()
+        self._lock = threading.RLock()  # RLock: cancelling a queued job runs its callbacks inline
+        self._inflight: Dict[Tuple[Any, ...], _Shared] = {}
+        self._lanes: Dict[str, Tuple[asyncio.Future, asyncio.AbstractEventLoop]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self.coalesced = 0    # calls that joined an in-flight job
+        self.superseded = 0   # awaiters cancelled by a newer call in their lane
+
+    # ---------- queries ----------
+    async def search_invoices(self, q: str = "", status: str = "Any", method: str = "Any", limit: int = 120,
+                              after: Optional[Tuple[str, str, Any]] = None, *, lane: Optional[str] = "invoices"):
+        return await self._call(lane, "page", "search_invoices", (q or "").strip(), status or "Any",
+                                method or "Any", int(limit), after)
+
+    async def z_report(self, period: str, anchor_date, *, lane: Optional[str] = None):
+        return await self._call(lane, "report", "z_report", period, anchor_date)
+
+    async def z_report_range(self, start, end, per_day: bool = False, *, lane: Optional[str] = "z"):
+        if end < start:
+            start, end = end, start
+        return await self._call(lane, "report", "z_report_range", start, end, bool(per_day))
+
+    # ---------- machinery ----------
+    async def _call(self, lane: Optional[str], priority: str, name: str, *args: Any) -> Any:
+        key = (name,) + args
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        with self._lock:
+            shared = self._inflight.get(key)
+            if shared is None:
+                # coalescing happens here (per awaiter), so the pool gets key=None
+                shared = _Shared(self._pool.submit(getattr(self.service, name), *args,
+                                                   lane=priority, key=None))
+                self._inflight[key] = shared
+                shared.job.add_done_callback(lambda _j, key=key, shared=shared: self._forget(key, shared))
+            else:
+                self.coalesced += 1
+            shared.waiters += 1
+            prev = None
+            if lane:
+                prev = self._lanes.get(lane)
+                self._lanes[lane] = (waiter, loop)
+        if prev is not None and not prev[0].done():
+            self.superseded += 1
+            prev[1].call_soon_threadsafe(prev[0].cancel)
+        shared.job.add_done_callback(lambda j: loop.call_soon_threadsafe(_settle, waiter, j))
+        try:
+            return await waiter
+        finally:
+            with self._lock:
+                shared.waiters -= 1
+                if shared.waiters == 0 and not shared.job.done():
+                    shared.job.cancel()  # pool drops it if queued, interrupts its query if running
+                if lane and self._lanes.get(lane, (None,))[0] is waiter:
+                    del self._lanes[lane]
+
+    def _forget(self, key: Tuple[Any, ...], shared: _Shared) -> None:
+        with self._lock:
+            if self._inflight.get(key) is shared:
+                del self._inflight[key]
+
+    # ---------- bridge for loop-less callers ----------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever,
+                                                     name="accounting-loop", daemon=True)
+                self._loop_thread.start()
+            return self._loop
+
+    def submit(self, coro: Coroutine[Any, Any, Any],
+               on_result: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None) -> concurrent.futures.Future:
+        """
+        Schedules `coro` on the private loop thread. on_result / on_error fire on that thread;
+        nothing fires when the call was superseded or cancelled.
+        """
+        fut = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+        def done(f: concurrent.futures.Future) -> None:
+            if f.cancelled():
+                return
+            e = f.exception()
+            if e is None:
+                if on_result:
+                    on_result(f.result())
+            elif on_error:
+                on_error(e)
+
+        fut.add_done_callback(done)
+        return fut
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            if self._loop_thread is not None:
+                self._loop_thread.join(timeout=2)
+            loop.close()
+
+
+_facades: "weakref.WeakKeyDictionary[Any, AsyncAccounting]" = weakref.WeakKeyDictionary()
+_facades_lock = threading.Lock()
+
+
+def for_service(service: Any) -> AsyncAccounting:
+    """The shared facade of `service`, so every page coalesces against the same in-flight set."""
+    with _facades_lock:
+        aio = _facades.get(service)
+        if aio is None:
+            aio = _facades[service] = AsyncAccounting(service)
+        return aio
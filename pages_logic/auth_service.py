@@ -1,20 +1,336 @@
-# /pages_logic/auth_service.py  (to implement later)
+# pages_logic/auth_service.py
+# GymPro — AuthService: staff users, scrypt password hashes, session cache (SQLite)
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pages_logic import permissions
+from pages_logic.db_pool import ConnectionPool
+from pages_logic.login_throttle import LoginThrottle, LoginThrottled  # noqa: F401  (re-exported for callers)
+from pages_logic.permissions import SETTINGS, requires
+
+# scrypt cost: memory = 128 * n * r bytes (16 MiB here), time grows linearly with n.
+# Tune per machine with `python -m pages_logic.benchmarks scrypt --target-ms 250`.
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+SESSION_TTL = 15 * 60.0  # seconds a verified login stays valid without re-hashing
+
+USERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users(
+  user_id INTEGER PRIMARY KEY,
+  username TEXT NOT NULL UNIQUE COLLATE NOCASE,
+  display TEXT,
+  role TEXT NOT NULL,
+  password_hash TEXT NOT NULL,
+  created_at TEXT NOT NULL DEFAULT (datetime('now')),
+  disabled INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS roles(
+  name TEXT PRIMARY KEY COLLATE NOCASE,
+  mask INTEGER NOT NULL DEFAULT 0          -- OR of pages_logic.permissions capability bits
+);
+"""
+
+_USER_COLS = "user_id AS id, username, display, role, created_at, disabled"
+
+
+# -------- password hashing --------
+def _b64(b: bytes) -> str:
+    return base64.b64encode(b).decode("ascii")
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=2 * 128 * n * r * p + (1 << 20), dklen=KEY_BYTES)
+
+
+def hash_password(password: str, *, n: int = SCRYPT_N, r: int = SCRYPT_R, p: int = SCRYPT_P) -> str:
+    """'scrypt$n$r$p$salt$key' (base64 parts): the cost travels with the hash, so it can change later."""
+    salt = os.urandom(SALT_BYTES)
+    return f"scrypt${n}${r}${p}${_b64(salt)}${_b64(_scrypt(password, salt, n, r, p))}"
+
+
+def _parse(stored: str) -> Optional[Tuple[int, int, int, bytes, bytes]]:
+    try:
+        scheme, n, r, p, salt, key = stored.split("$")
+        if scheme != "scrypt":
+            return None
+        return int(n), int(r), int(p), base64.b64decode(salt), base64.b64decode(key)
+    except (ValueError, TypeError):
+        return None
+
+
+def check_password(password: str, stored: str) -> bool:
+    parsed = _parse(stored)
+    if parsed is None:
+        return False
+    n, r, p, salt, key = parsed
+    return hmac.compare_digest(_scrypt(password, salt, n, r, p), key)
+
+
+def calibrate(target_ms: float = 250.0, *, r: int = SCRYPT_R, p: int = SCRYPT_P,
+              max_n: int = 2 ** 20) -> List[Dict[str, Any]]:
+    """
+    Times one hash per power-of-two n (from 2**12 up) on this machine, stopping past target_ms.
+    Returns [{n, r, p, mem_mib, ms, ok}]; the largest n with ok=True is the recommended cost.
+    """
+    out = []
+    n = 2 ** 12
+    while n <= max_n:
+        t0 = time.perf_counter()
+        _scrypt("calibration-password", b"0123456789abcdef", n, r, p)
+        ms = (time.perf_counter() - t0) * 1000.0
+        out.append({"n": n, "r": r, "p": p, "mem_mib": 128 * n * r / (1 << 20), "ms": ms, "ok": ms <= target_ms})
+        if ms > target_ms:
+            break
+        n *= 2
+    return out
+
+
 class AuthService:
+    """
+    Methods:
+      - ensure_seed_admin()
+      - verify(username, password) -> {id, username, display, role, perms, token} | None
+        (raises LoginThrottled before hashing when the name is locked out or the till is flooded)
+      - locked_out() / unlock_user(username)
+      - session(token) -> same dict while the session is alive / logout(token)
+      - list_users() / create_user(...) / update_user_role(...) / reset_password(...) / delete_user(...)
+      - list_roles() / save_role(name, mask) / delete_role(name) / role_mask(name)
+
+    Data model used:
+      users(user_id, username, display, role, password_hash, created_at, disabled)
+      roles(name, mask)
+      login_lockouts(username, locked_until)
+
+    User and role management requires the SETTINGS capability (pages_logic.permissions).
+
+    verify() pays one scrypt; pages then re-check the user through session(token), a dict
+    lookup. Role changes, password resets, disabling and deletion drop that user's sessions.
+    Hashes made with an older cost are re-hashed with the current one on the next good login.
+    """
+    def __init__(self, db_path: str, *, n: int = SCRYPT_N, r: int = SCRYPT_R, p: int = SCRYPT_P,
+                 session_ttl: float = SESSION_TTL, throttle: Optional[LoginThrottle] = None):
+        self.db_path = db_path
+        self.cost = (int(n), int(r), int(p))
+        self.session_ttl = float(session_ttl)
+        self._pool = ConnectionPool(self.db_path)
+        self._sessions: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._sessions_lock = threading.Lock()
+        # compared against on unknown usernames so both paths cost one scrypt
+        self._dummy_hash = hash_password(secrets.token_hex(8), n=n, r=r, p=p)
+        with self._pool.writer() as conn:
+            conn.executescript(USERS_SCHEMA)
+            conn.executemany("INSERT OR IGNORE INTO roles(name, mask) VALUES (?, ?)",
+                             permissions.DEFAULT_ROLES.items())
+        # compiled role masks, read at login; kept in step by save_role / delete_role
+        self._role_masks: Dict[str, int] = {
+            r["name"].lower(): r["mask"] for r in self._conn.execute("SELECT name, mask FROM roles").fetchall()
+        }
+        self._throttle = throttle or LoginThrottle(self._pool)
+
+    # ---------- infra ----------
+    @property
+    def _conn(self):
+        return self._pool.reader()
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def _hash(self, password: str) -> str:
+        n, r, p = self.cost
+        return hash_password(password, n=n, r=r, p=p)
+
+    # ---------- sessions ----------
+    def _open_session(self, user: Dict[str, Any]) -> str:
+        token = secrets.token_urlsafe(32)
+        with self._sessions_lock:
+            self._sessions[token] = (time.monotonic() + self.session_ttl, user)
+        return token
+
+    def session(self, token: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The logged-in user of `token`, or None once it expired / was revoked."""
+        if not token:
+            return None
+        with self._sessions_lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._sessions[token]
+                return None
+            return entry[1]
+
+    def logout(self, token: str) -> None:
+        with self._sessions_lock:
+            self._sessions.pop(token, None)
+
+    def _drop_sessions(self, user_id: int) -> None:
+        with self._sessions_lock:
+            for token in [t for t, (_exp, u) in self._sessions.items() if u["id"] == user_id]:
+                del self._sessions[token]
+
+    # ---------- auth ----------
     def ensure_seed_admin(self) -> None:
         """Ensure a user 'admin' with password 'admin' and role 'Admin' exists."""
+        if self._conn.execute("SELECT 1 FROM users WHERE username = 'admin'").fetchone() is None:
+            self._insert_user("admin", "admin", "Admin", "Administrator")
 
-    def verify(self, username: str, password: str) -> dict | None:
-        """Return {'username', 'display', 'role'} on success, else None."""
+    def verify(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+        """Return {'id', 'username', 'display', 'role', 'perms', 'token'} on success, else None."""
+        self._throttle.admit(username)  # raises LoginThrottled; no scrypt spent
+        row = self._conn.execute(
+            "SELECT user_id, username, display, role, password_hash, disabled FROM users WHERE username = ?",
+            ((username or "").strip(),),
+        ).fetchone()
+        if row is None:
+            check_password(password or "", self._dummy_hash)
+            self._throttle.failed(username)
+            return None
+        if not check_password(password or "", row["password_hash"]) or row["disabled"]:
+            self._throttle.failed(username)
+            return None
+        self._throttle.succeeded(username)
+        parsed = _parse(row["password_hash"])
+        if parsed and parsed[:3] != self.cost:
+            with self._pool.writer() as conn:
+                conn.execute("UPDATE users SET password_hash = ? WHERE user_id = ?",
+                             (self._hash(password), row["user_id"]))
+        user = {"id": row["user_id"], "username": row["username"],
+                "display": row["display"] or row["username"], "role": row["role"],
+                "perms": self.role_mask(row["role"])}
+        return {**user, "token": self._open_session(user)}
 
-    def list_users(self) -> list[dict]:
+    def locked_out(self) -> Dict[str, float]:
+        """{username: seconds left} of current login lockouts."""
+        return self._throttle.locked_out()
+
+    @requires(SETTINGS)
+    def unlock_user(self, username: str) -> None:
+        self._throttle.unlock(username)
+
+    # ---------- users ----------
+    def list_users(self) -> List[Dict[str, Any]]:
         """Return [{'id','username','display','role','created_at','disabled'} ...]."""
+        rows = self._conn.execute(f"SELECT {_USER_COLS} FROM users ORDER BY username").fetchall()
+        return [{**dict(r), "disabled": bool(r["disabled"])} for r in rows]
 
-    def create_user(self, username: str, password: str, role: str, display: str | None = None) -> dict:
+    @requires(SETTINGS)
+    def create_user(self, username: str, password: str, role: str, display: Optional[str] = None) -> Dict[str, Any]:
         """Create user, return user dict."""
+        return self._insert_user(username, password, role, display)
+
+    def _insert_user(self, username: str, password: str, role: str, display: Optional[str]) -> Dict[str, Any]:
+        username = (username or "").strip()
+        if not username or not password:
+            raise ValueError("username and password are required")
+        password_hash = self._hash(password)
+        with self._pool.writer() as conn:
+            if conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone():
+                raise ValueError(f"username already exists: {username!r}")
+            cur = conn.execute(
+                "INSERT INTO users(username, display, role, password_hash) VALUES (?, ?, ?, ?)",
+                (username, display or username, role, password_hash),
+            )
+            row = conn.execute(f"SELECT {_USER_COLS} FROM users WHERE user_id = ?", (cur.lastrowid,)).fetchone()
+        return {**dict(row), "disabled": bool(row["disabled"])}
+
+    def _other_admins(self, conn, user_id: int) -> int:
+        return conn.execute(
+            "SELECT COUNT(1) FROM users WHERE role = 'Admin' AND disabled = 0 AND user_id != ?", (user_id,)
+        ).fetchone()[0]
+
+    @requires(SETTINGS)
+    def update_user_role(self, user_id: int, role: str) -> None:
+        with self._pool.writer() as conn:
+            row = conn.execute("SELECT role FROM users WHERE user_id = ?", (user_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"no such user: {user_id}")
+            if row["role"] == "Admin" and role != "Admin" and not self._other_admins(conn, user_id):
+                raise ValueError("cannot demote the last Admin")
+            conn.execute("UPDATE users SET role = ? WHERE user_id = ?", (role, user_id))
+        self._drop_sessions(user_id)
 
-    def update_user_role(self, user_id: int, role: str) -> None: ...
+    @requires(SETTINGS)
+    def reset_password(self, user_id: int, new_password: str) -> None:
+        if not new_password:
+            raise ValueError("password is required")
+        password_hash = self._hash(new_password)
+        with self._pool.writer() as conn:
+            if conn.execute("UPDATE users SET password_hash = ? WHERE user_id = ?",
+                            (password_hash, user_id)).rowcount == 0:
+                raise ValueError(f"no such user: {user_id}")
+        self._drop_sessions(user_id)
 
-    def reset_password(self, user_id: int, new_password: str) -> None: ...
+    @requires(SETTINGS)
+    def set_disabled(self, user_id: int, disabled: bool = True) -> None:
+        with self._pool.writer() as conn:
+            row = conn.execute("SELECT role FROM users WHERE user_id = ?", (user_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"no such user: {user_id}")
+            if disabled and row["role"] == "Admin" and not self._other_admins(conn, user_id):
+                raise ValueError("cannot disable the last Admin")
+            conn.execute("UPDATE users SET disabled = ? WHERE user_id = ?", (int(bool(disabled)), user_id))
+        self._drop_sessions(user_id)
 
+    @requires(SETTINGS)
     def delete_user(self, user_id: int) -> None:
         """Allow deleting 'admin' only if there is at least one other Admin remaining."""
+        with self._pool.writer() as conn:
+            row = conn.execute("SELECT username, role FROM users WHERE user_id = ?", (user_id,)).fetchone()
+            if row is None:
+                return
+            if (row["username"] == "admin" or row["role"] == "Admin") and not self._other_admins(conn, user_id):
+                raise ValueError("cannot delete the last Admin")
+            conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+        self._drop_sessions(user_id)
+
+    # ---------- roles ----------
+    def role_mask(self, role: Optional[str]) -> int:
+        return self._role_masks.get((role or "").lower(), 0)
+
+    def list_roles(self) -> List[Dict[str, Any]]:
+        """[{'name', 'mask', 'capabilities': [capability names]} ...]"""
+        rows = self._conn.execute("SELECT name, mask FROM roles ORDER BY name").fetchall()
+        return [{"name": r["name"], "mask": r["mask"], "capabilities": permissions.names(r["mask"])} for r in rows]
+
+    @requires(SETTINGS)
+    def save_role(self, name: str, mask: int) -> None:
+        """Create or update a role; live sessions of that role pick up the new mask immediately."""
+        name = (name or "").strip()
+        if not name:
+            raise ValueError("role name is required")
+        mask = int(mask) & permissions.ALL
+        if name.lower() == "admin" and mask != permissions.ALL:
+            raise ValueError("the Admin role keeps every capability")
+        with self._pool.writer() as conn:
+            conn.execute("INSERT INTO roles(name, mask) VALUES (?, ?) "
+                         "ON CONFLICT(name) DO UPDATE SET mask = excluded.mask", (name, mask))
+        self._role_masks[name.lower()] = mask
+        with self._sessions_lock:
+            for _exp, user in self._sessions.values():
+                if (user["role"] or "").lower() == name.lower():
+                    user["perms"] = mask
+        current = permissions.current_user()
+        if current is not None and (current.get("role") or "").lower() == name.lower():
+            permissions.set_current_user({**current, "perms": mask})
+
+    @requires(SETTINGS)
+    def delete_role(self, name: str) -> None:
+        with self._pool.writer() as conn:
+            if name.lower() == "admin":
+                raise ValueError("the Admin role cannot be deleted")
+            if conn.execute("SELECT 1 FROM users WHERE role = ? COLLATE NOCASE", (name,)).fetchone():
+                raise ValueError(f"role {name!r} is still assigned to users")
+            conn.execute("DELETE FROM roles WHERE name = ?", (name,))
+        self._role_masks.pop(name.lower(), None)
@@ -0,0 +1,424 @@
+# pages_logic/benchmarks.py
+# GymPro — Synthetic datasets & micro-benchmarks for the SQLite services
+#
+#   python -m pages_logic.benchmarks z-report [--years 5] [--db path]
+#   python -m pages_logic.benchmarks plans    [--db path]
+#   python -m pages_logic.benchmarks z-range  [--pos-per-day 1000 --subs-per-day 100]
+#   python -m pages_logic.benchmarks search   [--members 100000]
+#   python -m pages_logic.benchmarks members  [--members 100000]
+#   python -m pages_logic.benchmarks scrypt   [--target-ms 250]
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from pages_logic import auth_service, fetch_pool, search_index
+from pages_logic.member_service import MemberService
+from pages_logic.accounting_service import (
+    AccountingService,
+    Z_PAYMENTS_SQL,
+    Z_POS_ORDERS_SQL,
+    Z_POS_PAYMENTS_SQL,
+    _day_bounds,
+    _half_open,
+    _month_bounds,
+    _week_bounds,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS members(
+  member_id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT, phone TEXT,
+  status TEXT DEFAULT 'active', join_date TEXT, created_at TEXT, updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS subscriptions(
+  subscription_id INTEGER PRIMARY KEY, member_id INTEGER, start_date TEXT, end_date TEXT,
+  status TEXT, created_at TEXT, updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS payments(
+  payment_id INTEGER PRIMARY KEY, subscription_id INTEGER, amount REAL, payment_date TEXT,
+  method TEXT, status TEXT, created_at TEXT, updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS pos_orders(
+  order_id INTEGER PRIMARY KEY, member_id INTEGER, order_date TEXT, order_time TEXT,
+  status TEXT, total_amount REAL, created_at TEXT, updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS pos_order_lines(
+  line_id INTEGER PRIMARY KEY, order_id INTEGER, product_id INTEGER,
+  quantity INTEGER, unit_price REAL, line_total REAL
+);
+CREATE TABLE IF NOT EXISTS pos_payments(
+  pos_payment_id INTEGER PRIMARY KEY, order_id INTEGER, amount REAL, payment_date TEXT,
+  method TEXT, status TEXT, created_at TEXT, updated_at TEXT
+);
+"""
+
+FIRST = ["Nadia", "Hind", "Amine", "Karim", "Sara", "Yasmine", "Omar", "Samir", "Aya", "Mina"]
+LAST = ["K.", "B.", "M.", "A.", "L.", "D.", "T.", "R.", "S.", "N."]
+METHODS = ["Cash", "Cash", "Card", "Transfer"]
+
+
+# -------- dataset --------
+def build_dataset(path: str, *, years: int = 5, members: int = 5000,
+                  pos_per_day: int = 120, subs_per_day: int = 40, seed: int = 2025) -> str:
+    """Create (or extend) a synthetic GymPro database ending today; returns `path`."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    today = dt.date.today()
+    first_day = today - dt.timedelta(days=365 * years)
+
+    conn.executemany(
+        "INSERT INTO members(member_id, first_name, last_name, phone, status, join_date) VALUES (?,?,?,?,?,?)",
+        (
+            (i, rng.choice(FIRST), rng.choice(LAST), f"05{rng.randint(5, 9)} {rng.randint(100, 999)} {rng.randint(100, 999)}",
+             rng.choice(["active", "active", "active", "suspended", "expired"]),
+             (first_day + dt.timedelta(days=rng.randint(0, 365 * years))).isoformat())
+            for i in range(1, members + 1)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO subscriptions(subscription_id, member_id, status) VALUES (?,?,?)",
+        ((i, i, "active") for i in range(1, members + 1)),
+    )
+
+    orders: List[Tuple[Any, ...]] = []
+    pos_pays: List[Tuple[Any, ...]] = []
+    sub_pays: List[Tuple[Any, ...]] = []
+    oid = 0
+    day = first_day
+    while day <= today:
+        d = day.isoformat()
+        for _ in range(pos_per_day):
+            oid += 1
+            total = rng.choice([80, 250, 600, 1200, 2200, 3500])
+            member = rng.randint(1, members) if rng.random() < 0.6 else None
+            orders.append((oid, member, d, f"{rng.randint(6, 22):02d}:{rng.randint(0, 59):02d}", "closed", total))
+            r = rng.random()
+            if r < 0.85:
+                pos_pays.append((oid, total, d, rng.choice(METHODS), "succeeded"))
+            elif r < 0.91:
+                half = total // 2
+                pos_pays.append((oid, half, d, "Cash", "succeeded"))
+                pos_pays.append((oid, total - half, d, "Card", "succeeded"))
+            elif r < 0.95:
+                # deposit on the order day, balance within ten days (one receipt, counted on the first day)
+                later = min(today, day + dt.timedelta(days=rng.randint(1, 10))).isoformat()
+                half = total // 2
+                pos_pays.append((oid, half, d, "Cash", "succeeded"))
+                pos_pays.append((oid, total - half, later, rng.choice(METHODS), "succeeded"))
+            elif r < 0.98:
+                pos_pays.append((oid, total, d, rng.choice(METHODS), "refunded"))
+        for _ in range(subs_per_day):
+            status = "succeeded" if rng.random() < 0.9 else rng.choice(["pending", "failed", "refunded"])
+            sub_pays.append((rng.randint(1, members), rng.choice([1200, 1800, 2200, 3500, 4500]), d, rng.choice(METHODS), status))
+        day += dt.timedelta(days=1)
+
+    conn.executemany(
+        "INSERT INTO pos_orders(order_id, member_id, order_date, order_time, status, total_amount) VALUES (?,?,?,?,?,?)",
+        orders,
+    )
+    conn.executemany(
+        "INSERT INTO pos_payments(order_id, amount, payment_date, method, status) VALUES (?,?,?,?,?)",
+        pos_pays,
+    )
+    conn.executemany(
+        "INSERT INTO payments(subscription_id, amount, payment_date, method, status) VALUES (?,?,?,?,?)",
+        sub_pays,
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+# -------- legacy reference (one query per metric) --------
+def legacy_z_totals(conn: sqlite3.Connection, start: str, end: str) -> Dict[str, Any]:
+    """The original eleven-query Z-report, kept as a baseline for timing and parity checks."""
+    def one(sql: str) -> float:
+        return conn.execute(sql, (start, end)).fetchone()[0] or 0
+
+    pay_range = "(p.payment_date || ' 00:00:00') BETWEEN ? AND ?"
+    pos_range = "(pp.payment_date || ' 00:00:00') BETWEEN ? AND ?"
+    pos_gross = one("SELECT COALESCE(SUM(o.total_amount),0) FROM pos_orders o "
+                    "WHERE (o.order_date || ' ' || COALESCE(o.order_time,'')) BETWEEN ? AND ?")
+    sub_gross = one(f"SELECT COALESCE(SUM(p.amount),0) FROM payments p WHERE p.status='succeeded' AND {pay_range}")
+    refunds = (one(f"SELECT COALESCE(SUM(pp.amount),0) FROM pos_payments pp WHERE pp.status='refunded' AND {pos_range}")
+               + one(f"SELECT COALESCE(SUM(p.amount),0) FROM payments p WHERE p.status='refunded' AND {pay_range}"))
+    methods = {}
+    for m in ("Cash", "Card", "Transfer"):
+        methods[m.lower()] = (
+            one(f"SELECT COALESCE(SUM(pp.amount),0) FROM pos_payments pp WHERE pp.status='succeeded' AND pp.method='{m}' AND {pos_range}")
+            + one(f"SELECT COALESCE(SUM(p.amount),0) FROM payments p WHERE p.status='succeeded' AND p.method='{m}' AND {pay_range}")
+        )
+    # receipts on the order's first payment day (originally: any payment day in the window)
+    first_day = ("NOT EXISTS (SELECT 1 FROM pos_payments x WHERE x.order_id = pp.order_id "
+                 "AND x.status='succeeded' AND x.payment_date < substr(pp.payment_date,1,10))")
+    count = (one(f"SELECT COUNT(DISTINCT pp.order_id) FROM pos_payments pp WHERE pp.status='succeeded' "
+                 f"AND {first_day} AND {pos_range}")
+             + one(f"SELECT COUNT(1) FROM payments p WHERE p.status='succeeded' AND {pay_range}"))
+    return {
+        "pos_gross": float(pos_gross), "sub_gross": float(sub_gross), "refunds": float(refunds),
+        "net": float(max(0, pos_gross + sub_gross - refunds)),
+        "cash": float(methods["cash"]), "card": float(methods["card"]), "transfer": float(methods["transfer"]),
+        "count": int(count),
+    }
+
+
+# -------- timing --------
+def _timeit(fn: Callable[[], Any], repeat: int) -> float:
+    """Best-of-`repeat` wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - t0) * 1000.0)
+    return best
+
+
+def bench_z_report(db_path: str, *, repeat: int = 5) -> List[Dict[str, Any]]:
+    """Compare legacy vs single-pass Z-report per period; raises if the numbers disagree."""
+    svc = AccountingService(db_path)
+    anchor = dt.date.today()
+    results = []
+    for period, bounds in (("Daily", _day_bounds), ("Weekly", _week_bounds), ("Monthly", _month_bounds)):
+        start, end = bounds(anchor)
+        old = legacy_z_totals(svc._conn, start, end)
+        new = svc._z_totals(start, end)
+        if old != new:
+            raise AssertionError(f"{period}: legacy {old} != single-pass {new}")
+        results.append({
+            "period": period,
+            "legacy_ms": _timeit(lambda: legacy_z_totals(svc._conn, start, end), repeat),
+            "single_pass_ms": _timeit(lambda: svc._z_totals(start, end), repeat),
+        })
+    return results
+
+
+def bench_z_range(db_path: str, *, repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    Time z_report_range (rollup-backed) against the raw single-pass engine over growing spans.
+    Raises if they disagree, on spans ending today and a few days back (build_dataset pays some
+    orders over several days, so span edges cut through them), or if the rollup-backed z_matrix
+    disagrees with its exact=True form.
+    """
+    svc = AccountingService(db_path, cache_size=0)
+    end = dt.date.today()
+    results = []
+    for days in (31, 92, 366):
+        start = end - dt.timedelta(days=days - 1)
+        for back in (0, 3, 7):
+            s, e = start - dt.timedelta(days=back), end - dt.timedelta(days=back)
+            raw = svc._z_totals(f"{s} 00:00:00", f"{e} 23:59:59")
+            rolled = svc.z_report_range(s, e)
+            mismatched = [k for k, v in raw.items() if abs(v - rolled[k]) > 0.01]
+            if mismatched:
+                raise AssertionError(f"{s}..{e}: rollup and raw disagree on {mismatched}")
+        for period in ("Weekly", "Monthly"):
+            fast = svc.z_matrix(period, start, end)
+            exact = svc.z_matrix(period, start, end, exact=True)
+            bad = [r["start"] for r, x in zip(fast, exact)
+                   if any(abs(r[k] - x[k]) > 0.01 for k in ("pos_gross", "sub_gross", "refunds", "count"))]
+            if bad:
+                raise AssertionError(f"{period} z_matrix: rollup and raw disagree for {bad}")
+        results.append({
+            "days": days,
+            "raw_ms": _timeit(lambda: svc._z_totals(f"{start} 00:00:00", f"{end} 23:59:59"), repeat),
+            "range_ms": _timeit(lambda: svc.z_report_range(start, end), repeat),
+            "range_per_day_ms": _timeit(lambda: svc.z_report_range(start, end, per_day=True), repeat),
+        })
+    return results
+
+
+def bench_search(db_path: str, *, repeat: int = 5) -> List[Dict[str, Any]]:
+    """Keystroke latency of the Members and Accounting search boxes (search_fts vs short-query fallback)."""
+    members = MemberService(db_path, memory_index=False)
+    accounting = AccountingService(db_path, cache_size=0)
+    cached = AccountingService(db_path)
+    results = []
+    for q in ("Na", "Nadia K", "055 12", "0551234", "1234", "zzq"):
+        results.append({
+            "q": q,
+            "find_members_ms": _timeit(lambda: members.find_members(q, limit=50), repeat),
+            "search_invoices_ms": _timeit(lambda: accounting.search_invoices(q, limit=120), repeat),
+            "search_invoices_cached_ms": _timeit(lambda: cached.search_invoices(q, limit=120), repeat),
+        })
+    return results
+
+
+def bench_member_pages(db_path: str, *, repeat: int = 5, page: int = 50) -> List[Dict[str, Any]]:
+    """Members page: whole-list find_members vs keyset pages (first / deep) and the capped count."""
+    members = MemberService(db_path, memory_index=False)
+    results = []
+    for q, status in (("", None), ("", "suspended"), ("Na", None), ("Nadia", None)):
+        cursor = None
+        for _ in range(100):  # walk 100 pages deep for the deep-page timing
+            res = members.find_members_page(q, status, limit=page, after=cursor, count=False)
+            if res["next"] is None:
+                break
+            cursor = res["next"]
+        results.append({
+            "q": q or "''", "status": status or "All",
+            "full_list_ms": _timeit(lambda: members.find_members(q, status, limit=10**9), repeat),
+            "page1_ms": _timeit(lambda: members.find_members_page(q, status, limit=page, count=False), repeat),
+            "deep_page_ms": _timeit(lambda: members.find_members_page(q, status, limit=page, after=cursor,
+                                                                       count=False), repeat),
+            "approx_count_ms": _timeit(lambda: members.count_members(q, status), repeat),
+            "exact_count_ms": _timeit(lambda: members.count_members(q, status, exact=True), repeat),
+        })
+    return results
+
+
+def bench_member_index(db_path: str, *, repeat: int = 5) -> Dict[str, Any]:
+    """Keystroke latency of the in-memory member index vs SQLite, plus build time and footprint."""
+    sql = MemberService(db_path, memory_index=False)
+    t0 = time.perf_counter()
+    index = MemberService(db_path, memory_index=False).rebuild_index()
+    build_ms = (time.perf_counter() - t0) * 1000.0
+    results = []
+    for q, status in (("N", None), ("Na", None), ("nadia", None), ("Nadia K", None), ("sa", "suspended"),
+                      ("055", None), ("055 12", None), ("0551234", None), ("1234", None), ("zzq", None)):
+        results.append({
+            "q": q, "status": status or "All", "hits": len(index.search(q, status, 50)),
+            "index_ms": _timeit(lambda: index.search(q, status, 50), repeat),
+            "sqlite_ms": _timeit(lambda: sql.find_members(q, status, limit=50), repeat),
+        })
+    return {"build_ms": build_ms, "memory": index.memory_report(), "queries": results}
+
+
+def bench_fetch_pool(db_path: str, *, repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    A burst of Members-search keystrokes: time until the last keystroke's rows arrive when every
+    keystroke runs to completion (thread per keystroke) vs superseded in one FetchPool slot.
+    """
+    svc = MemberService(db_path, memory_index=False)
+    burst = ["0", "05", "055", "055 1", "055 12", "Na", "Nad", "Nadi", "Nadia"]
+
+    def threads() -> None:
+        ts = [threading.Thread(target=svc.count_members, args=(q, None, True)) for q in burst]
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+
+    results = []
+    for _ in range(repeat):
+        pool = fetch_pool.FetchPool()
+        t0 = time.perf_counter()
+        last = None
+        for q in burst:
+            last = pool.submit(svc.count_members, q, None, True, slot="members")
+        last.result()
+        pooled_ms = (time.perf_counter() - t0) * 1000.0
+        stats = pool.stats()
+        pool.shutdown(wait=True)
+        results.append({"threads_ms": _timeit(threads, 1), "pooled_ms": pooled_ms,
+                        "dropped": stats["dropped"], "interrupted": stats["interrupted"]})
+    return results
+
+
+# -------- query plans --------
+def _plan(conn: sqlite3.Connection, sql: str, params: Any) -> List[str]:
+    return [r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+
+
+def query_plan_problems(svc: AccountingService) -> List[str]:
+    """
+    EXPLAIN QUERY PLAN every Z-report and invoice statement; returns the offending plan lines.
+    - Z-report: every table access must be an index SEARCH (no SCAN at all).
+    - Invoices: each arm walks its date index (no bare SCAN, no materialized CTE, no temp B-tree sort),
+      or, for searches of 3+ chars, starts from the search_fts trigram index.
+    """
+    problems: List[str] = []
+    rng = _half_open(*_month_bounds(dt.date.today()))
+    for name, sql in (("z:pos_orders", Z_POS_ORDERS_SQL), ("z:pos_payments", Z_POS_PAYMENTS_SQL),
+                      ("z:payments", Z_PAYMENTS_SQL)):
+        problems += [f"{name}: {line}" for line in _plan(svc._conn, sql, rng) if line.startswith("SCAN")]
+
+    cursor = (f"{dt.date.today():%Y-%m-%d} 12:00", "POS", 1)
+    for q, status, method in (("", "any", "Any"), ("nadia", "paid", "Cash"), ("42", "open", "Card"),
+                              ("055 12", "any", "Any")):
+        for after in (None, cursor):
+            sql, params = svc._invoice_query(q, status, method, 120, after)
+            for line in _plan(svc._conn, sql, params):
+                bare_scan = line.startswith("SCAN") and " USING " not in line and "VIRTUAL TABLE INDEX" not in line
+                # FTS-driven searches sort their (small) match set; date walks must not sort
+                bad_sort = "TEMP B-TREE FOR ORDER BY" in line and not search_index.use_index(q)
+                if bare_scan or "MATERIALIZE" in line or bad_sort:
+                    problems.append(f"invoices {q!r}/{status}/{method}/after={after is not None}: {line}")
+    return problems
+
+
+def check_query_plans(svc: AccountingService) -> None:
+    """query_plan_problems(); raises if any statement scans, materializes or sorts where it must not."""
+    problems = query_plan_problems(svc)
+    if problems:
+        raise AssertionError("query plans regressed:\n" + "\n".join(problems))
+
+
+def _print_rows(rows: List[Dict[str, Any]]) -> None:
+    for r in rows:
+        print("  ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in r.items()))
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m pages_logic.benchmarks")
+    ap.add_argument("bench", choices=["z-report", "z-range", "search", "members", "member-index",
+                                          "fetch-pool", "plans", "scrypt"])
+    ap.add_argument("--db", help="existing database (default: build a synthetic one in a temp dir)")
+    ap.add_argument("--years", type=int, default=5)
+    ap.add_argument("--members", type=int, default=5000)
+    ap.add_argument("--pos-per-day", type=int, default=120)
+    ap.add_argument("--subs-per-day", type=int, default=40)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--target-ms", type=float, default=250.0, help="scrypt: verify latency budget")
+    args = ap.parse_args(argv)
+
+    if args.bench == "scrypt":  # machine calibration, no dataset
+        rows = auth_service.calibrate(args.target_ms)
+        _print_rows(rows)
+        fit = [r for r in rows if r["ok"]]
+        if fit:
+            best = fit[-1]
+            print(f"recommended: AuthService(db, n={best['n']}, r={best['r']}, p={best['p']})"
+                  f"  ~{best['ms']:.0f} ms per verify, {best['mem_mib']:.0f} MiB")
+        else:
+            print(f"even n={rows[0]['n']} exceeds {args.target_ms:.0f} ms on this machine")
+        return
+
+    db_path = args.db
+    if not db_path:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="gympro-bench-"), "bench.db")
+        t0 = time.perf_counter()
+        build_dataset(db_path, years=args.years, members=args.members,
+                      pos_per_day=args.pos_per_day, subs_per_day=args.subs_per_day)
+        print(f"built {args.years}-year dataset at {db_path} in {time.perf_counter() - t0:.1f}s")
+
+    if args.bench == "z-report":
+        _print_rows(bench_z_report(db_path, repeat=args.repeat))
+    elif args.bench == "z-range":
+        _print_rows(bench_z_range(db_path, repeat=args.repeat))
+    elif args.bench == "search":
+        _print_rows(bench_search(db_path, repeat=args.repeat))
+    elif args.bench == "members":
+        _print_rows(bench_member_pages(db_path, repeat=args.repeat))
+    elif args.bench == "member-index":
+        res = bench_member_index(db_path, repeat=args.repeat)
+        mem = res["memory"]
+        print(f"build {res['build_ms']:.0f} ms, {mem['members']} members, {mem['total_mib']:.1f} MiB")
+        _print_rows([{"part": k, "mib": v / (1 << 20)} for k, v in mem["bytes"].items()])
+        _print_rows(res["queries"])
+    elif args.bench == "fetch-pool":
+        _print_rows(bench_fetch_pool(db_path, repeat=args.repeat))
+    elif args.bench == "plans":
+        check_query_plans(AccountingService(db_path))  # AssertionError: exit status 1
+        print("all Z-report and invoice statements use an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# pages_logic/db_pool.py
+# GymPro — SQLite connection pool: one reader per thread, one serialized writer (WAL)
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.request import pathname2url
+
+BUSY_TIMEOUT_MS = 5000
+CACHE_KIB = 20000          # page cache per connection (~20 MB)
+MMAP_BYTES = 256 << 20     # memory-mapped reads
+STATEMENT_CACHE = 256      # prepared statements kept per connection (keyed by SQL text)
+
+_pools: "weakref.WeakSet[ConnectionPool]" = weakref.WeakSet()  # for interrupt_thread()
+_pools_lock = threading.Lock()
+
+
+class _Writer:
+    """The write connection of one database file and its lock, shared by every pool on it."""
+    __slots__ = ("conn", "lock", "users")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.lock = threading.RLock()
+        self.users = 0
+
+
+_writers: Dict[str, _Writer] = {}  # resolved db path -> writer
+_writers_lock = threading.Lock()
+
+
+def _writer_key(db_path: str) -> Optional[str]:
+    # each ":memory:" / URI connection may be its own database: those keep a private writer
+    if db_path == ":memory:" or db_path.startswith("file:"):
+        return None
+    return os.path.realpath(db_path)
+
+
+def require_tables(db_path: str, tables: Iterable[str]) -> None:
+    """
+    sqlite3.OperationalError("no such table: ...") unless `db_path` has every one of `tables`.
+    Checked on a read-only connection before a pool is opened, so a database a service cannot
+    use is left as it was (not switched to WAL, not created). ":memory:" / URIs are not checked.
+    """
+    if _writer_key(db_path) is None:
+        return
+    conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro", uri=True)
+    try:
+        present = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    finally:
+        conn.close()
+    missing = [t for t in tables if t not in present]
+    if missing:
+        raise sqlite3.OperationalError(f"no such table: {', '.join(missing)}")
+
+
+class ConnectionPool:
+    """
+    - reader(): the calling thread's own connection (opened on first use). In WAL mode
+      readers never block the writer nor each other, so reports can run while POS checks out.
+    - writer(): context manager around the write connection of the database file, shared by
+      every pool opened on that file in this process (AccountingService, MemberService,
+      AuthService, ... each have a pool), so their writes queue on one lock instead of
+      contending for SQLite's; commits on success and rolls back on error.
+    - interrupt(thread_ident): abort the statement running on that thread's reader.
+    Connections of threads that have exited are closed on the next reader() call.
+    on_open(conn) runs on every new connection, and on the shared writer (e.g. to register
+    SQL functions). Readers honour detect_types / row_factory; the shared writer uses the
+    defaults, so read typed values through reader().
+    """
+    def __init__(self, db_path: str, *, detect_types: int = 0, row_factory=sqlite3.Row,
+                 on_open: Optional[Callable[[sqlite3.Connection], None]] = None):
+        self.db_path = db_path
+        self._detect_types = detect_types
+        self._row_factory = row_factory
+        self._on_open = on_open
+        self._local = threading.local()
+        self._readers: Dict[int, Tuple[weakref.ref, sqlite3.Connection]] = {}
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self._key = _writer_key(db_path)
+        self._shared = self._attach_writer()
+        with _pools_lock:
+            _pools.add(self)
+
+    def _attach_writer(self) -> _Writer:
+        with _writers_lock:
+            w = _writers.get(self._key) if self._key is not None else None
+            if w is None:
+                w = _Writer(self._open(shared=True))
+                # persistent per database file; a no-op on later opens
+                w.conn.execute("PRAGMA journal_mode=WAL")
+                if self._key is not None:
+                    _writers[self._key] = w
+            elif self._on_open is not None:
+                with w.lock:
+                    self._on_open(w.conn)
+            w.users += 1
+            return w
+
+    def _open(self, *, shared: bool = False) -> sqlite3.Connection:
+        # check_same_thread=False only so a dead thread's reader can be closed from another
+        # thread, and so the shared writer can be used from any thread under its lock.
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000.0,
+                               detect_types=0 if shared else self._detect_types, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE)
+        conn.row_factory = sqlite3.Row if shared else self._row_factory
+        conn.executescript(
+            f"""
+            PRAGMA synchronous=NORMAL;
+            PRAGMA busy_timeout={BUSY_TIMEOUT_MS};
+            PRAGMA cache_size=-{CACHE_KIB};
+            PRAGMA mmap_size={MMAP_BYTES};
+            PRAGMA temp_store=MEMORY;
+            """
+        )
+        if self._on_open is not None:
+            self._on_open(conn)
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            me = threading.current_thread()
+            with self._readers_lock:
+                self._prune_dead()
+                self._readers[me.ident] = (weakref.ref(me), conn)
+        return conn
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        w = self._shared
+        with w.lock:
+            try:
+                yield w.conn
+                w.conn.commit()
+            except BaseException:
+                w.conn.rollback()
+                raise
+
+    def _prune_dead(self) -> None:
+        for ident, (ref, conn) in list(self._readers.items()):
+            t = ref()
+            if t is None or not t.is_alive():
+                del self._readers[ident]
+                conn.close()
+
+    def interrupt(self, thread_ident: int) -> bool:
+        """
+        sqlite3 interrupt() on the reader of `thread_ident`: its running statement fails with
+        OperationalError("interrupted"); a no-op when nothing is running. Thread-safe.
+        """
+        with self._readers_lock:
+            entry = self._readers.get(thread_ident)
+        if entry is None:
+            return False
+        try:
+            entry[1].interrupt()
+        except sqlite3.ProgrammingError:  # closed meanwhile
+            return False
+        return True
+
+    def close(self) -> None:
+        with self._readers_lock:
+            for _ref, conn in self._readers.values():
+                conn.close()
+            self._readers.clear()
+        with _writers_lock:
+            if self._closed:
+                return
+            self._closed = True
+            w = self._shared
+            w.users -= 1
+            if w.users:
+                return
+            if self._key is not None and _writers.get(self._key) is w:
+                del _writers[self._key]
+        with w.lock:
+            w.conn.close()
+
+
+def interrupt_thread(thread_ident: int) -> int:
+    """Interrupt `thread_ident`'s readers in every live pool; returns how many were hit."""
+    with _pools_lock:
+        pools = list(_pools)
+    return sum(pool.interrupt(thread_ident) for pool in pools)
@@ -0,0 +1,124 @@
+# pages_logic/export_service.py
+# GymPro — Streaming CSV / gzip-CSV export on a background thread
+from __future__ import annotations
+
+import csv
+import gzip
+import os
+import threading
+from typing import Any, Callable, Iterable, Optional, Sequence, TextIO
+
+FORMATS = ("csv", "csv.gz")
+PROGRESS_EVERY = 2000  # rows between progress callbacks / cancellation checks
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def format_for(path: str, fmt: Optional[str] = None) -> str:
+    """Explicit fmt wins; otherwise '.gz' paths are gzip-compressed CSV."""
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"unsupported export format: {fmt!r} (expected one of {FORMATS})")
+        return fmt
+    return "csv.gz" if path.lower().endswith(".gz") else "csv"
+
+
+def _open_sink(path: str, fmt: str) -> TextIO:
+    if fmt == "csv.gz":
+        return gzip.open(path, "wt", newline="", encoding="utf-8")
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+def write_rows(path: str, header: Sequence[str], rows: Iterable[Sequence[Any]], *,
+               fmt: Optional[str] = None,
+               on_progress: Optional[Callable[[int], None]] = None,
+               should_cancel: Optional[Callable[[], bool]] = None) -> int:
+    """
+    Writes header + rows one at a time (constant memory whatever the row count).
+    Output goes to '<path>.part' and is renamed into place only once complete, so a
+    cancelled or failed export never leaves a truncated file behind. Returns the row count.
+    """
+    fmt = format_for(path, fmt)
+    tmp = path + ".part"
+    n = 0
+    try:
+        with _open_sink(tmp, fmt) as f:
+            w = csv.writer(f)
+            w.writerow(header)
+            for row in rows:
+                w.writerow(row)
+                n += 1
+                if n % PROGRESS_EVERY == 0:
+                    if should_cancel and should_cancel():
+                        raise ExportCancelled()
+                    if on_progress:
+                        on_progress(n)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    if on_progress:
+        on_progress(n)
+    return n
+
+
+class ExportJob:
+    """
+    Runs write_rows on a daemon thread. `rows` is a zero-arg callable producing the row
+    iterator; it is called on the worker thread, so database cursors belong to that thread.
+
+    Callbacks also fire on the worker thread (Qt pages relay them through a signal):
+      on_progress(rows_written)
+      on_done(job)  -> inspect job.rows_written / job.cancelled / job.error
+    """
+    def __init__(self, path: str, header: Sequence[str], rows: Callable[[], Iterable[Sequence[Any]]], *,
+                 fmt: Optional[str] = None,
+                 on_progress: Optional[Callable[[int], None]] = None,
+                 on_done: Optional[Callable[["ExportJob"], None]] = None):
+        self.path = path
+        self.fmt = format_for(path, fmt)
+        self._header = header
+        self._rows = rows
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"export:{os.path.basename(path)}", daemon=True)
+        self.rows_written = 0
+        self.cancelled = False
+        self.error: Optional[BaseException] = None
+
+    def start(self) -> "ExportJob":
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def _progress(self, n: int) -> None:
+        self.rows_written = n
+        if self._on_progress:
+            self._on_progress(n)
+
+    def _run(self) -> None:
+        try:
+            self.rows_written = write_rows(self.path, self._header, self._rows(), fmt=self.fmt,
+                                           on_progress=self._progress, should_cancel=self._cancel.is_set)
+        except ExportCancelled:
+            self.cancelled = True
+        except Exception as e:
+            self.error = e
+        if self._on_done:
+            self._on_done(self)
@@ -0,0 +1,244 @@
+# pages_logic/fetch_pool.py
+# GymPro — Application-wide fetch pool: priority lanes, request coalescing, supersede + interrupt
+#
+# Every page refresh goes through one shared pool (shared()) instead of a thread per keystroke
+# or a query on the GUI thread:
+#   - lanes: "scan" / "checkout" jobs are taken before "page" refreshes, which go before "report"
+#   - identical requests already queued or running share one job
+#   - a request submitted under a slot supersedes the previous one in that slot; a superseded
+#     job nobody else waits for is dropped from the queue, or, when already running, has its
+#     SQLite statement interrupted (db_pool.interrupt_thread) so the worker frees up at once
+# Results come back as concurrent.futures.Future; Qt pages wrap them with PageFetcher.
+from __future__ import annotations
+
+import concurrent.futures
+import heapq
+import itertools
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+try:
+    from pages_logic import db_pool  # type: ignore
+except Exception:
+    db_pool = None
+
+MAX_WORKERS = 3  # a scan never waits behind more than two slow reports
+LANES: Dict[str, int] = {"scan": 0, "checkout": 0, "page": 1, "report": 2}  # lower runs first
+
+_QUEUED, _RUNNING, _DONE, _DROPPED = range(4)
+
+
+class _Job:
+    """One call of fn(*args) and the tickets (caller futures) still waiting on it."""
+    __slots__ = ("fn", "args", "key", "state", "thread", "tickets", "interruptible")
+
+    def __init__(self, fn: Callable[..., Any], args: Tuple[Any, ...], key: Optional[Hashable],
+                 interruptible: bool):
+        self.fn = fn
+        self.args = args
+        self.key = key
+        self.state = _QUEUED
+        self.thread: Optional[int] = None
+        self.tickets: Set[concurrent.futures.Future] = set()
+        self.interruptible = interruptible
+
+
+class FetchPool:
+    """
+    Methods:
+      - submit(fn, *args, lane, key, slot, interruptible) -> Future
+          key:  coalescing key (default (fn, args) when hashable; None disables)
+          slot: supersede key, e.g. (page id, "search"): the previous ticket there is cancelled
+      - cancel_slot(slot)
+      - stats() -> {workers, queued, running, submitted, coalesced, superseded, dropped, interrupted}
+      - shutdown(wait)
+
+    Each caller gets its own ticket: cancelling it (Future.cancel, or a newer submit in the same
+    slot) releases the caller only; the job itself is dropped / interrupted once no ticket is left.
+    A job interrupted mid-query fails with sqlite3.OperationalError, which no ticket sees.
+    Workers start on first use; each keeps its own pool reader (db_pool.ConnectionPool).
+    """
+    def __init__(self, max_workers: int = MAX_WORKERS, *, name: str = "fetch"):
+        self.max_workers = max(1, int(max_workers))
+        self.name = name
+        self._cv = threading.Condition(threading.Lock())
+        self._heap: List[Tuple[int, int, _Job]] = []
+        self._order = itertools.count()
+        self._inflight: Dict[Hashable, _Job] = {}
+        self._slots: Dict[Hashable, concurrent.futures.Future] = {}
+        self._workers: List[threading.Thread] = []
+        self._idle = 0
+        self._running = 0
+        self._closed = False
+        self.submitted = 0
+        self.coalesced = 0    # submits that joined a queued / running job
+        self.superseded = 0   # tickets cancelled by a newer submit in their slot
+        self.dropped = 0      # queued jobs removed before they ran
+        self.interrupted = 0  # running jobs whose SQLite statement was interrupted
+
+    # ---------- submit / cancel ----------
+    def submit(self, fn: Callable[..., Any], *args: Any, lane: str = "page", key: Any = ...,
+               slot: Optional[Hashable] = None, interruptible: bool = True) -> concurrent.futures.Future:
+        if lane not in LANES:
+            raise ValueError(f"unknown lane {lane!r}; expected one of {', '.join(LANES)}")
+        if key is ...:
+            key = _default_key(fn, args)
+        ticket: concurrent.futures.Future = concurrent.futures.Future()
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("fetch pool is shut down")
+            self.submitted += 1
+            job = self._inflight.get(key) if key is not None else None
+            if job is None:
+                job = _Job(fn, args, key, interruptible)
+                if key is not None:
+                    self._inflight[key] = job
+            else:
+                self.coalesced += 1
+            job.tickets.add(ticket)
+            if job.state == _QUEUED:
+                # a coalesced call from a higher lane promotes the job; the stale entry is skipped
+                heapq.heappush(self._heap, (LANES[lane], next(self._order), job))
+                self._spawn()
+                self._cv.notify()
+            prev = None
+            if slot is not None:
+                prev = self._slots.get(slot)
+                self._slots[slot] = ticket
+        ticket.add_done_callback(lambda t, job=job, slot=slot: self._ticket_done(t, job, slot))
+        if prev is not None and prev.cancel():
+            with self._cv:
+                self.superseded += 1
+        return ticket
+
+    def cancel_slot(self, slot: Hashable) -> bool:
+        with self._cv:
+            ticket = self._slots.get(slot)
+        return ticket is not None and ticket.cancel()
+
+    def _ticket_done(self, ticket: concurrent.futures.Future, job: _Job, slot: Optional[Hashable]) -> None:
+        with self._cv:
+            if slot is not None and self._slots.get(slot) is ticket:
+                del self._slots[slot]
+            if not ticket.cancelled():
+                return
+            job.tickets.discard(ticket)
+            if job.tickets or job.state not in (_QUEUED, _RUNNING):
+                return
+            self._forget(job)
+            if job.state == _QUEUED:
+                job.state = _DROPPED
+                self.dropped += 1
+            elif job.interruptible and job.thread is not None and db_pool is not None:
+                # under the lock: the worker can't have moved on to another job yet
+                if db_pool.interrupt_thread(job.thread):
+                    self.interrupted += 1
+
+    def _forget(self, job: _Job) -> None:
+        if job.key is not None and self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+
+    # ---------- workers ----------
+    def _spawn(self) -> None:
+        # under self._cv
+        if len(self._heap) <= self._idle or len(self._workers) >= self.max_workers:
+            return
+        t = threading.Thread(target=self._work, name=f"{self.name}-{len(self._workers) + 1}", daemon=True)
+        self._workers.append(t)
+        t.start()
+
+    def _next_job(self) -> Optional[_Job]:
+        with self._cv:
+            while True:
+                while self._heap:
+                    _lane, _n, job = heapq.heappop(self._heap)
+                    if job.state == _QUEUED:
+                        job.state = _RUNNING
+                        job.thread = threading.get_ident()
+                        self._running += 1
+                        return job
+                if self._closed:
+                    return None
+                self._idle += 1
+                self._cv.wait()
+                self._idle -= 1
+
+    def _work(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                result, error = job.fn(*job.args), None
+            except BaseException as e:  # delivered to the tickets, never raised on the worker
+                result, error = None, e
+            with self._cv:
+                job.state = _DONE
+                job.thread = None
+                self._running -= 1
+                self._forget(job)
+                tickets = list(job.tickets)
+            for t in tickets:
+                try:
+                    if error is None:
+                        t.set_result(result)
+                    else:
+                        t.set_exception(error)
+                except concurrent.futures.InvalidStateError:
+                    pass  # cancelled while the job was finishing
+
+    # ---------- lifecycle ----------
+    def stats(self) -> Dict[str, int]:
+        with self._cv:
+            return {
+                "workers": len(self._workers),
+                "queued": sum(1 for _l, _n, j in self._heap if j.state == _QUEUED),
+                "running": self._running,
+                "submitted": self.submitted, "coalesced": self.coalesced, "superseded": self.superseded,
+                "dropped": self.dropped, "interrupted": self.interrupted,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel everything still queued and stop the workers once they are idle."""
+        with self._cv:
+            self._closed = True
+            pending = [j for _l, _n, j in self._heap if j.state == _QUEUED]
+            self._heap.clear()
+            self._cv.notify_all()
+            workers = list(self._workers)
+        for job in pending:
+            for t in list(job.tickets):
+                t.cancel()
+        if wait:
+            for t in workers:
+                t.join()
+
+
+def _default_key(fn: Callable[..., Any], args: Tuple[Any, ...]) -> Optional[Hashable]:
+    key = (fn, args)
+    try:
+        hash(key)
+    except TypeError:  # unhashable args (lists, dicts): no coalescing
+        return None
+    return key
+
+
+_shared: Optional[FetchPool] = None
+_shared_lock = threading.Lock()
+
+
+def shared() -> FetchPool:
+    """The application-wide pool every page submits to."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = FetchPool()
+        return _shared
+
+
+def shutdown() -> None:
+    global _shared
+    with _shared_lock:
+        pool, _shared = _shared, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,162 @@
+# pages_logic/login_throttle.py
+# GymPro — Login throttling: per-username + global token buckets, persisted lockouts (SQLite)
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional
+
+from pages_logic.db_pool import ConnectionPool
+
+# per username: a burst of 5 attempts, then one more every 30 s; emptying it locks the name
+USER_BURST = 5
+USER_REFILL_PER_SEC = 1 / 30.0
+LOCKOUT_SECONDS = 5 * 60.0
+# whole till: bounds failed attempts (each one a full scrypt) per second whatever the usernames tried
+GLOBAL_BURST = 20
+GLOBAL_REFILL_PER_SEC = 2.0
+MAX_TRACKED = 10_000  # username buckets kept in memory; full buckets are dropped first
+
+LOCKOUT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS login_lockouts(
+  username TEXT PRIMARY KEY,
+  locked_until REAL NOT NULL      -- unix time
+) WITHOUT ROWID;
+"""
+
+
+class LoginThrottled(Exception):
+    """Raised instead of checking a password; retry_after is in seconds."""
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(f"{reason}; retry in {int(retry_after) + 1}s")
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "stamp")
+
+    def __init__(self, capacity: float, rate: float, now: float):
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self.tokens = float(capacity)
+        self.stamp = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def take(self, now: float) -> bool:
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def wait(self, now: float) -> float:
+        """Seconds until the next token."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class LoginThrottle:
+    """
+    admit(username) runs before any password hashing and raises LoginThrottled when
+    - the username is locked out (its bucket ran dry; the lock survives restarts), or
+    - the global bucket is empty.
+    It only reads: attempts are charged by failed(username) once the password was wrong,
+    which takes a token from both buckets and locks the name when its bucket runs dry.
+    succeeded(username) refills that username's bucket.
+
+    Checks are in-memory (a lock, two dict lookups, a little arithmetic); SQLite is only
+    written when a lockout starts and read once at startup, so a good login never writes.
+    Attempts running concurrently are all admitted before any of them is charged; with
+    logins from one till that is a handful at most.
+    """
+    def __init__(self, pool: ConnectionPool, *,
+                 user_burst: int = USER_BURST, user_rate: float = USER_REFILL_PER_SEC,
+                 global_burst: int = GLOBAL_BURST, global_rate: float = GLOBAL_REFILL_PER_SEC,
+                 lockout_seconds: float = LOCKOUT_SECONDS):
+        self._pool = pool
+        self.user_burst, self.user_rate = user_burst, user_rate
+        self.lockout_seconds = float(lockout_seconds)
+        self._lock = threading.Lock()
+        self._global = TokenBucket(global_burst, global_rate, time.monotonic())
+        self._users: Dict[str, TokenBucket] = {}
+        with self._pool.writer() as conn:
+            conn.executescript(LOCKOUT_SCHEMA)
+            conn.execute("DELETE FROM login_lockouts WHERE locked_until <= ?", (time.time(),))
+        self._locked: Dict[str, float] = {
+            r[0]: r[1] for r in self._pool.reader().execute("SELECT username, locked_until FROM login_lockouts")
+        }
+
+    @staticmethod
+    def _key(username: str) -> str:
+        return (username or "").strip().lower()
+
+    def admit(self, username: str) -> None:
+        key = self._key(username)
+        now, wall = time.monotonic(), time.time()
+        with self._lock:
+            until = self._locked.get(key)
+            if until is not None:
+                if wall < until:
+                    raise LoginThrottled(until - wall, "too many failed attempts for this user")
+                del self._locked[key]
+            wait = self._global.wait(now)
+            if wait > 0.0:
+                raise LoginThrottled(wait, "too many login attempts")
+
+    def failed(self, username: str) -> None:
+        key = self._key(username)
+        now, wall = time.monotonic(), time.time()
+        lock_until: Optional[float] = None
+        with self._lock:
+            self._global.take(now)
+            bucket = self._users.get(key)
+            if bucket is None:
+                if len(self._users) >= MAX_TRACKED:
+                    self._prune(now)
+                bucket = self._users[key] = TokenBucket(self.user_burst, self.user_rate, now)
+            bucket.take(now)
+            if bucket.tokens < 1.0:
+                # that was the last token: lock the name
+                lock_until = wall + self.lockout_seconds
+                self._locked[key] = lock_until
+                del self._users[key]
+        if lock_until is not None:
+            self._persist(key, lock_until)
+
+    def succeeded(self, username: str) -> None:
+        key = self._key(username)
+        with self._lock:
+            self._users.pop(key, None)
+            unlock = self._locked.pop(key, None) is not None
+        if unlock:
+            with self._pool.writer() as conn:
+                conn.execute("DELETE FROM login_lockouts WHERE username = ?", (key,))
+
+    def locked_out(self) -> Dict[str, float]:
+        """{username: seconds left} for names currently locked."""
+        wall = time.time()
+        with self._lock:
+            return {k: until - wall for k, until in self._locked.items() if until > wall}
+
+    def unlock(self, username: str) -> None:
+        self.succeeded(username)
+
+    def _persist(self, key: str, until: float) -> None:
+        with self._pool.writer() as conn:
+            conn.execute("INSERT INTO login_lockouts(username, locked_until) VALUES (?, ?) "
+                         "ON CONFLICT(username) DO UPDATE SET locked_until = excluded.locked_until", (key, until))
+
+    def _prune(self, now: float) -> None:
+        # a full bucket is indistinguishable from a fresh one
+        for key in [k for k, b in self._users.items() if b.full(now)]:
+            del self._users[key]
+        while len(self._users) >= MAX_TRACKED:  # still full of live buckets: forget the oldest
+            self._users.pop(next(iter(self._users)))
@@ -0,0 +1,418 @@
+# pages_logic/member_index.py
+# GymPro — In-memory member search index: name-token prefix trie, phone digit n-grams, ID map
+#
+# Built once from MemberService at startup and kept current through upsert()/remove() on
+# member writes. Every posting list is sorted by the same key as the SQL name sort
+# (last name, first name, id; binary order, as SQLite compares TEXT), so a query merges its
+# lists lazily and stops after `limit` hits instead of collecting and sorting every match,
+# and a page cursor means the same thing to the index and to SQLite.
+from __future__ import annotations
+
+import functools
+import heapq
+import re
+import sys
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+NGRAM = 3  # phone fragments shorter than this are matched by a scan in name order
+MERGE_LISTS = 16  # a word expanding to more tokens than this reads its prefix list instead
+SKIP_LISTS = 4  # a driver skips ahead past a missed word only if it has at most this many lists
+PREFIX_DEPTH = 3  # prefix posting lists are kept for name prefixes up to this length
+
+Key = Tuple[str, str, int]  # (last_name or '', first_name or '', member_id): MemberService.member_cursor
+
+_SPLIT = re.compile(r"[^0-9a-z]+")
+_END = ""  # trie terminal marker: node[_END] = token
+
+
+@functools.lru_cache(maxsize=1 << 16)  # names repeat a lot: normalize each spelling once
+def _normalize(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s).casefold()
+    return sys.intern("".join(c for c in s if not unicodedata.combining(c)))
+
+
+def normalize(text: Any) -> str:
+    """casefold + strip accents ("Zoé" -> "zoe"); interned, so equal names share one string."""
+    return _normalize(str(text or ""))
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _tokens(s: str) -> Tuple[str, ...]:
+    return tuple(sys.intern(t) for t in _SPLIT.split(_normalize(s)) if t)
+
+
+def tokens(text: Any) -> Tuple[str, ...]:
+    return _tokens(str(text or ""))
+
+
+def _name_tokens(m: Dict[str, Any]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(tokens(m.get("first_name")) + tokens(m.get("last_name"))))
+
+
+def digits(text: Any) -> str:
+    return "".join(c for c in str(text or "") if c.isdigit())
+
+
+def matches(q: str, first_name: Any, last_name: Any, phone: Any, member_id: Any) -> bool:
+    """
+    The index's matching rules for a single member (see MemberIndex.search); MemberService
+    registers it as the SQL function member_match so searches answered by SQLite agree.
+    """
+    words = tokens(q)
+    if not words:
+        return True
+    qd = digits(q)
+    if qd and qd == "".join(words):
+        if (len(qd) < 19 and member_id is not None and int(qd) == int(member_id)) or qd in digits(phone):
+            return True
+    mine = _name_tokens({"first_name": first_name, "last_name": last_name})
+    return all(any(t.startswith(w) for t in mine) for w in words)
+
+
+class MemberIndex:
+    """
+    Methods:
+      - build(rows)                 replace the contents (rows as returned by find_members)
+      - upsert(member) / remove(id) keep it current on member writes
+      - search(q, status, limit, after)
+                                    same matching rules as the page search box:
+                                      ID (exact), name-token prefixes (all query words),
+                                      phone fragment with or without spaces (digits only)
+                                    after: cursor() of the last row of the previous page
+      - cursor(member)              keyset cursor in index order
+      - memory_report()
+
+    Thread-safe: searches run on worker threads while writes come from the GUI thread.
+    Member dicts are shared with callers and must be treated as read-only.
+    """
+    def __init__(self, rows: Iterable[Dict[str, Any]] = ()):
+        self._lock = threading.RLock()
+        self.build(rows)
+
+    # ---------- build / write ----------
+    def build(self, rows: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._members: Dict[int, Dict[str, Any]] = {}
+            self._keys: Dict[int, Key] = {}
+            self._phones: Dict[int, str] = {}
+            self._tokens: Dict[int, Tuple[str, ...]] = {}  # member -> its name tokens
+            self._all: List[Key] = []
+            self._trie: Dict[str, Any] = {}
+            self._postings: Dict[str, List[Key]] = {}   # name token -> keys
+            self._grams: Dict[str, List[Key]] = {}      # phone n-gram -> keys
+            self._status: Dict[str, List[Key]] = {}     # lower(status) -> keys
+            self._prefix: Dict[str, List[Key]] = {}     # name prefix (<= PREFIX_DEPTH chars) -> keys
+            staged: List[Tuple[Key, Dict[str, Any]]] = []
+            for m in rows:
+                staged.append((self._key(m), m))
+            staged.sort(key=lambda km: km[0])
+            # appending in key order keeps every list sorted without insort
+            for key, m in staged:
+                self._add(key, m, append=True)
+
+    def upsert(self, member: Dict[str, Any]) -> None:
+        with self._lock:
+            self._drop(int(member["id"]))
+            self._add(self._key(member), member, append=False)
+
+    def remove(self, member_id: int) -> None:
+        with self._lock:
+            self._drop(int(member_id))
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def cursor(self, member: Dict[str, Any]) -> Key:
+        return self._key(member)
+
+    @staticmethod
+    def _key(m: Dict[str, Any]) -> Key:
+        return (_name(m.get("last_name")), _name(m.get("first_name")), int(m["id"]))
+
+    def _add(self, key: Key, m: Dict[str, Any], *, append: bool) -> None:
+        mid = key[2]
+        self._members[mid] = m
+        self._keys[mid] = key
+        put = (lambda lst: lst.append(key)) if append else (lambda lst: insort(lst, key))
+        put(self._all)
+        toks = self._tokens[mid] = _name_tokens(m)
+        for tok in toks:
+            lst = self._postings.get(tok)
+            if lst is None:
+                lst = self._postings[tok] = []
+                self._trie_insert(tok)
+            put(lst)
+        for pre in _prefixes(toks):
+            put(self._prefix.setdefault(pre, []))
+        put(self._status.setdefault(_status(m), []))
+        ph = digits(m.get("phone"))
+        if ph:
+            self._phones[mid] = ph
+            for g in {ph[i:i + NGRAM] for i in range(len(ph) - NGRAM + 1)}:
+                put(self._grams.setdefault(g, []))
+
+    def _drop(self, mid: int) -> None:
+        key = self._keys.pop(mid, None)
+        if key is None:
+            return
+        m = self._members.pop(mid)
+        _remove_sorted(self._all, key)
+        _remove_sorted(self._status.get(_status(m), []), key)
+        toks = self._tokens.pop(mid, ())
+        for tok in toks:
+            lst = self._postings.get(tok)
+            if lst is not None:
+                _remove_sorted(lst, key)
+                if not lst:
+                    del self._postings[tok]
+                    self._trie_delete(tok)
+        for pre in _prefixes(toks):
+            lst = self._prefix.get(pre)
+            if lst is not None:
+                _remove_sorted(lst, key)
+                if not lst:
+                    del self._prefix[pre]
+        ph = self._phones.pop(mid, "")
+        for g in {ph[i:i + NGRAM] for i in range(len(ph) - NGRAM + 1)}:
+            lst = self._grams.get(g)
+            if lst is not None:
+                _remove_sorted(lst, key)
+                if not lst:
+                    del self._grams[g]
+
+    # ---------- trie ----------
+    def _trie_insert(self, tok: str) -> None:
+        node = self._trie
+        for ch in tok:
+            node = node.setdefault(ch, {})
+        node[_END] = tok
+
+    def _trie_delete(self, tok: str) -> None:
+        path = [self._trie]
+        for ch in tok:
+            nxt = path[-1].get(ch)
+            if nxt is None:
+                return
+            path.append(nxt)
+        path[-1].pop(_END, None)
+        for ch, node in zip(reversed(tok), reversed(path[:-1])):
+            if node[ch]:
+                break
+            del node[ch]
+
+    def _prefixed(self, prefix: str) -> List[str]:
+        """Distinct name tokens starting with `prefix`."""
+        node = self._trie
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        out, stack = [], [node]
+        while stack:
+            n = stack.pop()
+            for ch, child in n.items():
+                if ch == _END:
+                    out.append(child)
+                else:
+                    stack.append(child)
+        return out
+
+    # ---------- search ----------
+    def search(self, q: str = "", status: Optional[str] = None, limit: int = 50,
+               after: Optional[Key] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            if status:
+                by_status = self._status.get(status.lower())
+                if by_status is None:
+                    return []
+            else:
+                by_status = None
+            after = tuple(after) if after is not None else None
+            out: List[Dict[str, Any]] = []
+            last = None
+            for key in heapq.merge(*self._streams(q or "", by_status, after)):
+                if key == last:
+                    continue  # matched by more than one rule
+                last = key
+                out.append(self._members[key[2]])
+                if len(out) >= limit:
+                    break
+            return out
+
+    def _streams(self, q: str, by_status: Optional[List[Key]], after: Optional[Key]) -> List[Iterator[Key]]:
+        words = list(tokens(q))
+        if not words:
+            return [_tail(self._all if by_status is None else by_status, after)]
+        streams: List[Iterator[Key]] = []
+        qd = digits(q)
+        if qd and qd == "".join(words):  # digits (and spaces / dashes) only: ID or phone
+            key = self._keys.get(int(qd)) if len(qd) < 19 else None
+            if key is not None and (by_status is None or _contains(by_status, key)) \
+                    and (after is None or key > after):
+                streams.append(iter((key,)))
+            streams.append(self._phone_stream(qd, by_status, after))
+        streams.append(self._name_stream(words, by_status, after))
+        return streams
+
+    def _word_lists(self, word: str) -> List[List[Key]]:
+        """Sorted key lists whose union is every member with a name token starting with `word`."""
+        toks = self._prefixed(word)
+        if len(toks) <= MERGE_LISTS or len(word) > PREFIX_DEPTH:
+            return [self._postings[t] for t in toks]
+        return [self._prefix[word]]
+
+    def _name_stream(self, words: List[str], by_status: Optional[List[Key]],
+                     after: Optional[Key]) -> Iterator[Key]:
+        # the smallest candidate set drives (a word, or the status filter); the rest are
+        # checked per candidate against its own tokens / status, so the scan stops once
+        # `limit` members have passed
+        candidates = []
+        for w in words:
+            lists = self._word_lists(w)
+            if not lists:
+                return iter(())
+            candidates.append((sum(map(len, lists)), w, lists))
+        if by_status is not None:
+            candidates.append((len(by_status), None, [by_status]))
+        candidates.sort(key=lambda c: c[0])
+        _n, driver_word, lists = candidates[0]
+        checked = [(w, lst) for _n, w, lst in candidates[1:] if w is not None]
+        status = _status(self._members[by_status[0][2]]) if by_status is not None and driver_word else None
+        if status:
+            checked.insert(0, (status, []))  # status first: a dict lookup, cheaper than a token check
+        if not checked:
+            return _tail(lists[0], after) if len(lists) == 1 else heapq.merge(*(_tail(lst, after) for lst in lists))
+        if len(lists) == 1:
+            return self._skip_scan(lists[0], checked, after)
+        return (k for k in heapq.merge(*(_tail(lst, after) for lst in lists)) if self._passes(k, checked) is None)
+
+    def _passes(self, key: Key, checked: List[Tuple[Optional[str], List[List[Key]]]]) -> Optional[List[List[Key]]]:
+        """
+        None if `key` matches every checked word, else the lists of the first word it misses.
+        A status entry ([] lists: status is spread evenly, nothing to skip to) leads `checked`.
+        """
+        mid = key[2]
+        first = 0
+        if not checked[0][1]:
+            if _status(self._members[mid]) != checked[0][0]:
+                return checked[0][1]
+            first = 1
+        mine = self._tokens[mid]
+        for w, lists in checked[first:]:
+            if not any(t.startswith(w) for t in mine):
+                return lists
+        return None
+
+    def _skip_scan(self, driver: List[Key], checked: List[Tuple[Optional[str], List[List[Key]]]],
+                   after: Optional[Key]) -> Iterator[Key]:
+        # on a miss, jump the driver to the next key the missing word could match at all:
+        # name order clusters matches (every "Nadia K." sits among the Ks), so this skips
+        # whole runs of the driver instead of walking them
+        n = len(driver)
+        i = bisect_right(driver, after) if after is not None else 0
+        while i < n:
+            key = driver[i]
+            miss = self._passes(key, checked)
+            if miss is None:
+                yield key
+                i += 1
+                continue
+            if not miss or len(miss) > SKIP_LISTS:
+                i += 1
+                continue
+            nxt = None
+            for lst in miss:
+                j = bisect_right(lst, key)
+                if j < len(lst) and (nxt is None or lst[j] < nxt):
+                    nxt = lst[j]
+            if nxt is None:
+                return
+            i = bisect_left(driver, nxt, i + 1)
+
+    def _phone_stream(self, qd: str, by_status: Optional[List[Key]], after: Optional[Key]) -> Iterator[Key]:
+        base = self._all if by_status is None else by_status
+        status = None
+        if len(qd) >= NGRAM:
+            grams = {qd[i:i + NGRAM] for i in range(len(qd) - NGRAM + 1)}
+            if any(g not in self._grams for g in grams):
+                return iter(())
+            rarest = min((self._grams[g] for g in grams), key=len)
+            if len(rarest) < len(base):
+                if by_status is not None:
+                    status = _status(self._members[by_status[0][2]])
+                base = rarest
+        phones, members = self._phones, self._members
+        return (k for k in _tail(base, after)
+                if qd in phones.get(k[2], "") and (status is None or _status(members[k[2]]) == status))
+
+    # ---------- memory ----------
+    def memory_report(self) -> Dict[str, Any]:
+        """Sizes of the index structures (member dicts themselves excluded: they are shared)."""
+        with self._lock:
+            def lists_bytes(d: Dict[str, List[Key]]) -> int:
+                return sys.getsizeof(d) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in d.items())
+
+            trie_nodes, trie_bytes, stack = 0, 0, [self._trie]
+            while stack:
+                n = stack.pop()
+                trie_nodes += 1
+                trie_bytes += sys.getsizeof(n)
+                stack.extend(v for k, v in n.items() if k != _END)
+            # name strings are interned: count each distinct one once
+            names = {id(x): x for k in self._keys.values() for x in k[:2]}
+            keys_bytes = sum(sys.getsizeof(k) + sys.getsizeof(k[2]) for k in self._keys.values())
+            keys_bytes += sum(map(sys.getsizeof, names.values()))
+            tok_bytes = sys.getsizeof(self._tokens) + sum(sys.getsizeof(t) for t in self._tokens.values())
+            parts = {
+                "keys": keys_bytes + sys.getsizeof(self._keys) + sys.getsizeof(self._all),
+                "member_tokens": tok_bytes,
+                "trie": trie_bytes,
+                "name_postings": lists_bytes(self._postings),
+                "name_prefixes": lists_bytes(self._prefix),
+                "phone_ngrams": lists_bytes(self._grams),
+                "phones": sys.getsizeof(self._phones) + sum(sys.getsizeof(p) for p in self._phones.values()),
+                "id_map": sys.getsizeof(self._members),
+            }
+            return {
+                "members": len(self._members),
+                "name_tokens": len(self._postings),
+                "trie_nodes": trie_nodes,
+                "phone_ngrams": len(self._grams),
+                "postings": sum(map(len, self._postings.values())) + sum(map(len, self._grams.values())),
+                "bytes": parts,
+                "total_mib": sum(parts.values()) / (1 << 20),
+            }
+
+
+def _remove_sorted(lst: List[Key], key: Key) -> None:
+    i = bisect_left(lst, key)
+    if i < len(lst) and lst[i] == key:
+        del lst[i]
+
+
+def _tail(lst: List[Key], after: Optional[Key]) -> Iterator[Key]:
+    """lst past the search cursor (bisect, so a deep page starts where the last one ended)."""
+    if after is None:
+        return iter(lst)
+    return map(lst.__getitem__, range(bisect_right(lst, after), len(lst)))
+
+
+def _name(value: Any) -> str:
+    # as COALESCE(name, '') sorts; interned, so equal names share one string
+    return sys.intern(value) if isinstance(value, str) else "" if value is None else str(value)
+
+
+def _status(m: Dict[str, Any]) -> str:
+    return (m.get("status") or "").lower()
+
+
+def _contains(lst: List[Key], key: Key) -> bool:
+    i = bisect_left(lst, key)
+    return i < len(lst) and lst[i] == key
+
+
+def _prefixes(toks: Iterable[str]) -> set:
+    return {t[:i] for t in toks for i in range(1, min(len(t), PREFIX_DEPTH) + 1)}
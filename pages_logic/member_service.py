@@ -0,0 +1,338 @@
+# pages_logic/member_service.py
+# GymPro — MemberService for the Members page live search (SQLite)
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from pages_logic import search_index
+from pages_logic.db_pool import ConnectionPool, require_tables
+from pages_logic.member_index import MemberIndex, digits, matches, tokens
+
+MEMBER_COLUMNS = ("phone", "status", "join_date")
+PAGE_SIZE = 50
+COUNT_CAP = 1000  # approximate counts stop here ("1000+")
+
+# bumped by every write to members, from any connection: the in-memory index compares it with
+# the version it was built at (same data_version table as AccountingService, own row)
+MEMBERS_VERSION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS data_version(
+  name TEXT PRIMARY KEY,
+  version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO data_version(name, version) VALUES ('members', 0);
+""" + "\n".join(
+    f"CREATE TRIGGER IF NOT EXISTS trg_members_version_{suffix} AFTER {event} ON members BEGIN "
+    "UPDATE data_version SET version = version + 1 WHERE name = 'members'; END;"
+    for suffix, event in (("ai", "INSERT"), ("ad", "DELETE"), ("au", "UPDATE"))
+)
+
+# sort -> (key expressions, direction); the member_id tiebreaker makes every key unique,
+# so the last row of a page is an exact keyset cursor
+_NAME_KEY = ("COALESCE(m.last_name,'')", "COALESCE(m.first_name,'')", "m.member_id")
+SORTS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "name": (_NAME_KEY, "ASC"),
+    "id": (("m.member_id",), "ASC"),
+    "newest": (("COALESCE(m.join_date,'')", "m.member_id"), "DESC"),
+}
+
+
+def _after_clause(keys: Tuple[str, ...], op: str) -> str:
+    """
+    (k0, k1, ...) strictly after (:c0, :c1, ...). Spelled out with a leading `k0 >= :c0`
+    because SQLite does not seek an expression index on a row-value comparison; this
+    form starts the index walk at the cursor instead of at the first row.
+    """
+    cond = f"{keys[-1]} {op} :c{len(keys) - 1}"
+    for i in range(len(keys) - 2, -1, -1):
+        cond = f"{keys[i]} {op} :c{i} OR ({keys[i]} = :c{i} AND ({cond}))"
+    return f"{keys[0]} {op}= :c0 AND ({cond})"
+
+
+class MemberService:
+    """
+    Methods:
+      - find_members(q, status, limit)
+      - find_members_page(q, status, sort, limit, after) -> {rows, next, total, exact}
+      - count_members(q, status, exact) -> (count, exact)
+      - member_cursor(row, sort)
+      - data_version() / rebuild_index()
+      - index_report() -> MemberIndex.memory_report() (None while building / disabled)
+
+    With memory_index=True (default) a MemberIndex is built on a background thread at
+    startup; once it is ready, searches with a query (find_members, and name-sorted
+    find_members_page / count_members) are answered from it instead of SQLite. Triggers bump
+    the members data version on every write (any connection, any page); while the index is
+    older than that, searches go to SQLite and one background rebuild catches it up. Both paths
+    match by name-token prefix ("na ka" finds Nadia Karimi), phone digits and exact ID
+    (SQLite through the member_match function) and sort names the same way, so a cursor
+    from either path pages on the other.
+
+    Data model used:
+      members(member_id, first_name, last_name, phone, status, join_date)
+    """
+    def __init__(self, db_path: str, *, memory_index: bool = True):
+        self.db_path = db_path
+        require_tables(db_path, ("members",))
+        # MembersPage searches from worker threads: per-thread readers, serialized writer
+        self._pool = ConnectionPool(self.db_path, on_open=_register_functions)
+        self._ensure_indexes()
+        with self._pool.writer() as conn:
+            conn.executescript(MEMBERS_VERSION_SCHEMA)
+            self._fts = search_index.ensure_search_index(conn)
+        present = {r[1] for r in self._conn.execute("PRAGMA table_info(members)").fetchall()}
+        # optional columns read as NULL when the schema predates them
+        self._cols = ", ".join(f"m.{c}" if c in present else f"NULL AS {c}" for c in MEMBER_COLUMNS)
+        self._present = present
+        self._ensure_page_indexes()
+        self._index: Optional[MemberIndex] = None
+        self._index_version = -1
+        self._index_lock = threading.Lock()
+        self._rebuilding = False  # a background rebuild is queued / running
+        self._memory_index = memory_index
+        if memory_index:
+            self._schedule_rebuild()
+
+    # ---------- infra ----------
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """The calling thread's read connection."""
+        return self._pool.reader()
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def _ensure_indexes(self):
+        with self._pool.writer() as conn:
+            conn.executescript(
+                """
+                CREATE INDEX IF NOT EXISTS idx_members_name ON members(last_name, first_name);
+                """
+            )
+
+    def _ensure_page_indexes(self):
+        # keyset pages walk these expression indexes in ORDER BY order (no sort step)
+        stmts = ["CREATE INDEX IF NOT EXISTS idx_members_name_key ON members("
+                 "COALESCE(last_name,''), COALESCE(first_name,''), member_id)"]
+        if "status" in self._present:
+            stmts.append("CREATE INDEX IF NOT EXISTS idx_members_status_name_key ON members("
+                         "LOWER(status), COALESCE(last_name,''), COALESCE(first_name,''), member_id)")
+        if "join_date" in self._present:
+            stmts.append("CREATE INDEX IF NOT EXISTS idx_members_join_key ON members("
+                         "COALESCE(join_date,''), member_id)")
+            if "status" in self._present:
+                stmts.append("CREATE INDEX IF NOT EXISTS idx_members_status_join_key ON members("
+                             "LOWER(status), COALESCE(join_date,''), member_id)")
+        with self._pool.writer() as conn:
+            for stmt in stmts:
+                conn.execute(stmt)
+
+    # ---------- in-memory index ----------
+    def _select_members(self, where: str = "1=1", params: Any = ()) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            f"SELECT m.member_id AS id, m.first_name, m.last_name, {self._cols}, 0 AS debt"
+            f" FROM members m WHERE {where}", params
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def data_version(self) -> int:
+        """Counter bumped by every insert / update / delete on members (any connection)."""
+        row = self._conn.execute("SELECT version FROM data_version WHERE name = 'members'").fetchone()
+        return row[0] if row else 0
+
+    def rebuild_index(self) -> MemberIndex:
+        """(Re)load every member into a fresh MemberIndex; searches use SQLite until it is ready."""
+        with self._index_lock:  # one rebuild at a time
+            # version read before the load: a load newer than its version only costs a rebuild
+            version = self.data_version()
+            index = MemberIndex(self._select_members())
+            self._index, self._index_version = index, version
+        return index
+
+    def _schedule_rebuild(self) -> None:
+        with self._index_lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._build_index, name="member-index", daemon=True).start()
+
+    def _build_index(self) -> None:
+        try:
+            self.rebuild_index()
+        except sqlite3.Error:
+            pass  # closed while building, or no members table yet: searches stay on SQLite
+        finally:
+            with self._index_lock:
+                self._rebuilding = False
+
+    def index_report(self) -> Optional[Dict[str, Any]]:
+        index = self._index
+        return index.memory_report() if index is not None else None
+
+    def _indexed(self, q: str) -> Optional[MemberIndex]:
+        """
+        The index, when it is ready, current, and the query is one it answers (empty lists
+        stay on SQLite). A stale index schedules a rebuild and sends this search to SQLite.
+        """
+        if not q:
+            return None
+        # version before index: rebuild_index assigns them in the other order, so a racing
+        # rebuild can only make a current index look stale, never a stale one current
+        version, index = self._index_version, self._index
+        if index is None:
+            return None
+        if version != self.data_version():
+            self._schedule_rebuild()
+            return None
+        return index
+
+    # ---------- search ----------
+    def _where(self, q: str, status: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        # candidates: members whose ID / name / phone text contains the longest query word
+        # (search_fts for 3+ chars, a LIKE over the same text below that); member_match then
+        # applies the index's rules to them. Names spelled with accents ("Zoé") or phones with
+        # separators other than space / dash / dot can miss the candidate step until the index
+        # is ready.
+        params: Dict[str, Any] = {"q": q}
+        where = "1=1"
+        words = tokens(q)
+        if words:
+            word = max(words, key=len)
+            params["like"] = f"%{word}%"
+            if self._fts and search_index.use_index(word):
+                cand = "m.member_id IN (SELECT ref FROM search_fts WHERE body LIKE :like AND kind = 'member')"
+            else:
+                cand = f"({search_index.member_body('m', 'phone' in self._present)}) LIKE :like"
+            qd = digits(q)
+            if qd and qd == "".join(words) and len(qd) < 19:
+                cand += " OR m.member_id = :qid"  # "0042" is ID 42
+                params["qid"] = int(qd)
+            phone = "m.phone" if "phone" in self._present else "NULL"
+            where += f" AND ({cand}) AND member_match(:q, m.first_name, m.last_name, {phone}, m.member_id)"
+        if status:
+            where += " AND LOWER(m.status) = :status"
+            params["status"] = status.lower()
+        return where, params
+
+    def find_members(self, q: str = "", status: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Members matching `q` (name-token prefixes, phone with or without spaces, or ID) and
+        optional status, as {id, first_name, last_name, phone, status, join_date, debt} sorted
+        by name. Answered from the in-memory index when it is ready; otherwise queries of 3+
+        chars go through the search_fts trigram index.
+        """
+        q = (q or "").strip()
+        index = self._indexed(q)
+        if index is not None:
+            # copies: callers decorate rows (debt, ...) and the index shares its dicts across threads
+            return [dict(m) for m in index.search(q, status, int(limit))]
+        where, params = self._where(q, status)
+        params["lim"] = int(limit)
+
+        rows = self._conn.execute(
+            f"""
+            SELECT m.member_id AS id, m.first_name, m.last_name, {self._cols}, 0 AS debt
+            FROM members m
+            WHERE {where}
+            ORDER BY COALESCE(m.last_name,''), COALESCE(m.first_name,''), m.member_id
+            LIMIT :lim
+            """,
+            params,
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def find_members_page(self, q: str = "", status: Optional[str] = None, sort: str = "name",
+                          limit: int = PAGE_SIZE, after: Optional[Tuple[Any, ...]] = None,
+                          *, count: bool = True) -> Dict[str, Any]:
+        """
+        One page of find_members, materializing only `limit` rows:
+          {rows, next, total, exact}
+        - next: cursor for after= (None on the last page); keyset, so page 2000 costs what page 1 does
+        - total: match count, exact below COUNT_CAP, else COUNT_CAP with exact=False
+          (count_members(..., exact=True) gives the real number)
+        sort: "name" (last, first), "id", or "newest" (join date).
+        """
+        q = (q or "").strip()
+        if sort not in SORTS:
+            raise ValueError(f"unknown sort {sort!r}; expected one of {', '.join(SORTS)}")
+        index = self._indexed(q) if sort == "name" else None
+        if index is not None:
+            return self._index_page(index, q, status, limit, after, count)
+        keys, direction = SORTS[sort]
+        where, params = self._where(q, status)
+        params["lim"] = int(limit) + 1  # one extra row says whether a next page exists
+        if after is not None:
+            if len(after) != len(keys):
+                raise ValueError(f"cursor for sort {sort!r} needs {len(keys)} values")
+            where += " AND " + _after_clause(keys, ">" if direction == "ASC" else "<")
+            params.update((f"c{i}", v) for i, v in enumerate(after))
+        order = ", ".join(f"{k} {direction}" for k in keys)
+        rows = [dict(r) for r in self._conn.execute(
+            f"""
+            SELECT m.member_id AS id, m.first_name, m.last_name, {self._cols}, 0 AS debt
+            FROM members m
+            WHERE {where}
+            ORDER BY {order}
+            LIMIT :lim
+            """,
+            params,
+        ).fetchall()]
+        more = len(rows) > limit
+        rows = rows[:limit]
+        out: Dict[str, Any] = {"rows": rows, "next": self.member_cursor(rows[-1], sort) if more else None,
+                               "total": None, "exact": False}
+        if count:
+            if after is None and not more:
+                out["total"], out["exact"] = len(rows), True  # the whole result fit on this page
+            else:
+                out["total"], out["exact"] = self.count_members(q, status)
+        return out
+
+    def _index_page(self, index: MemberIndex, q: str, status: Optional[str], limit: int,
+                    after: Optional[Tuple[Any, ...]], count: bool) -> Dict[str, Any]:
+        # the index orders by member_cursor(row, "name"): SQL and index cursors are interchangeable
+        rows = [dict(m) for m in index.search(q, status, int(limit) + 1, after)]
+        more = len(rows) > limit
+        rows = rows[:limit]
+        out: Dict[str, Any] = {"rows": rows, "next": self.member_cursor(rows[-1]) if more else None,
+                               "total": None, "exact": False}
+        if count:
+            if after is None and not more:
+                out["total"], out["exact"] = len(rows), True
+            else:
+                out["total"], out["exact"] = self.count_members(q, status)
+        return out
+
+    def count_members(self, q: str = "", status: Optional[str] = None, exact: bool = False) -> Tuple[int, bool]:
+        """
+        (count, is_exact). The default stops counting at COUNT_CAP, which bounds the cost of a
+        broad search to a short index walk; exact=True counts everything.
+        """
+        q = (q or "").strip()
+        index = self._indexed(q)
+        if index is not None:
+            n = len(index.search(q, status, 10 ** 9 if exact else COUNT_CAP + 1))
+            return (n, True) if exact or n <= COUNT_CAP else (COUNT_CAP, False)
+        where, params = self._where(q, status)
+        if exact:
+            n = self._conn.execute(f"SELECT COUNT(*) FROM members m WHERE {where}", params).fetchone()[0]
+            return int(n), True
+        params["cap"] = COUNT_CAP + 1
+        n = self._conn.execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM members m WHERE {where} LIMIT :cap)", params
+        ).fetchone()[0]
+        return (int(n), True) if n <= COUNT_CAP else (COUNT_CAP, False)
+
+    @staticmethod
+    def member_cursor(row: Dict[str, Any], sort: str = "name") -> Tuple[Any, ...]:
+        """Keyset cursor of a member row, for find_members_page(after=...)."""
+        if sort == "id":
+            return (row["id"],)
+        if sort == "newest":
+            return (row.get("join_date") or "", row["id"])
+        return (row.get("last_name") or "", row.get("first_name") or "", row["id"])
+
+
+def _register_functions(conn: sqlite3.Connection) -> None:
+    conn.create_function("member_match", 5, matches, deterministic=True)
@@ -0,0 +1,114 @@
+# pages_logic/permissions.py
+# GymPro — Role capabilities as integer bitmasks; O(1) guards for services and navigation
+#
+# A role compiles to one int (OR of capability bits). The logged-in user's mask is cached
+# in a module global at login, so a check is a global read and an AND:
+#
+#   @requires(Z_EXPORT)
+#   def export_z(self, ...): ...
+#
+#   if not allowed(POS_CHECKOUT): ...
+#
+# Until the first login the mask is ALL (the app runs without a login screen today);
+# after logout it is 0.
+from __future__ import annotations
+
+import functools
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+# -------- capabilities --------
+POS_CHECKOUT = 1 << 0
+REFUND = 1 << 1
+Z_EXPORT = 1 << 2
+MEMBER_EDIT = 1 << 3
+SETTINGS = 1 << 4
+ACCOUNTING = 1 << 5   # invoices / Z-report pages
+INVENTORY = 1 << 6    # stock edits
+
+CAPABILITIES: Dict[str, int] = {
+    "POS checkout": POS_CHECKOUT,
+    "Refunds": REFUND,
+    "Z-report export": Z_EXPORT,
+    "Member edit": MEMBER_EDIT,
+    "Settings": SETTINGS,
+    "Accounting": ACCOUNTING,
+    "Inventory": INVENTORY,
+}
+ALL = functools.reduce(lambda a, b: a | b, CAPABILITIES.values())
+
+DEFAULT_ROLES: Dict[str, int] = {
+    "Admin": ALL,
+    "Cashier": POS_CHECKOUT | MEMBER_EDIT,
+    "Trainer": MEMBER_EDIT,
+    "Auditor": ACCOUNTING | Z_EXPORT,
+}
+
+# navigation guard for RouterQt.goto (routes not listed are open)
+ROUTE_PERMISSIONS: Dict[str, int] = {
+    "POS": POS_CHECKOUT,
+    "Accounting": ACCOUNTING,
+    "Inventory": INVENTORY,
+    "Settings": SETTINGS,
+}
+
+
+class PermissionDenied(PermissionError):
+    pass
+
+
+def compile_mask(names: Iterable[str]) -> int:
+    """Capability names (keys of CAPABILITIES) -> bitmask; unknown names raise KeyError."""
+    mask = 0
+    for name in names:
+        mask |= CAPABILITIES[name]
+    return mask
+
+
+def names(mask: int) -> List[str]:
+    return [name for name, bit in CAPABILITIES.items() if mask & bit]
+
+
+# -------- current principal --------
+_mask: int = ALL
+_user: Optional[Dict[str, Any]] = None
+
+
+def set_current_user(user: Optional[Dict[str, Any]]) -> None:
+    """Install the logged-in user (a verified AuthService dict carrying 'perms'); None logs out."""
+    global _mask, _user
+    _user = user
+    _mask = int(user.get("perms", 0)) if user else 0
+
+
+def current_user() -> Optional[Dict[str, Any]]:
+    return _user
+
+
+def allowed(perm: int) -> bool:
+    return _mask & perm == perm
+
+
+def check(perm: int) -> None:
+    if _mask & perm != perm:
+        raise PermissionDenied(f"requires {', '.join(names(perm)) or perm}")
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def requires(perm: int) -> Callable[[F], F]:
+    """Method/function guard raising PermissionDenied when the current user lacks `perm`."""
+    def deco(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _mask & perm != perm:
+                raise PermissionDenied(f"{fn.__qualname__} requires {', '.join(names(perm))}")
+            return fn(*args, **kwargs)
+        wrapper.required_permission = perm  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+    return deco
+
+
+def can_visit(route: str) -> bool:
+    need = ROUTE_PERMISSIONS.get(route, 0)
+    return _mask & need == need
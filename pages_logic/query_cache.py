@@ -0,0 +1,75 @@
+# pages_logic/query_cache.py
+# GymPro — LRU + TTL cache for read-query results, validated against a data version
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+MAX_ENTRIES = 256
+TTL_SECONDS = 60.0
+
+MISS = object()
+
+
+class QueryCache:
+    """
+    Entries remember the data version they were computed at; a lookup with any other
+    version is a miss (and drops the entry), so writes invalidate precisely without
+    tracking which keys they touch. TTL bounds staleness for anything the version misses.
+
+    Counters (stats()): hits, misses, evictions (LRU), expired (TTL), invalidated (version).
+    Thread-safe; values are shared between callers and must be treated as read-only.
+    """
+    def __init__(self, maxsize: int = MAX_ENTRIES, ttl: float = TTL_SECONDS):
+        self.maxsize = int(maxsize)
+        self.ttl = float(ttl)
+        self._data: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expired = self.invalidated = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get(self, key: Hashable, version: int) -> Any:
+        """The cached value, or MISS."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISS
+            v, expires, value = entry
+            if v != version:
+                del self._data[key]
+                self.invalidated += 1
+                self.misses += 1
+                return MISS
+            if time.monotonic() >= expires:
+                del self._data[key]
+                self.expired += 1
+                self.misses += 1
+                return MISS
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (version, time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "expired": self.expired, "invalidated": self.invalidated}
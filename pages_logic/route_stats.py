@@ -0,0 +1,108 @@
+# pages_logic/route_stats.py
+# GymPro — Per-user route-visit histogram (drives page preloading), persisted in SQLite
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from pages_logic.db_pool import ConnectionPool
+
+try:
+    from pages_logic import fetch_pool
+except Exception:
+    fetch_pool = None
+
+FLUSH_EVERY = 20  # buffered visits before record() queues a flush
+DATA_DIR_ENV = "GYMPRO_DATA_DIR"  # overrides the per-user data directory
+
+ROUTE_STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS route_visits(
+  username TEXT NOT NULL,          -- '' before anyone has logged in
+  route TEXT NOT NULL,
+  visits INTEGER NOT NULL DEFAULT 0,
+  last_visit REAL NOT NULL,        -- unix time
+  PRIMARY KEY(username, route)
+) WITHOUT ROWID;
+"""
+
+
+def default_stats_path() -> str:
+    """route_stats.db in the per-user data directory (created if missing), not the gym database."""
+    base = os.environ.get(DATA_DIR_ENV)
+    if not base:
+        if sys.platform == "win32":
+            base = os.path.join(os.environ.get("APPDATA") or os.path.expanduser("~"), "GymPro")
+        elif sys.platform == "darwin":
+            base = os.path.expanduser("~/Library/Application Support/GymPro")
+        else:
+            base = os.path.join(os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"), "gympro")
+    os.makedirs(base, exist_ok=True)
+    return os.path.join(base, "route_stats.db")
+
+
+class RouteStats:
+    """
+    Methods:
+      - record(username, route)              count one navigation (in memory)
+      - top(username, n, exclude=())         most-visited routes, most recent first on ties
+      - flush()                              write buffered visits
+      - histogram(username) -> {route: visits}
+
+    Navigation happens on the GUI thread, so record() only bumps counters. Every FLUSH_EVERY
+    visits it queues flush() on the fetch pool's report lane; the shell also calls flush()
+    at shutdown. Without a fetch pool, visits stay buffered until that final flush.
+    """
+    def __init__(self, db_path: str):
+        self._pool = ConnectionPool(db_path)
+        with self._pool.writer() as conn:
+            conn.executescript(ROUTE_STATS_SCHEMA)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Counter] = {}
+        self._last: Dict[Tuple[str, str], float] = {}
+        self._pending: Counter = Counter()
+        for user, route, visits, last in self._pool.reader().execute(
+                "SELECT username, route, visits, last_visit FROM route_visits"):
+            self._counts.setdefault(user, Counter())[route] = visits
+            self._last[(user, route)] = last
+
+    def record(self, username: str, route: str) -> None:
+        key = (username or "", route)
+        with self._lock:
+            self._counts.setdefault(key[0], Counter())[route] += 1
+            self._last[key] = time.time()
+            self._pending[key] += 1
+            due = sum(self._pending.values()) >= FLUSH_EVERY
+        if due and fetch_pool is not None:
+            try:
+                fetch_pool.shared().submit(self.flush, lane="report", interruptible=False)
+            except RuntimeError:
+                pass  # pool shut down: the shutdown flush writes them
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            rows = [(u, r, n, self._last[(u, r)]) for (u, r), n in pending.items()]
+        if not rows:
+            return
+        with self._pool.writer() as conn:
+            conn.executemany(
+                "INSERT INTO route_visits(username, route, visits, last_visit) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(username, route) DO UPDATE SET visits = visits + excluded.visits, "
+                "last_visit = MAX(last_visit, excluded.last_visit)", rows)
+
+    def histogram(self, username: str) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts.get(username or "", {}))
+
+    def top(self, username: str, n: int, exclude: Iterable[str] = ()) -> List[str]:
+        user = username or ""
+        skip = set(exclude)
+        with self._lock:
+            counts = self._counts.get(user, Counter())
+            ranked = sorted((r for r in counts if r not in skip),
+                            key=lambda r: (counts[r], self._last.get((user, r), 0.0)), reverse=True)
+        return ranked[:max(0, n)]
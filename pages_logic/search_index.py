@@ -0,0 +1,92 @@
+# pages_logic/search_index.py
+# GymPro — FTS5 (trigram) shadow index for member / invoice search boxes
+#
+# search_fts(kind, ref, body):
+#   member  ref = member_id       body = "<id> <first> <last> <phone> <phone digits>"   (Members search)
+#   name    ref = member_id       body = "<first> <last>"                               (invoice search)
+#   pos     ref = order_id        body = "<order_id>"
+#   sub     ref = payment_id      body = "<payment_id>"
+# Kept in sync with triggers; trigram lets `body LIKE '%q%'` use the index for q of 3+ chars.
+from __future__ import annotations
+
+import sqlite3
+from typing import List
+
+MIN_QUERY = 3  # trigram needs at least 3 characters; shorter queries fall back to LIKE scans
+
+
+def member_body(r: str, has_phone: bool) -> str:
+    body = f"{r}.member_id || ' ' || COALESCE({r}.first_name,'') || ' ' || COALESCE({r}.last_name,'')"
+    if has_phone:
+        digits = f"replace(replace(replace(COALESCE({r}.phone,''),' ',''),'-',''),'.','')"
+        body += f" || ' ' || COALESCE({r}.phone,'') || ' ' || {digits}"
+    return body
+
+
+def _name_body(r: str) -> str:
+    # same text as accounting_service._FULL_NAME: invoice search must match exactly what its LIKE did
+    return f"TRIM(COALESCE({r}.first_name,'')||' '||COALESCE({r}.last_name,''))"
+
+
+def _statements(has_phone: bool) -> List[str]:
+    sql = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(kind UNINDEXED, ref UNINDEXED, body, tokenize='trigram')",
+    ]
+    sources = (
+        # (trigger tag, table, kind, key, body)
+        ("members", "members", "member", "member_id", lambda r: member_body(r, has_phone)),
+        ("member_names", "members", "name", "member_id", _name_body),
+        ("pos_orders", "pos_orders", "pos", "order_id", lambda r: f"CAST({r}.order_id AS TEXT)"),
+        ("payments", "payments", "sub", "payment_id", lambda r: f"CAST({r}.payment_id AS TEXT)"),
+    )
+    for tag, table, kind, key, body in sources:
+        ins = f"INSERT INTO search_fts(kind, ref, body) VALUES ('{kind}', NEW.{key}, {body('NEW')});"
+        dele = f"DELETE FROM search_fts WHERE kind = '{kind}' AND ref = OLD.{key};"
+        sql += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_fts_{tag}_ai AFTER INSERT ON {table} BEGIN {ins} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_fts_{tag}_ad AFTER DELETE ON {table} BEGIN {dele} END",
+        ]
+        if table == "members":
+            # names / phones change; invoice numbers do not
+            sql.append(f"CREATE TRIGGER IF NOT EXISTS trg_fts_{tag}_au AFTER UPDATE ON {table} BEGIN {dele} {ins} END")
+    return sql
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> None:
+    """Refill search_fts from members, pos_orders and payments."""
+    has_phone = _has_column(conn, "members", "phone")
+    with conn:
+        conn.execute("DELETE FROM search_fts")
+        conn.execute(f"INSERT INTO search_fts(kind, ref, body) SELECT 'member', m.member_id, {member_body('m', has_phone)} FROM members m")
+        conn.execute(f"INSERT INTO search_fts(kind, ref, body) SELECT 'name', m.member_id, {_name_body('m')} FROM members m")
+        conn.execute("INSERT INTO search_fts(kind, ref, body) SELECT 'pos', o.order_id, CAST(o.order_id AS TEXT) FROM pos_orders o")
+        conn.execute("INSERT INTO search_fts(kind, ref, body) SELECT 'sub', p.payment_id, CAST(p.payment_id AS TEXT) FROM payments p")
+        conn.execute("INSERT INTO search_fts(search_fts) VALUES ('optimize')")
+
+
+def ensure_search_index(conn: sqlite3.Connection) -> bool:
+    """
+    Create search_fts + triggers (backfilling on first creation).
+    Returns False when this SQLite build lacks FTS5/trigram; callers then keep plain LIKE matching.
+    """
+    try:
+        existed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='search_fts'"
+        ).fetchone() is not None
+        has_phone = _has_column(conn, "members", "phone")
+        with conn:
+            for stmt in _statements(has_phone):
+                conn.execute(stmt)
+    except sqlite3.OperationalError:
+        return False
+    if not existed:
+        rebuild_search_index(conn)
+    return True
+
+
+def use_index(q: str) -> bool:
+    return len(q) >= MIN_QUERY
+
+
+def _has_column(conn: sqlite3.Connection, table: str, col: str) -> bool:
+    return any(r[1] == col for r in conn.execute(f"PRAGMA table_info({table})").fetchall())
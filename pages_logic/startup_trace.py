@@ -0,0 +1,142 @@
+# pages_logic/startup_trace.py
+# GymPro — Startup tracer: wall-time spans for imports, page builds, first fetch / first paint
+#
+#   GYMPRO_TRACE=startup.json python main_qt.py       (or: python main_qt.py --trace startup.json)
+#
+# The file is Chrome trace format (chrome://tracing, Perfetto): complete events ("X") for
+# spans, instant events ("i") for marks. Disabled, every call is a flag test.
+from __future__ import annotations
+
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+ENV_VAR = "GYMPRO_TRACE"
+MIN_IMPORT_US = 200  # imports faster than this are dropped from the trace
+
+_t0 = time.perf_counter()
+_enabled = False
+_path: Optional[str] = None
+_events: List[Dict[str, Any]] = []
+_once: set = set()
+_lock = threading.Lock()
+_real_import = builtins.__import__
+
+
+def _us() -> float:
+    return (time.perf_counter() - _t0) * 1e6
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(path: Optional[str] = None, *, trace_imports: bool = True) -> None:
+    """Start recording (times are relative to when this module was first imported)."""
+    global _enabled, _path
+    _enabled = True
+    _path = path or _path
+    if trace_imports and builtins.__import__ is _real_import:
+        builtins.__import__ = _traced_import
+
+
+def enable_from_env() -> bool:
+    path = os.environ.get(ENV_VAR)
+    if path:
+        enable(path)
+    return _enabled
+
+
+def _add(event: Dict[str, Any]) -> None:
+    event.setdefault("pid", os.getpid())
+    event.setdefault("tid", threading.get_ident())
+    with _lock:
+        _events.append(event)
+
+
+@contextmanager
+def span(name: str, cat: str = "app", **args: Any) -> Iterator[None]:
+    if not _enabled:
+        yield
+        return
+    start = _us()
+    try:
+        yield
+    finally:
+        _add({"name": name, "cat": cat, "ph": "X", "ts": start, "dur": _us() - start, "args": args})
+
+
+def mark(name: str, cat: str = "app", **args: Any) -> None:
+    if _enabled:
+        _add({"name": name, "cat": cat, "ph": "i", "s": "p", "ts": _us(), "args": args})
+
+
+def mark_once(name: str, cat: str = "app", **args: Any) -> None:
+    """mark() only the first time `name` is seen (e.g. first data fetch of a page)."""
+    if not _enabled:
+        return
+    with _lock:
+        if name in _once:
+            return
+        _once.add(name)
+    mark(name, cat, **args)
+
+
+def _traced_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _real_import(name, globals, locals, fromlist, level)
+    start = _us()
+    try:
+        return _real_import(name, globals, locals, fromlist, level)
+    finally:
+        dur = _us() - start
+        if dur >= MIN_IMPORT_US:
+            _add({"name": name, "cat": "import", "ph": "X", "ts": start, "dur": dur})
+
+
+def events() -> List[Dict[str, Any]]:
+    with _lock:
+        return list(_events)
+
+
+def elapsed_ms(name: Optional[str] = None) -> Optional[float]:
+    """ms from trace start to the first mark called `name` (None: to now)."""
+    if name is None:
+        return _us() / 1000.0
+    for e in events():
+        if e["name"] == name and e["ph"] == "i":
+            return e["ts"] / 1000.0
+    return None
+
+
+def summary(top: int = 15) -> Dict[str, Any]:
+    evs = events()
+    # only outermost imports: nested ones are already inside their parent's duration
+    imports = sorted((e for e in evs if e["cat"] == "import"), key=lambda e: e["ts"])
+    outer: List[Dict[str, Any]] = []
+    for e in imports:
+        if outer and e["ts"] < outer[-1]["ts"] + outer[-1]["dur"] and e["tid"] == outer[-1]["tid"]:
+            continue
+        outer.append(e)
+    spans = [e for e in evs if e["ph"] == "X" and e["cat"] != "import"]
+    return {
+        "import_ms": sum(e["dur"] for e in outer) / 1000.0,
+        "slowest_imports": [(e["name"], round(e["dur"] / 1000.0, 1))
+                            for e in sorted(outer, key=lambda e: -e["dur"])[:top]],
+        "spans": [(e["name"], round(e["dur"] / 1000.0, 1)) for e in sorted(spans, key=lambda e: e["ts"])],
+        "marks": [(e["name"], round(e["ts"] / 1000.0, 1)) for e in evs if e["ph"] == "i"],
+    }
+
+
+def write(path: Optional[str] = None) -> Optional[str]:
+    path = path or _path
+    if not path:
+        return None
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events(), "displayTimeUnit": "ms", "otherData": summary()}, f)
+    return path
@@ -12,6 +12,15 @@ try:
 except Exception:
     SHARED_PALETTE = None
 
+try:
+    from pages_logic import startup_trace  # type: ignore
+except Exception:
+    startup_trace = None
+try:
+    from pages_logic.async_accounting import AsyncAccounting, for_service as async_facade  # type: ignore
+except Exception:
+    AsyncAccounting = None
+
 PALETTE = SHARED_PALETTE or {
     "bg":       "#0f1218",
     "surface":  "#151a22",
@@ -25,7 +34,7 @@ PALETTE = SHARED_PALETTE or {
     "danger":   "#ef4444",
 }
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import (
     QApplication,
     QWidget,
@@ -41,12 +50,18 @@ from PyQt6.QtWidgets import (
     QDateEdit,
 )
 
+from pages_qt.row_pool import RowPool
 
-def _label(text: str, *, color: str | None = None, bold: bool = False, size: int = 13) -> QLabel:
-    lbl = QLabel(text)
+
+def _label_style(color: str | None = None, bold: bool = False, size: int = 13) -> str:
     weight = 600 if bold else 400
     c = color or PALETTE["text"]
-    lbl.setStyleSheet(f"color:{c}; font-family:'Segoe UI'; font-size:{size}px; font-weight:{weight};")
+    return f"color:{c}; font-family:'Segoe UI'; font-size:{size}px; font-weight:{weight};"
+
+
+def _label(text: str, *, color: str | None = None, bold: bool = False, size: int = 13) -> QLabel:
+    lbl = QLabel(text)
+    lbl.setStyleSheet(_label_style(color, bold, size))
     return lbl
 
 
@@ -109,20 +124,30 @@ class InvoiceRow(QFrame):
         grid = QGridLayout(self)
         grid.setContentsMargins(12, 6, 12, 6)
         grid.setHorizontalSpacing(8)
-        cols = ("no","date","typ","who","method","total","paid","status")
-        colors = [PALETTE["text"], PALETTE["muted"], PALETTE["muted"], PALETTE["text"],
-                  PALETTE["muted"], PALETTE["text"], PALETTE["text"], PALETTE["ok"]]
+        colors = (PALETTE["text"], PALETTE["muted"], PALETTE["muted"], PALETTE["text"],
+                  PALETTE["muted"], PALETTE["text"], PALETTE["text"], PALETTE["ok"])
+        weights = (10,16,10,26,12,12,12,10)
+        self.cells: List[QLabel] = []
+        for i, (col, w) in enumerate(zip(colors, weights)):
+            lbl = _label("", color=col)
+            grid.addWidget(lbl, 0, i)
+            grid.setColumnStretch(i, w)
+            self.cells.append(lbl)
+        self._status_color = PALETTE["ok"]
+        self.bind(inv)
+
+    def bind(self, inv: Dict[str, Any]):
         status = (inv.get("status") or "open")
-        if status == "partial": colors[-1] = PALETTE["warn"]
-        if status == "open": colors[-1] = PALETTE["danger"]
         vals = (
             inv.get("no","—"), inv.get("date","—"), inv.get("typ","—"), inv.get("who","—"),
             inv.get("method","—"), f"{float(inv.get('total',0)):.0f}", f"{float(inv.get('paid',0)):.0f}", status
         )
-        weights = (10,16,10,26,12,12,12,10)
-        for i, (k, col, w) in enumerate(zip(vals, colors, weights)):
-            grid.addWidget(_label(str(k), color=col), 0, i)
-            grid.setColumnStretch(i, w)
+        for lbl, k in zip(self.cells, vals):
+            lbl.setText(str(k))
+        color = {"partial": PALETTE["warn"], "open": PALETTE["danger"]}.get(status, PALETTE["ok"])
+        if color != self._status_color:
+            self._status_color = color
+            self.cells[-1].setStyleSheet(_label_style(color))
 
 
 def week_range(anchor: dt.date) -> Tuple[dt.date, dt.date]:
@@ -141,10 +166,18 @@ def month_range(anchor: dt.date) -> Tuple[dt.date, dt.date]:
 
 
 class AccountingPage(QWidget):
+    # async results arrive on the facade's loop thread; relayed to the GUI thread
+    invoicesReady = pyqtSignal(int, list)
+    zReady = pyqtSignal(int, object)
+
     def __init__(self, services: Optional[object] = None, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.services = services
         self._period = "Daily"
+        self._inv_seq = 0
+        self._z_seq = 0
+        self.invoicesReady.connect(self._on_invoices_ready)
+        self.zReady.connect(self._on_z_ready)
         self.setObjectName("AccountingPage")
         self.setStyleSheet(
             f"""
@@ -223,6 +256,9 @@ class AccountingPage(QWidget):
         self.inv_wrap = QWidget(); self.inv_vbox = QVBoxLayout(self.inv_wrap)
         self.inv_vbox.setContentsMargins(8, 6, 8, 8); self.inv_vbox.setSpacing(6)
         self.inv_scroll.setWidget(self.inv_wrap)
+        self.lbl_no_inv = _label("No invoices", color=PALETTE["muted"]); self.lbl_no_inv.hide()
+        self.inv_rows = RowPool(InvoiceRow)  # rebinds rows on refresh instead of re-creating them
+        self.inv_vbox.addWidget(self.lbl_no_inv); self.inv_vbox.addWidget(self.inv_rows)
         list_card.layout().addWidget(self.inv_scroll)  # type: ignore
 
         root.addWidget(left, 0, 0)
@@ -277,6 +313,12 @@ class AccountingPage(QWidget):
         self._refresh_invoices()
         self._refresh_z()
 
+    def _aio(self):
+        """Shared asyncio facade of services.accounting (None -> synchronous / demo path)."""
+        if AsyncAccounting is None or not (self.services and hasattr(self.services, "accounting")):
+            return None
+        return async_facade(self.services.accounting)
+
     # ----- invoices -----
     def _fetch_invoices(self, q: str, status: Optional[str], method: Optional[str]) -> List[Dict[str, Any]]:
         if self.services and hasattr(self.services, "accounting"):
@@ -284,6 +326,9 @@ class AccountingPage(QWidget):
                 return self.services.accounting.search_invoices(q, status or "Any", method or "Any", limit=120) or []
             except Exception:
                 pass
+        return self._demo_invoices(q, status, method)
+
+    def _demo_invoices(self, q: str, status: Optional[str], method: Optional[str]) -> List[Dict[str, Any]]:
         rng = random.Random(hash(q + (status or "") + (method or "")) & 0xffffffff)
         names = ["Walk-in","Jane Doe","Samir B.","A. Karim","John Lee"]
         meth  = ["Cash","Card","Transfer"]
@@ -316,17 +361,32 @@ class AccountingPage(QWidget):
         q = (self.ent_q.text() or "").strip()
         status = self.opt_status.currentText().strip()
         method = self.opt_method.currentText().strip()
-        data = self._fetch_invoices(q, None if status=="Any" else status, None if method=="Any" else method)
-        # render
-        while self.inv_vbox.count():
-            item = self.inv_vbox.takeAt(0)
-            w = item.widget()
-            if w: w.setParent(None)
-        if not data:
-            self.inv_vbox.addWidget(_label("No invoices", color=PALETTE["muted"]))
-        else:
-            for inv in data[:24]:
-                self.inv_vbox.addWidget(InvoiceRow(inv))
+        status = None if status=="Any" else status
+        method = None if method=="Any" else method
+        self._inv_seq += 1
+        seq = self._inv_seq
+        aio = self._aio()
+        if aio is None:
+            self._render_invoices(self._fetch_invoices(q, status, method))
+            return
+        # off the GUI thread; a newer keystroke supersedes (cancels) this one
+        aio.submit(aio.search_invoices(q, status or "Any", method or "Any", limit=120),
+                   on_result=lambda data: self.invoicesReady.emit(seq, data or []),
+                   on_error=lambda _e: self.invoicesReady.emit(seq, self._demo_invoices(q, status, method)))
+
+    def _on_invoices_ready(self, seq: int, data: list):  # slot
+        if seq == self._inv_seq:
+            self._render_invoices(data)
+
+    def _render_invoices(self, data: List[Dict[str, Any]]):
+        if startup_trace is not None:
+            startup_trace.mark_once("first-data: Accounting", "data", rows=len(data))
+        self.inv_wrap.setUpdatesEnabled(False)
+        try:
+            self.lbl_no_inv.setVisible(not data)
+            self.inv_rows.set_rows(data[:24])
+        finally:
+            self.inv_wrap.setUpdatesEnabled(True)
 
     # ----- z report -----
     def _on_period_change(self, val: str):
@@ -360,6 +420,9 @@ class AccountingPage(QWidget):
                     if data: return data
             except Exception:
                 pass
+        return self._demo_z(start, end)
+
+    def _demo_z(self, start: dt.date, end: dt.date) -> Dict[str, Any]:
         rng = random.Random(hash((start.toordinal(), end.toordinal())) & 0xffffffff)
         days = (end - start).days + 1
         pos_gross = sum(rng.randint(8000, 30000) for _ in range(days))
@@ -377,11 +440,49 @@ class AccountingPage(QWidget):
 
     def _refresh_z(self):
         start, end = self._parse_range()
-        data = self._fetch_z_range(start, end)
-        self.k_pos.val.setText(f"{data.get('pos_gross',0):,} DA")
-        self.k_sub.val.setText(f"{data.get('sub_gross',0):,} DA")
-        self.k_ref.val.setText(f"{data.get('refunds',0):,} DA")
-        self.k_net.val.setText(f"{data.get('net',0):,} DA")
+        self._z_seq += 1
+        seq = self._z_seq
+        aio = self._aio()
+        if aio is None or not hasattr(self.services.accounting, "z_report_range"):
+            self._render_z(start, end, self._fetch_z_range(start, end))
+            return
+        aio.submit(aio.z_report_range(start, end),
+                   on_result=lambda data: self.zReady.emit(seq, (start, end, data or self._demo_z(start, end))),
+                   on_error=lambda _e: self.zReady.emit(seq, (start, end, self._demo_z(start, end))))
+
+    # ----- router page cache -----
+    def snapshot_state(self) -> Dict[str, Any]:
+        start, end = self._parse_range()
+        return {"q": self.ent_q.text(), "status": self.opt_status.currentText(),
+                "method": self.opt_method.currentText(), "from": start, "to": end}
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        widgets = (self.ent_q, self.opt_status, self.opt_method, self.dt_from, self.dt_to)
+        for w in widgets:
+            w.blockSignals(True)
+        try:
+            self.ent_q.setText(state.get("q", ""))
+            for combo, key in ((self.opt_status, "status"), (self.opt_method, "method")):
+                i = combo.findText(state.get(key, "Any"))
+                if i >= 0:
+                    combo.setCurrentIndex(i)
+            if state.get("from") and state.get("to"):
+                self.dt_from.setDate(state["from"]); self.dt_to.setDate(state["to"])
+        finally:
+            for w in widgets:
+                w.blockSignals(False)
+        self._refresh_invoices()
+        self._refresh_z()
+
+    def _on_z_ready(self, seq: int, payload: object):  # slot
+        if seq == self._z_seq:
+            self._render_z(*payload)  # type: ignore[misc]
+
+    def _render_z(self, start: dt.date, end: dt.date, data: Dict[str, Any]):
+        self.k_pos.val.setText(f"{data.get('pos_gross',0):,.0f} DA")
+        self.k_sub.val.setText(f"{data.get('sub_gross',0):,.0f} DA")
+        self.k_ref.val.setText(f"{data.get('refunds',0):,.0f} DA")
+        self.k_net.val.setText(f"{data.get('net',0):,.0f} DA")
         self.k_cnt.val.setText(str(data.get('count',0)))
         self.p_cash.setText(f"Cash {int(data.get('cash',0))}", "muted")
         self.p_card.setText(f"Card {int(data.get('card',0))}", "muted")
@@ -39,6 +39,8 @@ from PyQt6.QtWidgets import (
 )
 from qfluentwidgets import setTheme, Theme, LineEdit, PrimaryPushButton
 
+from pages_qt.page_fetcher import PageFetcher
+
 
 def _label(text: str, *, color: str | None = None, size: int = 13, bold: bool = False) -> QLabel:
     lbl = QLabel(text)
@@ -129,6 +131,9 @@ class AttendancePage(QWidget):
         self.on_open_member = on_open_member or (lambda payload: print("Open member", payload))
         self._rows: List[CheckinRow] = []
         self._stats = {"total": 0, "allowed": 0, "denied": 0}
+        self._manual = False  # manual-attendance form is showing in place of the page
+        self._fetcher = PageFetcher(self)
+        self._scans = 0
 
         self.setObjectName("AttendancePage")
         self.setStyleSheet(
@@ -218,12 +223,23 @@ class AttendancePage(QWidget):
         uid = (self.ent_uid.text() or "").strip()
         if not uid:
             self.toast.show("Empty UID.", "warn"); return
-        rec = None
+        # scan lane: ahead of every page refresh and report; each scan is its own write, so
+        # it gets a slot of its own (never superseded), no coalescing and no interrupt
+        self._scans += 1
+        self._fetcher.fetch(("scan", self._scans), self._scan_uid, uid, lane="scan", key=None,
+                            interruptible=False, on_result=lambda rec: self._on_scanned(uid, rec))
+        self.ent_uid.setText(""); self.ent_uid.setFocus()
+
+    def _scan_uid(self, uid: str) -> Optional[Dict[str, Any]]:
+        # pool thread
         if self.services and hasattr(self.services, "scan_uid"):
             try:
-                rec = self.services.scan_uid(uid) or None
+                return self.services.scan_uid(uid) or None
             except Exception:
-                rec = None
+                return None
+        return None
+
+    def _on_scanned(self, uid: str, rec: Optional[Dict[str, Any]]):
         if not rec:
             now = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             allowed = random.random() > 0.15
@@ -236,16 +252,12 @@ class AttendancePage(QWidget):
             self._stats["denied"] += 1; self.toast.show(f"Denied — {rec.get('name','')}", "danger")
         self._update_stats_labels()
         self._add_history_row(rec, prepend=True)
-        self.ent_uid.setText(""); self.ent_uid.setFocus()
 
     def _load_history(self):
-        # clear
-        while self.list_vbox.count():
-            item = self.list_vbox.takeAt(0)
-            w = item.widget()
-            if w: w.setParent(None)
-        self._rows.clear(); self._stats = {"total": 0, "allowed": 0, "denied": 0}
+        self._fetcher.fetch("history", self._fetch_history, on_result=self._render_history)
 
+    def _fetch_history(self) -> List[Dict[str, Any]]:
+        # pool thread
         data = None
         if self.services and hasattr(self.services, "recent_checkins"):
             try:
@@ -265,6 +277,15 @@ class AttendancePage(QWidget):
                     "status": "allowed" if allowed else "denied",
                     "member_id": random.choice([101,202,303,None]),
                 })
+        return data
+
+    def _render_history(self, data: List[Dict[str, Any]]):
+        # clear
+        while self.list_vbox.count():
+            item = self.list_vbox.takeAt(0)
+            w = item.widget()
+            if w: w.setParent(None)
+        self._rows.clear(); self._stats = {"total": 0, "allowed": 0, "denied": 0}
         for rec in data:
             self._add_history_row(rec, prepend=False)
             self._stats["total"] += 1
@@ -273,6 +294,7 @@ class AttendancePage(QWidget):
             else:
                 self._stats["denied"] += 1
         self._update_stats_labels()
+        self._filter_history()
 
     def _filter_history(self):
         q = (self.ent_uid.text() or "").strip().lower()
@@ -287,12 +309,22 @@ class AttendancePage(QWidget):
                 match = (q in uid_txt) or (q in name_txt)
             row.setVisible(bool(match))
 
+    # ----- router page cache -----
+    def snapshot_state(self) -> Optional[Dict[str, Any]]:
+        if self._manual or self._fetcher.busy():
+            return None  # a check-in still on its way: keep the page that will show it
+        return {"q": self.ent_uid.text()}
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        self.ent_uid.setText(state.get("q", ""))  # textChanged re-applies the filter
+
     def _open_manual_attendance(self):
         try:
             from pages_qt.mark_attendance import MarkAttendancePage  # type: ignore
         except Exception:
             return
         # Swap to manual attendance full page using existing layout
+        self._manual = True
         lay = self.layout()
         while lay.count():
             it = lay.takeAt(0); w = it.widget();
@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 from typing import List, Optional, Any
-from datetime import date
+from datetime import date, timedelta
 
 try:
     from router import PALETTE as SHARED_PALETTE  # type: ignore
@@ -348,6 +348,9 @@ class DashboardPage(QWidget):
                 v = self.services.daily_revenue_30()
                 if v:
                     return list(v)
+            v = self._z_series("Daily", date.today() - timedelta(days=29))
+            if v:
+                return v
         except Exception:
             pass
         base = 15
@@ -359,10 +362,22 @@ class DashboardPage(QWidget):
                 v = self.services.monthly_breakdown_12()
                 if v:
                     return list(v)
+            today = date.today()
+            # first day of the month 11 months back -> 12 monthly bars ending with this month
+            v = self._z_series("Monthly", date(today.year - (today.month < 12), today.month % 12 + 1, 1))
+            if v:
+                return v
         except Exception:
             pass
         return [20 + ((i * 11) % 40) for i in range(12)]
 
+    def _z_series(self, period: str, start: date) -> List[float]:
+        """Net revenue per period from start to today, from the accounting Z matrix (one call)."""
+        acc = getattr(self.services, "accounting", None) if self.services else None
+        if acc is None or not hasattr(acc, "z_matrix"):
+            return []
+        return [r["net"] for r in acc.z_matrix(period, start, date.today())]
+
     def _z_totals_text(self) -> str:
         try:
             if self.services and hasattr(self.services, "zreport_totals"):
@@ -5,7 +5,7 @@ from __future__ import annotations
 
 import datetime as dt
 import random
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     from router import PALETTE as SHARED_PALETTE  # type: ignore
@@ -25,7 +25,7 @@ PALETTE = SHARED_PALETTE or {
     "danger":   "#ef4444",
 }
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QApplication,
     QWidget,
@@ -42,15 +42,28 @@ from PyQt6.QtWidgets import (
     QFormLayout,
     QSpinBox,
     QDoubleSpinBox,
+    QFileDialog,
 )
 from qfluentwidgets import setTheme, Theme, LineEdit, ComboBox, PrimaryPushButton, PushButton
 
+from pages_qt.page_fetcher import PageFetcher
+from pages_qt.row_pool import RowPool
 
-def _label(text: str, *, color: str | None = None, size: int = 13, bold: bool = False) -> QLabel:
-    lbl = QLabel(text)
+try:
+    from pages_logic.export_service import ExportJob  # type: ignore
+except Exception:
+    ExportJob = None
+
+
+def _label_style(color: str | None = None, size: int = 13, bold: bool = False) -> str:
     weight = 600 if bold else 400
     c = color or PALETTE["text"]
-    lbl.setStyleSheet(f"color:{c}; font-family:'Segoe UI'; font-size:{size}px; font-weight:{weight};")
+    return f"color:{c}; font-family:'Segoe UI'; font-size:{size}px; font-weight:{weight};"
+
+
+def _label(text: str, *, color: str | None = None, size: int = 13, bold: bool = False) -> QLabel:
+    lbl = QLabel(text)
+    lbl.setStyleSheet(_label_style(color, size, bold))
     return lbl
 
 
@@ -65,35 +78,55 @@ class SectionCard(QFrame):
 
 
 class Pill(QFrame):
+    COLORS = {"ok": ("#1e3325", PALETTE["ok"]), "warn": ("#33240f", PALETTE["warn"]), "danger": ("#3a1418", PALETTE["danger"]), "muted": ("#2b3344", PALETTE["muted"]) }
+
     def __init__(self, text: str, kind: str = "muted", parent: Optional[QWidget] = None):
         super().__init__(parent)
-        colors = {"ok": ("#1e3325", PALETTE["ok"]), "warn": ("#33240f", PALETTE["warn"]), "danger": ("#3a1418", PALETTE["danger"]), "muted": ("#2b3344", PALETTE["muted"]) }
-        bg, fg = colors.get(kind, colors["muted"])  # type: ignore[index]
-        self.setStyleSheet(f"background-color:{bg}; border-radius:999px;")
+        self._kind = None
+        self.lbl = QLabel()
         lay = QHBoxLayout(self); lay.setContentsMargins(10, 4, 10, 4)
-        lay.addWidget(_label(text, color=fg, size=12))
+        lay.addWidget(self.lbl)
+        self.set(text, kind)
+
+    def set(self, text: str, kind: str = "muted"):
+        self.lbl.setText(text)
+        if kind != self._kind:  # restyling is the expensive part of a rebind: skip when unchanged
+            self._kind = kind
+            bg, fg = self.COLORS.get(kind, self.COLORS["muted"])
+            self.setStyleSheet(f"background-color:{bg}; border-radius:999px;")
+            self.lbl.setStyleSheet(_label_style(fg, 12))
 
 
 class ProductRow(QFrame):
     def __init__(self, p: Dict[str, Any], on_edit=None, parent: Optional[QWidget] = None):
         super().__init__(parent)
-        self.p = p; self.on_edit = on_edit
+        self.on_edit = on_edit
         self.setStyleSheet(f"background-color:{PALETTE['card']}; border-radius:10px;")
         grid = QGridLayout(self); grid.setContentsMargins(12, 8, 12, 8); grid.setHorizontalSpacing(8)
         weights = (30,12,10,14,8)
         for i, w in enumerate(weights): grid.setColumnStretch(i, w)
-        name = p.get("name","—"); price = float(p.get("price",0) or 0); stock = int(p.get("stock_qty",0) or 0)
-        low = int(p.get("low_stock_threshold",0) or 0); is_active = bool(p.get("is_active", True))
-        grid.addWidget(_label(name), 0, 0)
-        grid.addWidget(_label(f"{price:.0f} DA", color=PALETTE["muted"]), 0, 1)
-        grid.addWidget(_label(str(stock)), 0, 2)
+        self.lbl_name = _label(""); grid.addWidget(self.lbl_name, 0, 0)
+        self.lbl_price = _label("", color=PALETTE["muted"]); grid.addWidget(self.lbl_price, 0, 1)
+        self.lbl_stock = _label(""); grid.addWidget(self.lbl_stock, 0, 2)
         line = QFrame(); l = QHBoxLayout(line); l.setContentsMargins(0,0,0,0); l.setSpacing(6)
-        kind = "ok" if stock > max(low,0) else ("warn" if stock == low else "danger")
-        l.addWidget(Pill("Stock ≤ %d" % low if kind != "ok" else "Stock OK", kind))
-        l.addWidget(Pill("Active" if is_active else "Inactive", "muted" if is_active else "danger"))
+        self.pill_stock = Pill(""); self.pill_active = Pill("")
+        l.addWidget(self.pill_stock); l.addWidget(self.pill_active)
         grid.addWidget(line, 0, 3)
-        btn = PushButton("Edit"); btn.setProperty("cssClass","secondary"); btn.setMinimumHeight(28); btn.clicked.connect(lambda: on_edit(p) if on_edit else None)
+        # the button edits whatever product the row is bound to now (rows are recycled)
+        btn = PushButton("Edit"); btn.setProperty("cssClass","secondary"); btn.setMinimumHeight(28); btn.clicked.connect(lambda: on_edit(self.p) if on_edit else None)
         grid.addWidget(btn, 0, 4, alignment=Qt.AlignmentFlag.AlignRight)
+        self.bind(p)
+
+    def bind(self, p: Dict[str, Any]):
+        self.p = p
+        name = p.get("name","—"); price = float(p.get("price",0) or 0); stock = int(p.get("stock_qty",0) or 0)
+        low = int(p.get("low_stock_threshold",0) or 0); is_active = bool(p.get("is_active", True))
+        self.lbl_name.setText(name)
+        self.lbl_price.setText(f"{price:.0f} DA")
+        self.lbl_stock.setText(str(stock))
+        kind = "ok" if stock > max(low,0) else ("warn" if stock == low else "danger")
+        self.pill_stock.set("Stock ≤ %d" % low if kind != "ok" else "Stock OK", kind)
+        self.pill_active.set("Active" if is_active else "Inactive", "muted" if is_active else "danger")
 
 
 class MoveRow(QFrame):
@@ -103,11 +136,23 @@ class MoveRow(QFrame):
         grid = QGridLayout(self); grid.setContentsMargins(12,8,12,8); grid.setHorizontalSpacing(8)
         weights = (16,28,14,32)
         for i, w in enumerate(weights): grid.setColumnStretch(i, w)
-        grid.addWidget(_label(m.get("date","—")), 0, 0)
-        grid.addWidget(_label(m.get("product","—")), 0, 1)
+        self.lbl_date = _label(""); grid.addWidget(self.lbl_date, 0, 0)
+        self.lbl_product = _label(""); grid.addWidget(self.lbl_product, 0, 1)
+        self.lbl_qty = _label(""); grid.addWidget(self.lbl_qty, 0, 2)
+        self.lbl_note = _label("", color=PALETTE["muted"]); grid.addWidget(self.lbl_note, 0, 3)
+        self._qty_color = None
+        self.bind(m)
+
+    def bind(self, m: Dict[str, Any]):
+        self.lbl_date.setText(m.get("date","—"))
+        self.lbl_product.setText(m.get("product","—"))
         qty = int(m.get("qty",0) or 0)
-        grid.addWidget(_label(str(qty), color=(PALETTE["ok"] if qty>=0 else PALETTE["danger"])), 0, 2)
-        grid.addWidget(_label(m.get("note",""), color=PALETTE["muted"]), 0, 3)
+        self.lbl_qty.setText(str(qty))
+        color = PALETTE["ok"] if qty>=0 else PALETTE["danger"]
+        if color != self._qty_color:
+            self._qty_color = color
+            self.lbl_qty.setStyleSheet(_label_style(color))
+        self.lbl_note.setText(m.get("note",""))
 
 
 class ProductDialog(QDialog):
@@ -157,11 +202,22 @@ class ProductDialog(QDialog):
 
 
 class InventoryPage(QWidget):
+    # export callbacks arrive on the worker thread; relay them to the GUI thread
+    exportProgress = pyqtSignal(int)
+    exportFinished = pyqtSignal(object)
+
     def __init__(self, services: Optional[object] = None, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.services = services
         self._tab = "Products"
         self._local_products: List[Dict[str, Any]] = []
+        self._export_job = None
+        self._restore_scroll: Optional[int] = None
+        # products / moves load on the shared fetch pool; one "list" slot, so switching tabs
+        # supersedes the other tab's fetch
+        self._fetcher = PageFetcher(self)
+        self.exportProgress.connect(self._on_export_progress)
+        self.exportFinished.connect(self._on_export_finished)
 
         self.setObjectName("InventoryPage")
         self.setStyleSheet(
@@ -231,6 +287,15 @@ class InventoryPage(QWidget):
         self.list_container = QWidget(); self.list_vbox = QVBoxLayout(self.list_container); self.list_vbox.setContentsMargins(0,0,0,0); self.list_vbox.setSpacing(6)
         self.scroll.setWidget(self.list_container)
         cgrid.addWidget(self.scroll, 1, 0)
+        # list content is built once: refreshes rebind rows in place (RowPool), one pool per tab
+        self.alerts_bar = QFrame(); hb = QHBoxLayout(self.alerts_bar); hb.setContentsMargins(12,0,12,0)
+        hb.addWidget(_label("Low Stock:", color=PALETTE["warn"]))
+        self.lbl_alerts = _label("", color=PALETTE["muted"]); hb.addWidget(self.lbl_alerts)
+        self.lbl_empty = _label("", color=PALETTE["muted"])
+        self.product_rows = RowPool(lambda p: ProductRow(p, on_edit=self._edit_product))
+        self.move_rows = RowPool(MoveRow)
+        for w in (self.alerts_bar, self.lbl_empty, self.product_rows, self.move_rows):
+            w.hide(); self.list_vbox.addWidget(w)
 
         # initial
         self._render_products_header(); self._refresh_products()
@@ -329,11 +394,63 @@ class InventoryPage(QWidget):
         dlg.exec()
 
     def _export_products_csv(self):
-        # This is a placeholder; implement using QFileDialog if needed
-        print("Export CSV clicked; implement QFileDialog flow as needed.")
+        # second click while running = cancel
+        if self._export_job is not None and self._export_job.running:
+            self._export_job.cancel()
+            return
+        if ExportJob is None:
+            return
+        moves = self._tab == "Stock Moves"
+        default = f"{'stock_moves' if moves else 'products'}_{dt.date.today():%Y%m%d}.csv"
+        path, chosen = QFileDialog.getSaveFileName(self, "Export", default, "CSV (*.csv);;Compressed CSV (*.csv.gz)")
+        if not path:
+            return
+        if chosen.startswith("Compressed") and not path.lower().endswith(".gz"):
+            path += ".gz"
+        if moves:
+            header = ("date", "product", "qty", "note")
+            rows = lambda: ([m.get(k, "") for k in header] for m in self._iter_moves())
+        else:
+            header = ("id", "name", "category", "price", "stock_qty", "low_stock_threshold", "is_active")
+            q = (self.ent_q.text() or "").strip()
+            v = self.opt_cat.currentText().strip(); cat = None if v == "All" else v
+            local = list(self._local_products)
+            # filters (and the local list) read here; the query itself runs on the export thread
+            rows = lambda: ([p.get(k, "") for k in header] for p in self._fetch_products(q, cat, local)[0])
+        self._export_job = ExportJob(path, header, rows,
+                                     on_progress=self.exportProgress.emit, on_done=self.exportFinished.emit).start()
+        self.btn_export.setText("Cancel export")
+
+    def _iter_moves(self):
+        # runs on the export thread: stream from the service when it can, else the on-screen list
+        if self.services and hasattr(self.services, "iter_stock_moves"):
+            yield from self.services.iter_stock_moves()
+            return
+        try:
+            limit = int((self.ent_limit.text() or "100").strip())
+        except Exception:
+            limit = 100
+        yield from self._fetch_moves(limit)
+
+    def _on_export_progress(self, n: int):
+        if self._export_job is not None and self._export_job.running:
+            self.btn_export.setText(f"Cancel export ({n:,})")
+
+    def _on_export_finished(self, job):
+        self.btn_export.setText("Export CSV")
+        if job.error is not None:
+            self.btn_export.setToolTip(f"Export failed: {job.error}")
+        elif job.cancelled:
+            self.btn_export.setToolTip("Export cancelled")
+        else:
+            self.btn_export.setToolTip(f"Exported {job.rows_written:,} rows to {job.path}")
 
     # ----- product data -----
-    def _fetch_products(self, q: str, category: Optional[str]) -> List[Dict[str, Any]]:
+    def _fetch_products(self, q: str, category: Optional[str],
+                        local: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        # worker thread: `local` is a GUI-thread snapshot of _local_products. Returns the matching
+        # products and the local list they came from (demo-seeded when it was empty), which the
+        # GUI thread adopts in _render_products.
         if self.services and hasattr(self.services, "find_products"):
             try:
                 data = self.services.find_products(q, category) or []
@@ -348,11 +465,11 @@ class InventoryPage(QWidget):
                         "is_active": bool(p.get("is_active", True)),
                         "category": p.get("category",""),
                     })
-                return out
+                return out, local
             except Exception:
                 pass
-        if self._local_products:
-            items = self._local_products.copy()
+        if local:
+            items = list(local)
         else:
             rng = random.Random(1337)
             names = [
@@ -370,20 +487,23 @@ class InventoryPage(QWidget):
                     "low_stock_threshold": random.choice([3,5,8,10]),
                     "is_active": random.random() > 0.05,
                 })
-            self._local_products = items.copy()
+            local = items.copy()
         if category:
             items = [p for p in items if p.get("category") == category]
         ql = (q or "").lower().strip()
         if ql:
             items = [p for p in items if ql in p.get("name", "").lower()]
-        return items
+        return items, local
 
     def _refresh_products(self):
-        # clear list
-        while self.list_vbox.count():
-            it = self.list_vbox.takeAt(0); w = it.widget();
-            if w: w.setParent(None)
-        # low stock alerts via service (optional)
+        q = (self.ent_q.text() or "").strip()
+        v = self.opt_cat.currentText().strip(); cat = None if v == "All" else v
+        self._fetcher.fetch("list", self._load_products, q, cat, list(self._local_products),
+                            on_result=self._render_products)
+
+    def _load_products(self, q: str, cat: Optional[str],
+                       local: List[Dict[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        # pool thread: low stock alerts via service (optional) + the product list
         alerts = []
         if self.services and hasattr(self.services, "low_stock_alerts"):
             try:
@@ -391,22 +511,24 @@ class InventoryPage(QWidget):
                 alerts = [f"{a.get('name','?')} ({int(a.get('stock_qty',0))}/{int(a.get('low_stock_threshold',0))})" for a in data][:3]
             except Exception:
                 alerts = []
-        if alerts:
-            bar = QFrame(); hb = QHBoxLayout(bar); hb.setContentsMargins(12,0,12,0)
-            hb.addWidget(_label("Low Stock:", color=PALETTE["warn"]))
-            hb.addWidget(_label(" · ".join(alerts), color=PALETTE["muted"]))
-            self.list_vbox.addWidget(bar)
-        # header
-        self._render_products_header()
-        # list
-        q = (self.ent_q.text() or "").strip()
-        v = self.opt_cat.currentText().strip(); cat = None if v == "All" else v
-        products = self._fetch_products(q, cat)
-        if not products:
-            self.list_vbox.addWidget(_label("No products found", color=PALETTE["muted"]))
-            return
-        for p in products:
-            self.list_vbox.addWidget(ProductRow(p, on_edit=self._edit_product))
+        return (alerts,) + self._fetch_products(q, cat, local)
+
+    def _render_products(self, res: Tuple[List[str], List[Dict[str, Any]], List[Dict[str, Any]]]):
+        alerts, products, local = res
+        if not self._local_products and local:
+            self._local_products = local  # demo seed from the worker; local edits win over it
+        self.list_container.setUpdatesEnabled(False)
+        try:
+            self.lbl_alerts.setText(" · ".join(alerts))
+            self.alerts_bar.setVisible(bool(alerts))
+            self.lbl_empty.setText("No products found")
+            self.lbl_empty.setVisible(not products)
+            self.move_rows.hide()
+            self.product_rows.set_rows(products)
+            self.product_rows.show()
+        finally:
+            self.list_container.setUpdatesEnabled(True)
+        self._apply_restored_scroll()
 
     # ----- moves data -----
     def _fetch_moves(self, limit: int) -> List[Dict[str, Any]]:
@@ -431,22 +553,64 @@ class InventoryPage(QWidget):
         return out
 
     def _render_moves(self, moves: List[Dict[str, Any]]):
-        while self.list_vbox.count():
-            it = self.list_vbox.takeAt(0); w = it.widget();
-            if w: w.setParent(None)
-        self._render_moves_header()
-        if not moves:
-            self.list_vbox.addWidget(_label("No stock moves", color=PALETTE["muted"]))
-            return
-        for m in moves:
-            self.list_vbox.addWidget(MoveRow(m))
+        self.list_container.setUpdatesEnabled(False)
+        try:
+            self.alerts_bar.hide()
+            self.lbl_empty.setText("No stock moves")
+            self.lbl_empty.setVisible(not moves)
+            self.product_rows.hide()
+            self.move_rows.set_rows(moves)
+            self.move_rows.show()
+        finally:
+            self.list_container.setUpdatesEnabled(True)
+        self._apply_restored_scroll()
 
     def _refresh_moves(self):
         try:
             limit = int((self.ent_limit.text() or "100").strip())
         except Exception:
             limit = 100
-        self._render_moves(self._fetch_moves(limit))
+        self._fetcher.fetch("list", self._fetch_moves, limit, on_result=self._render_moves)
+
+    # ----- router page cache -----
+    def snapshot_state(self) -> Optional[Dict[str, Any]]:
+        if self._export_job is not None and self._export_job.running:
+            return None  # keep the page (and its progress label) alive until the export ends
+        state: Dict[str, Any] = {"tab": self._tab, "local_products": list(self._local_products),
+                                 "scroll": self.scroll.verticalScrollBar().value()}
+        if self._tab == "Products":
+            state.update(q=self.ent_q.text(), category=self.opt_cat.currentText())
+        else:
+            state.update(limit=self.ent_limit.text())
+        return state
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        self._local_products = list(state.get("local_products", []))
+        if state.get("tab") == "Stock Moves":
+            self.btn_moves.setChecked(True)
+            self._tab = "Stock Moves"
+            self._build_filters_moves()
+            self.ent_limit.blockSignals(True)
+            self.ent_limit.setText(state.get("limit", "100"))
+            self.ent_limit.blockSignals(False)
+            self._render_moves_header(); self._refresh_moves()
+        else:
+            for w in (self.ent_q, self.opt_cat):
+                w.blockSignals(True)
+            self.ent_q.setText(state.get("q", ""))
+            i = self.opt_cat.findText(state.get("category", "All"))
+            if i >= 0:
+                self.opt_cat.setCurrentIndex(i)
+            for w in (self.ent_q, self.opt_cat):
+                w.blockSignals(False)
+            self._refresh_products()
+        self._restore_scroll = int(state.get("scroll", 0))  # once the restored list has rendered
+
+    def _apply_restored_scroll(self):
+        if self._restore_scroll is None:
+            return
+        scroll, self._restore_scroll = self._restore_scroll, None
+        QTimer.singleShot(0, lambda: self.scroll.verticalScrollBar().setValue(scroll))
 
 
 if __name__ == "__main__":
@@ -43,12 +43,19 @@ from PyQt6.QtWidgets import (
 )
 from qfluentwidgets import setTheme, Theme, LineEdit, ComboBox, PrimaryPushButton, PushButton
 
+from pages_qt.page_fetcher import PageFetcher
+from pages_qt.row_pool import RowPool
 
-def _label(text: str, *, color: Optional[str] = None, size: int = 13, bold: bool = False) -> QLabel:
-    lbl = QLabel(text)
+
+def _label_style(color: Optional[str] = None, size: int = 13, bold: bool = False) -> str:
     weight = 600 if bold else 400
     c = color or PALETTE["text"]
-    lbl.setStyleSheet(f"color:{c}; font-family:'Segoe UI'; font-size:{size}px; font-weight:{weight};")
+    return f"color:{c}; font-family:'Segoe UI'; font-size:{size}px; font-weight:{weight};"
+
+
+def _label(text: str, *, color: Optional[str] = None, size: int = 13, bold: bool = False) -> QLabel:
+    lbl = QLabel(text)
+    lbl.setStyleSheet(_label_style(color, size, bold))
     return lbl
 
 
@@ -84,36 +91,56 @@ class Avatar(QFrame):
             lab = QLabel(); lab.setPixmap(picture.scaled(36,36))
             l = QVBoxLayout(self); l.setContentsMargins(0,0,0,0); l.addWidget(lab)
 
+    def set_name(self, name: str):
+        if hasattr(self, "lbl"):
+            self.lbl.setText(_initials(name))
+
 
 class MemberRow(QFrame):
     def __init__(self, m: Dict[str, Any], on_mark, parent: Optional[QWidget] = None):
         super().__init__(parent)
-        self.m = m; self.on_mark = on_mark
+        self.on_mark = on_mark
         self.setStyleSheet(f"background-color:{PALETTE['card2']}; border-radius:10px;")
         g = QGridLayout(self); g.setContentsMargins(12,8,12,8); g.setHorizontalSpacing(8)
         cols = (6, 14, 20, 16, 10, 12, 10, 10)
         for i, w in enumerate(cols): g.setColumnStretch(i, w)
-        name = m.get("name","—")
-        uid = m.get("uid","—")
-        phone = m.get("phone","—")
-        status = m.get("status","Active")
-        self.days_per_month = int(m.get("days_per_month") or 0)
-        self.remaining = int(m.get("granted_left") or 0)
-        g.addWidget(Avatar(name), 0, 0)
-        g.addWidget(_label(uid, color=PALETTE["muted"]), 0, 1)
-        g.addWidget(_label(name), 0, 2)
-        g.addWidget(_label(phone, color=PALETTE["muted"]), 0, 3)
-        self.lbl_dpm = _label(str(self.days_per_month or "—"), color=PALETTE["muted"])
+        self.avatar = Avatar(m.get("name","—")); g.addWidget(self.avatar, 0, 0)
+        self.lbl_uid = _label("", color=PALETTE["muted"]); g.addWidget(self.lbl_uid, 0, 1)
+        self.lbl_name = _label(""); g.addWidget(self.lbl_name, 0, 2)
+        self.lbl_phone = _label("", color=PALETTE["muted"]); g.addWidget(self.lbl_phone, 0, 3)
+        self.lbl_dpm = _label("", color=PALETTE["muted"])
         g.addWidget(self.lbl_dpm, 0, 4)
-        self.lbl_left = _label(str(self.remaining), color=PALETTE["text"])
+        self.lbl_left = _label("", color=PALETTE["text"])
         g.addWidget(self.lbl_left, 0, 5)
-        g.addWidget(_label(status, color=PALETTE["ok"] if status.lower()=="active" else PALETTE["warn"]), 0, 6)
+        self.lbl_status = _label(""); g.addWidget(self.lbl_status, 0, 6)
+        self._status_color = None
+        # on_mark gets the row; it reads row.m, which follows the member the row is bound to
         btn = PrimaryPushButton("Mark Attendance"); btn.setMinimumHeight(28)
         btn.clicked.connect(lambda: self.on_mark(self))
         g.addWidget(btn, 0, 7, alignment=Qt.AlignmentFlag.AlignRight)
+        self.bind(m)
+
+    def bind(self, m: Dict[str, Any]):
+        self.m = m
+        name = m.get("name","—")
+        status = m.get("status","Active")
+        self.days_per_month = int(m.get("days_per_month") or 0)
+        self.remaining = int(m.get("granted_left") or 0)
+        self.avatar.set_name(name)
+        self.lbl_uid.setText(m.get("uid","—"))
+        self.lbl_name.setText(name)
+        self.lbl_phone.setText(m.get("phone","—"))
+        self.lbl_dpm.setText(str(self.days_per_month or "—"))
+        self.lbl_left.setText(str(self.remaining))
+        self.lbl_status.setText(status)
+        color = PALETTE["ok"] if status.lower()=="active" else PALETTE["warn"]
+        if color != self._status_color:
+            self._status_color = color
+            self.lbl_status.setStyleSheet(_label_style(color))
 
     def set_remaining(self, value: int):
         self.remaining = max(0, int(value))
+        self.m["granted_left"] = self.remaining  # survives the row being rebound on the next filter
         self.lbl_left.setText(str(self.remaining))
 
 
@@ -124,6 +151,7 @@ class MarkAttendancePage(QWidget):
         self.on_back = on_back or (lambda: None)
         self._all: List[Dict[str, Any]] = []
         self._timer: Optional[QTimer] = None
+        self._fetcher = PageFetcher(self)
 
         self.setObjectName("MarkAttendancePage")
         self.setStyleSheet(
@@ -176,6 +204,10 @@ class MarkAttendancePage(QWidget):
         self.wrap = QWidget(); self.vbox = QVBoxLayout(self.wrap); self.vbox.setContentsMargins(8,6,8,8); self.vbox.setSpacing(6)
         self.scroll.setWidget(self.wrap)
         root.addWidget(self.scroll, 3, 0)
+        # every filter keystroke re-lists: rows are rebound in place, not rebuilt
+        self.lbl_empty = _label("No members found", color=PALETTE["muted"]); self.lbl_empty.hide()
+        self.rows = RowPool(lambda m: MemberRow(m, on_mark=self._mark))
+        self.vbox.addWidget(self.lbl_empty); self.vbox.addWidget(self.rows); self.vbox.addStretch(1)
 
         self._load()
 
@@ -188,10 +220,14 @@ class MarkAttendancePage(QWidget):
         self._timer.start(250)
 
     def _load(self):
-        self._all = self._fetch_members()
+        self._fetcher.fetch("members", self._fetch_members, on_result=self._on_members)
+
+    def _on_members(self, rows: List[Dict[str, Any]]):
+        self._all = rows
         self._refresh()
 
     def _fetch_members(self) -> List[Dict[str, Any]]:
+        # pool thread (one remaining-accesses query per member)
         if self.services and hasattr(self.services, "members") and hasattr(self.services.members, "list"):
             try:
                 rows = list(self.services.members.list()) or []
@@ -244,16 +280,13 @@ class MarkAttendancePage(QWidget):
         return out
 
     def _refresh(self):
-        while self.vbox.count():
-            it = self.vbox.takeAt(0); w = it.widget();
-            if w: w.setParent(None)
         items = self._apply_filters(self._all)
-        if not items:
-            self.vbox.addWidget(_label("No members found", color=PALETTE["muted"]))
-        else:
-            for m in items:
-                self.vbox.addWidget(MemberRow(m, on_mark=self._mark))
-        self.vbox.addStretch(1)
+        self.wrap.setUpdatesEnabled(False)
+        try:
+            self.lbl_empty.setVisible(not items)
+            self.rows.set_rows(items)
+        finally:
+            self.wrap.setUpdatesEnabled(True)
 
     def _mark(self, row: MemberRow):
         # Try to mark attendance via services, fallback to print and update UI
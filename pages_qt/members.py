@@ -6,13 +6,16 @@ from __future__ import annotations
 
 import datetime as dt
 import random
-import threading
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 
 try:
     from router import PALETTE as SHARED_PALETTE  # type: ignore
 except Exception:
     SHARED_PALETTE = None
+try:
+    from pages_logic import startup_trace  # type: ignore
+except Exception:
+    startup_trace = None
 
 PALETTE = SHARED_PALETTE or {
     "bg":       "#0f1218",
@@ -27,7 +30,8 @@ PALETTE = SHARED_PALETTE or {
     "danger":   "#ef4444",
 }
 
-from PyQt6.QtCore import Qt, QTimer, QSize, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, QSize, QRect, QEvent, QObject, QModelIndex, QAbstractTableModel, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter
 from PyQt6.QtWidgets import (
     QApplication,
     QWidget,
@@ -39,11 +43,18 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QLineEdit,
     QComboBox,
-    QScrollArea,
     QSizePolicy,
+    QTableView,
+    QHeaderView,
+    QAbstractItemView,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
 )
 from qfluentwidgets import setTheme, Theme, LineEdit, ComboBox, PrimaryPushButton, PushButton
 
+from pages_qt.page_fetcher import PageFetcher
+
 
 def _label(text: str, *, color: str | None = None, bold: bool = False, size: int = 13) -> QLabel:
     lbl = QLabel(text)
@@ -70,96 +81,257 @@ class SectionCard(QFrame):
         lay.addWidget(_label(title, bold=True, size=15), alignment=Qt.AlignmentFlag.AlignLeft)
 
 
-class Pill(QFrame):
-    def __init__(self, text: str, kind: str = "muted", parent: Optional[Widget] = None):  # type: ignore[name-defined]
-        super().__init__(parent)
-        colors: Dict[str, tuple[str, str]] = {
-            "active": ("#1e3325", PALETTE["ok"]),
-            "suspended": ("#33240f", PALETTE["warn"]),
-            "expired": ("#3a1418", PALETTE["danger"]),
-            "blacklisted": ("#3a1418", PALETTE["danger"]),
-            "muted": ("#2b3344", PALETTE["muted"]),
-        }
-        bg, fg = colors.get(kind, colors["muted"])  # type: ignore[index]
-        self.setStyleSheet(f"background-color: {bg}; border-radius: 999px;")
-        lay = QHBoxLayout(self)
-        lay.setContentsMargins(10, 4, 10, 4)
-        lay.addWidget(_label(text, color=fg, size=12))
-
-
-class MemberRow(QFrame):
-    def __init__(self, member: Dict[str, Any], on_open: Callable[[Dict[str, Any]], None], parent: Optional[QWidget] = None):
-        super().__init__(parent)
-        self.member = member
-        self.on_open = on_open
-        self.setObjectName("MemberRow")
-        self.setStyleSheet(f"QFrame#MemberRow {{ background-color: {PALETTE['card']}; border-radius: 10px; }}")
-        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-
-        grid = QGridLayout(self)
-        grid.setContentsMargins(12, 8, 12, 8)
-        grid.setHorizontalSpacing(8)
-        weights = (10, 28, 18, 12, 12, 12, 8)
-        for i, w in enumerate(weights):
-            grid.setColumnStretch(i, w)
+# -------- member table (model/view) --------
+COLUMNS = ("ID", "Name", "Phone", "Join", "Debt", "Status", "")
+WEIGHTS = (10, 28, 18, 12, 12, 12, 8)
+ROW_HEIGHT = 46
+COL_STATUS, COL_OPEN = 5, 6
 
-        mid = str(member.get("id", "—"))
-        name = f"{member.get('first_name','')} {member.get('last_name','')}".strip() or "—"
-        phone = member.get("phone", "—")
+# status -> (pill background, pill text)
+STATUS_COLORS: Dict[str, Tuple[str, str]] = {
+    "active": ("#1e3325", PALETTE["ok"]),
+    "suspended": ("#33240f", PALETTE["warn"]),
+    "expired": ("#3a1418", PALETTE["danger"]),
+    "blacklisted": ("#3a1418", PALETTE["danger"]),
+    "muted": ("#2b3344", PALETTE["muted"]),
+}
+
+
+def _cell_text(member: Dict[str, Any], col: int) -> str:
+    if col == 0:
+        return str(member.get("id", "—"))
+    if col == 1:
+        return f"{member.get('first_name','')} {member.get('last_name','')}".strip() or "—"
+    if col == 2:
+        return str(member.get("phone") or "—")
+    if col == 3:
         join = member.get("join_date", "—")
-        try:
-            if isinstance(join, (dt.date, dt.datetime)):
-                join = join.strftime("%Y-%m-%d")
-        except Exception:
-            pass
+        if isinstance(join, (dt.date, dt.datetime)):
+            join = join.strftime("%Y-%m-%d")
+        return str(join or "—")
+    if col == 4:
         debt_val = float(member.get("debt", 0) or 0)
-        debt = f"{int(debt_val)} DA" if debt_val > 0 else "—"
-        status_raw = (member.get("status") or "active").lower()
-        status_kind = (
-            "active" if status_raw == "active" else
-            "suspended" if status_raw == "suspended" else
-            "expired" if status_raw == "expired" else
-            "blacklisted" if status_raw == "blacklisted" else
-            "muted"
-        )
+        return f"{int(debt_val)} DA" if debt_val > 0 else "—"
+    if col == COL_STATUS:
+        return (member.get("status") or "active").capitalize()
+    return ""
 
-        grid.addWidget(_label(mid), 0, 0)
-        grid.addWidget(_label(name), 0, 1)
-        grid.addWidget(_label(phone, color=PALETTE["muted"]), 0, 2)
-        grid.addWidget(_label(str(join), color=PALETTE["muted"]), 0, 3)
-        grid.addWidget(_label(debt, color=PALETTE["muted"]), 0, 4)
 
-        pill = Pill(status_raw.capitalize(), kind=status_kind)
-        grid.addWidget(pill, 0, 5)
+class MemberTableModel(QAbstractTableModel):
+    """
+    Rows are plain member dicts; cells are formatted on demand in data(), so the model
+    costs one list regardless of how many rows the view scrolls through.
 
-        btn = PrimaryPushButton("Open")
-        btn.setFixedHeight(30)
-        btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        btn.clicked.connect(lambda: self.on_open(self.member))  # type: ignore[arg-type]
-        grid.addWidget(btn, 0, 6, alignment=Qt.AlignmentFlag.AlignRight)
+    Infinite scroll: set_rows() exposes the first `chunk` rows and fetchMore() reveals the
+    next chunk. With has_more=True (a paged service) the last fetchMore() asks need_more()
+    for the next page, which arrives through append_rows().
+    """
+    MemberRole = Qt.ItemDataRole.UserRole
 
-    def mousePressEvent(self, event):  # noqa: N802
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.on_open(self.member)
-        return super().mousePressEvent(event)
+    def __init__(self, chunk: int = 50, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.chunk = max(1, int(chunk))
+        self._rows: List[Dict[str, Any]] = []
+        self._shown = 0
+        self.has_more = False
+        self.need_more: Optional[Callable[[], None]] = None
+        self._asked = False
+
+    # ---------- Qt model API ----------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else self._shown
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._shown:
+            return None
+        m = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return _cell_text(m, index.column())
+        if role == self.MemberRole:
+            return m
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):  # noqa: N802
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:  # noqa: N802
+        if parent.isValid():
+            return False
+        return self._shown < len(self._rows) or (self.has_more and not self._asked)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:  # noqa: N802
+        if parent.isValid():
+            return
+        if self._shown < len(self._rows):
+            n = min(self.chunk, len(self._rows) - self._shown)
+            self.beginInsertRows(QModelIndex(), self._shown, self._shown + n - 1)
+            self._shown += n
+            self.endInsertRows()
+        elif self.has_more and not self._asked and self.need_more is not None:
+            self._asked = True
+            self.need_more()
+
+    # ---------- feeding ----------
+    def set_rows(self, rows: List[Dict[str, Any]], *, show: Optional[int] = None, has_more: bool = False) -> None:
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._shown = min(len(self._rows), show if show and show > 0 else self.chunk)
+        self.has_more = has_more
+        self._asked = False
+        self.endResetModel()
+
+    def append_rows(self, rows: List[Dict[str, Any]], *, has_more: bool = False) -> None:
+        self._rows.extend(rows)
+        self.has_more = has_more
+        self._asked = False
+        if rows:
+            self.fetchMore()
+
+    def member(self, row: int) -> Optional[Dict[str, Any]]:
+        return self._rows[row] if 0 <= row < self._shown else None
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return self._rows
+
+    def shown(self) -> int:
+        return self._shown
+
+
+class MemberDelegate(QStyledItemDelegate):
+    """Paints the old MemberRow look (card row, status pill, Open button) without widgets."""
+    openRequested = pyqtSignal(int)  # source row
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._font = QFont("Segoe UI")
+        self._font.setPixelSize(13)
+        self._small = QFont("Segoe UI")
+        self._small.setPixelSize(12)
+        self._small_metrics = QFontMetrics(self._small)
+        self._pressed: Optional[int] = None
+
+    @staticmethod
+    def _card(rect: QRect) -> QRect:
+        return rect.adjusted(0, 3, 0, -3)
+
+    @staticmethod
+    def button_rect(rect: QRect) -> QRect:
+        w, h = 64, 30
+        return QRect(rect.right() - 12 - w, rect.center().y() - h // 2 + 1, w, h)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        col = index.column()
+        card = self._card(option.rect)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.fillRect(card, QColor("#222b3d" if hovered else PALETTE["card"]))
+        text = index.data(Qt.ItemDataRole.DisplayRole) or ""
+
+        if col == COL_STATUS:
+            kind = str(text).lower()
+            bg, fg = STATUS_COLORS.get(kind, STATUS_COLORS["muted"])
+            w = self._small_metrics.horizontalAdvance(text) + 20
+            pill = QRect(card.left() + 4, card.center().y() - 11, w, 22)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(bg))
+            painter.drawRoundedRect(pill, 11, 11)
+            painter.setFont(self._small)
+            painter.setPen(QColor(fg))
+            painter.drawText(pill, Qt.AlignmentFlag.AlignCenter, text)
+        elif col == COL_OPEN:
+            btn = self.button_rect(option.rect)
+            pressed = self._pressed == index.row()
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("#3f70cc" if pressed or hovered else PALETTE["accent"]))
+            painter.drawRoundedRect(btn, 6, 6)
+            painter.setFont(self._font)
+            painter.setPen(QColor(PALETTE["text"]))
+            painter.drawText(btn, Qt.AlignmentFlag.AlignCenter, "Open")
+        else:
+            painter.setFont(self._font)
+            painter.setPen(QColor(PALETTE["text"] if col in (0, 1) else PALETTE["muted"]))
+            inner = card.adjusted(12 if col == 0 else 4, 0, -4, 0)
+            elided = QFontMetrics(self._font).elidedText(text, Qt.TextElideMode.ElideRight, inner.width())
+            painter.drawText(inner, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, elided)
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:  # noqa: N802
+        return QSize(0, ROW_HEIGHT)
+
+    def editorEvent(self, event, model, option, index) -> bool:  # noqa: N802
+        if index.column() != COL_OPEN or event.type() not in (QEvent.Type.MouseButtonPress,
+                                                             QEvent.Type.MouseButtonRelease):
+            return False
+        inside = self.button_rect(option.rect).contains(event.position().toPoint())
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self._pressed = index.row() if inside else None
+            return inside
+        was, self._pressed = self._pressed, None
+        if inside and was == index.row():
+            self.openRequested.emit(index.row())
+            return True
+        return False
+
+
+class MemberTable(QTableView):
+    """Header-less, grid-less table with fixed row height and weighted column widths."""
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.horizontalHeader().hide()
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.setShowGrid(False)
+        self.setMouseTracking(True)
+        self.setWordWrap(False)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+    def _apply_widths(self):
+        width = self.viewport().width()
+        total = sum(WEIGHTS)
+        used = 0
+        for i, w in enumerate(WEIGHTS):
+            px = width - used if i == len(WEIGHTS) - 1 else width * w // total
+            self.setColumnWidth(i, px)
+            used += px
+
+    def resizeEvent(self, event):  # noqa: N802
+        super().resizeEvent(event)
+        self._apply_widths()
+
+    def setModel(self, model):  # noqa: N802
+        super().setModel(model)
+        self._apply_widths()
 
 
 class MembersPage(QWidget):
     """
     FAST Members list:
-      - Async data fetch (thread)
-      - Pagination (page_size=50)
+      - Async data fetch on the shared fetch pool (PageFetcher); a new search supersedes
+        (and interrupts) the previous one
+      - Virtualized table (MemberTableModel + MemberDelegate): only visible rows are painted
+      - Infinite scroll in chunks of page_size, or classic pagination with infinite=False
       - Debounced, cancelable refresh
     """
-    # Signal to ensure thread-safe UI updates: carries (seq, data)
-    dataReady = pyqtSignal(int, list)
 
     def __init__(self, services: Optional[object] = None, page_size: int = 50,
                  on_open_member: Optional[Callable[[Dict[str, Any] | None], None]] = None,
-                 parent: Optional[QWidget] = None):
+                 parent: Optional[QWidget] = None, infinite: bool = True):
         super().__init__(parent)
         self.services = services
         self.page_size = page_size
+        self.infinite = infinite
         self.on_open_member = on_open_member
 
         self.setObjectName("MembersPage")
@@ -202,12 +374,14 @@ class MembersPage(QWidget):
         # state
         self._debounce_timer: Optional[QTimer] = None
         self._fetch_seq = 0
-        self._rows: List[MemberRow] = []
         self._data: List[Dict[str, Any]] = []
         self._page = 0
+        self._restore_to: Optional[Tuple[int, int, int]] = None  # (page, shown, scroll) after restore_state
 
-        # connect signals
-        self.dataReady.connect(self._on_data_ready)
+        # fetches run on the shared pool; results come back here on the GUI thread
+        self._fetcher = PageFetcher(self)
+        self._cursor: Optional[Tuple[Any, ...]] = None  # next page of a paged service
+        self._query: Tuple[str, Optional[str]] = ("", None)
 
         # root grid
         root = QGridLayout(self)
@@ -242,6 +416,9 @@ class MembersPage(QWidget):
         self.opt_status.currentIndexChanged.connect(lambda _i: self._refresh())
         bar_grid.addWidget(self.opt_status, 0, 5)
 
+        self.lbl_count = _label("", color=PALETTE["muted"])
+        bar_grid.addWidget(self.lbl_count, 0, 6, 1, 2)
+
         self.btn_refresh = PushButton("Refresh")
         self.btn_refresh.setProperty("cssClass", "secondary")
         self.btn_refresh.clicked.connect(self._refresh)
@@ -268,17 +445,30 @@ class MembersPage(QWidget):
         header_lay.addWidget(hdr)  # type: ignore[arg-type]
         root.addWidget(header, 2, 0)
 
-        # list (scroll)
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet(f"QWidget {{ background-color: {PALETTE['card2']}; border-radius: 12px; }}")
-        self.list_container = QWidget()
+        # list (model/view: rows are painted, not instantiated)
+        self.list_container = QFrame()
+        self.list_container.setObjectName("MemberList")
+        self.list_container.setStyleSheet(
+            f"QFrame#MemberList {{ background-color: {PALETTE['card2']}; border-radius: 12px; }}"
+            f"QTableView {{ background: transparent; border: none; }}"
+        )
         self.list_container.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.list_vbox = QVBoxLayout(self.list_container)
         self.list_vbox.setContentsMargins(10, 8, 10, 8)
         self.list_vbox.setSpacing(6)
-        self.scroll.setWidget(self.list_container)
-        root.addWidget(self.scroll, 4, 0)
+        self.lbl_state = _label("", color=PALETTE["muted"])
+        self.lbl_state.hide()
+        self.list_vbox.addWidget(self.lbl_state)
+        self.model = MemberTableModel(chunk=page_size, parent=self)
+        self.delegate = MemberDelegate(self)
+        self.delegate.openRequested.connect(lambda row: self._open_member_form(self.model.member(row)))
+        self.model.need_more = self._load_more
+        self.table = MemberTable()
+        self.table.setModel(self.model)
+        self.table.setItemDelegate(self.delegate)
+        self.table.clicked.connect(self._on_row_clicked)
+        self.list_vbox.addWidget(self.table, 1)
+        root.addWidget(self.list_container, 4, 0)
 
         # pager
         pager = QFrame()
@@ -302,6 +492,7 @@ class MembersPage(QWidget):
         pgrid.addWidget(self.lbl_page, 0, 1, alignment=Qt.AlignmentFlag.AlignCenter)
         pgrid.addWidget(self.btn_next, 0, 2, alignment=Qt.AlignmentFlag.AlignRight)
         root.addWidget(pager, 3, 0)
+        pager.setVisible(not self.infinite)  # infinite scroll: the model fetches more on demand
 
         # initial
         self._refresh()
@@ -323,20 +514,14 @@ class MembersPage(QWidget):
         self.btn_refresh.setText("Refreshing…" if is_loading else "Refresh")
         if is_loading:
             self._clear_list()
-            self.list_vbox.addWidget(_label(note, color=PALETTE["muted"]))
+            self._show_state(note)
+
+    def _show_state(self, note: str):
+        self.lbl_state.setText(note)
+        self.lbl_state.setVisible(bool(note))
 
     def _clear_list(self):
-        for r in getattr(self, "_rows", []):
-            try:
-                r.setParent(None)
-            except Exception:
-                pass
-        self._rows.clear()
-        while self.list_vbox.count():
-            item = self.list_vbox.takeAt(0)
-            w = item.widget()
-            if w is not None:
-                w.setParent(None)
+        self.model.set_rows([])
 
     def _refresh(self):
         if self._debounce_timer and self._debounce_timer.isActive():
@@ -349,27 +534,142 @@ class MembersPage(QWidget):
 
         q = (self.ent_q.text() or "").strip()
         status = self._get_status_value()
+        self._cursor = None
+        self._query = (q, status)
+        self._fetcher.cancel("more")  # rows of the previous search
+        self._fetcher.cancel("count")
+
+        if self._paged():
+            # only the rows on screen are materialized; the model asks for more at the bottom
+            self._fetch_page(seq, q, status, None)
+            return
 
-        def worker():
-            data = self._fetch_rows(q, status)
-            # Emit to main thread for safe UI update
-            try:
-                self.dataReady.emit(seq, data)  # type: ignore[arg-type]
-            except Exception:
-                pass
-        threading.Thread(target=worker, daemon=True).start()
+        self._fetcher.fetch("rows", self._fetch_rows, q, status,
+                            on_result=lambda data: self._on_data_ready(seq, data))
+
+    # ----- paged service (find_members_page) -----
+    def _members(self):
+        """services.members (MemberService), or None -> demo data."""
+        return getattr(self.services, "members", None) if self.services else None
+
+    def _paged(self) -> bool:
+        return self.infinite and hasattr(self._members(), "find_members_page")
+
+    def _fetch_page(self, seq: int, q: str, status: Optional[str], after: Optional[Tuple[Any, ...]]):
+        self._fetcher.fetch("rows" if after is None else "more", self._load_page, q, status, after,
+                            on_result=lambda res: self._on_page_ready(seq, res))
 
-    def _on_data_ready(self, seq: int, data: list):  # slot
+    def _load_page(self, q: str, status: Optional[str], after: Optional[Tuple[Any, ...]]) -> Optional[Dict[str, Any]]:
+        # pool thread
+        try:
+            res = self._members().find_members_page(q, status, limit=self.page_size, after=after,
+                                                    count=after is None)
+        except Exception:
+            if after is not None:
+                return None
+            rows = self._fetch_rows(q, status)
+            res = {"rows": rows, "next": None, "total": len(rows), "exact": True}
+        res["q"], res["status"], res["first"] = q, status, after is None
+        return res
+
+    def _on_page_ready(self, seq: int, res: object):
+        if seq != self._fetch_seq or res is None:
+            return
+        res = dict(res)  # type: ignore[arg-type]
+        rows = res["rows"]
+        for m in rows:
+            m.setdefault("debt", 0)
+        self._cursor = res.get("next")
+        has_more = self._cursor is not None
+        if res["first"]:
+            self._data = list(rows)
+            self._set_loading(False)
+            if startup_trace is not None:
+                startup_trace.mark_once("first-data: Members", "data", rows=len(rows))
+            self.model.set_rows(rows, has_more=has_more)
+            self._show_state("" if rows else "No members found")
+            self._show_count(res.get("total"), bool(res.get("exact")))
+            if self._restore_to is not None:
+                scroll = self._restore_to[2]
+                self._restore_to = None
+                QTimer.singleShot(0, lambda: self.table.verticalScrollBar().setValue(scroll))
+            if res.get("total") is not None and not res.get("exact"):
+                self._count_exact(seq, res["q"], res["status"])
+        else:
+            self._data.extend(rows)
+            self.model.append_rows(rows, has_more=has_more)
+
+    def _load_more(self):
+        # model.need_more: the view scrolled past the last loaded row
+        if self._cursor is None or self._fetcher.busy("more"):
+            return
+        q, status = self._query  # the filters the loaded rows came from, not what is typed now
+        self._fetch_page(self._fetch_seq, q, status, self._cursor)
+
+    def _count_exact(self, seq: int, q: str, status: Optional[str]):
+        members = self._members()
+        if not hasattr(members, "count_members"):
+            return
+        # a full count can scan the whole table: report lane, behind page fetches
+        self._fetcher.fetch("count", members.count_members, q, status, True, lane="report",
+                            on_result=lambda res: self._on_count_ready(seq, int(res[0])))
+
+    def _on_count_ready(self, seq: int, n: int):
+        if seq == self._fetch_seq:
+            self._show_count(n, True)
+
+    def _show_count(self, total: Optional[int], exact: bool):
+        if total is None:
+            self.lbl_count.setText("")
+        else:
+            self.lbl_count.setText(f"{total:,} members" if exact else f"{total:,}+ members")
+
+    def _on_data_ready(self, seq: int, data: list):
         if seq != self._fetch_seq:
             return
         self._data = data
         self._set_loading(False)
+        self._show_count(len(data), True)
+        if startup_trace is not None:
+            startup_trace.mark_once("first-data: Members", "data", rows=len(data))
+        if self._restore_to is not None:
+            page, shown, scroll = self._restore_to
+            self._restore_to = None
+            total = max(1, (len(self._data) + self.page_size - 1) // self.page_size)
+            self._page = max(0, min(page, total - 1))
+            self._render_page(show=shown)
+            QTimer.singleShot(0, lambda: self.table.verticalScrollBar().setValue(scroll))
+            return
         self._render_page()
 
+    def _on_row_clicked(self, index):
+        if index.column() != COL_OPEN:  # the Open button reports through the delegate
+            self._open_member_form(self.model.member(index.row()))
+
+    # ----- router page cache -----
+    def snapshot_state(self) -> Dict[str, Any]:
+        return {"q": self.ent_q.text(), "status": self.opt_status.currentText(), "page": self._page,
+                "shown": self.model.shown(), "scroll": self.table.verticalScrollBar().value()}
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        for w in (self.ent_q, self.opt_status):
+            w.blockSignals(True)
+        try:
+            self.ent_q.setText(state.get("q", ""))
+            i = self.opt_status.findText(state.get("status", "All"))
+            if i >= 0:
+                self.opt_status.setCurrentIndex(i)
+        finally:
+            for w in (self.ent_q, self.opt_status):
+                w.blockSignals(False)
+        self._restore_to = (int(state.get("page", 0)), int(state.get("shown", 0)), int(state.get("scroll", 0)))
+        self._refresh()
+
     def _fetch_rows(self, q: str, status: Optional[str]) -> List[Dict[str, Any]]:
-        if self.services and hasattr(self.services, "find_members"):
+        members = self._members()
+        if hasattr(members, "find_members"):
             try:
-                data = self.services.find_members(q, status) or []
+                data = members.find_members(q, status) or []
                 for m in data:
                     m.setdefault("debt", 0)
                 return data
@@ -416,25 +716,20 @@ class MembersPage(QWidget):
         end = start + self.page_size
         return self._data[start:end]
 
-    def _render_page(self):
-        self._clear_list()
-        rows = self._page_slice()
-        if not rows:
-            self.list_vbox.addWidget(_label("No members found", color=PALETTE["muted"]))
+    def _render_page(self, show: Optional[int] = None):
+        if self.infinite:
+            # whole result in the model; the view pulls it in page_size chunks (fetchMore)
+            self.model.set_rows(self._data, show=show)
         else:
-            for m in rows:
-                row = MemberRow(m, on_open=self._open_member_form)
-                self.list_vbox.addWidget(row)
-                self._rows.append(row)
-        # push content to top and allow growth
-        self.list_vbox.addStretch(1)
+            self.model.set_rows(self._page_slice(), show=self.page_size)
+        self._show_state("" if self.model.rowCount() else "No members found")
         total = max(1, (len(self._data) + self.page_size - 1) // self.page_size)
         self.lbl_page.setText(f"Page {self._page+1} / {total}")
         self.btn_prev.setEnabled(self._page > 0)
         self.btn_next.setEnabled(self._page < total - 1)
 
         # ensure top
-        self.scroll.verticalScrollBar().setValue(0)
+        self.table.verticalScrollBar().setValue(0)
 
     def _prev_page(self):
         if self._page <= 0:
@@ -0,0 +1,84 @@
+# pages_qt/page_fetcher.py
+# GymPro — A page's handle on the shared fetch pool: results come back on the GUI thread
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+try:
+    from pages_logic import fetch_pool  # type: ignore
+except Exception:
+    fetch_pool = None
+
+
+class PageFetcher(QObject):
+    """
+    One per page. fetch(slot, fn, *args, lane=..., on_result=..., on_error=...) runs fn on the
+    shared FetchPool and calls on_result(value) / on_error(exc) on the GUI thread.
+    - Per slot, only the latest fetch delivers: a newer fetch in the same slot supersedes the
+      older one (dropped if still queued, its query interrupted if running).
+    - cancel(slot) / cancel() drop pending fetches, e.g. "load more" when the search changes.
+    - Writes (a check-in) pass a slot of their own, key=None and interruptible=False.
+    - Without the pool (import failure) fn runs inline and the callbacks fire synchronously.
+    """
+    _delivered = pyqtSignal(object, object)  # (slot, ticket) — queued onto the GUI thread
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._pending: Dict[Any, Tuple[Any, Optional[Callable], Optional[Callable]]] = {}
+        self._delivered.connect(self._deliver)
+        pending = self._pending  # not self: the lambda must outlive the wrapper
+        self.destroyed.connect(lambda *_: [p[0].cancel() for p in list(pending.values())])
+
+    def fetch(self, slot: Any, fn: Callable[..., Any], *args: Any, lane: str = "page",
+              on_result: Optional[Callable[[Any], None]] = None,
+              on_error: Optional[Callable[[BaseException], None]] = None, key: Any = ...,
+              interruptible: bool = True) -> None:
+        if fetch_pool is None:
+            try:
+                value = fn(*args)
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                return
+            if on_result:
+                on_result(value)
+            return
+        ticket = fetch_pool.shared().submit(fn, *args, lane=lane, key=key, slot=(id(self), slot),
+                                              interruptible=interruptible)
+        self._pending[slot] = (ticket, on_result, on_error)
+        ticket.add_done_callback(lambda t, slot=slot: self._relay(slot, t))
+
+    def _relay(self, slot: Any, ticket: Any) -> None:
+        # pool thread
+        if ticket.cancelled():
+            return
+        try:
+            self._delivered.emit(slot, ticket)
+        except RuntimeError:
+            pass  # page (and this fetcher) already deleted
+
+    def _deliver(self, slot: Any, ticket: Any) -> None:  # slot (GUI thread)
+        pending = self._pending.get(slot)
+        if pending is None or pending[0] is not ticket:
+            return  # superseded after it finished
+        del self._pending[slot]
+        _t, on_result, on_error = pending
+        e = ticket.exception()
+        if e is None:
+            if on_result:
+                on_result(ticket.result())
+        elif on_error:
+            on_error(e)
+
+    def busy(self, slot: Any = None) -> bool:
+        """A fetch is pending in `slot` (None: in any slot)."""
+        return bool(self._pending) if slot is None else slot in self._pending
+
+    def cancel(self, slot: Any = None) -> None:
+        for s in ([slot] if slot is not None else list(self._pending)):
+            pending = self._pending.pop(s, None)
+            if pending is not None:
+                pending[0].cancel()
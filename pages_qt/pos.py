@@ -18,6 +18,11 @@ from qfluentwidgets import (
     InfoBar, InfoBarPosition
 )
 
+try:
+    from pages_logic import permissions
+except Exception:
+    permissions = None
+
 # ---------------- Brand (old dark identity) ----------------
 # Accent blue and dark surfaces to match the legacy style
 PRIMARY = QColor("#4f8cff")
@@ -414,6 +419,9 @@ class POSWindow(QMainWindow):
 
     # ---------------- Actions ----------------
     def pay(self):
+        if permissions is not None and not permissions.allowed(permissions.POS_CHECKOUT):
+            InfoBar.error("Not allowed", "Your role cannot take POS payments", position=InfoBarPosition.TOP_RIGHT, parent=self)
+            return
         if not self._cart:
             InfoBar.warning("Empty cart", "Add items before paying", position=InfoBarPosition.TOP_RIGHT, parent=self)
             return
@@ -41,6 +41,9 @@ from PyQt6.QtWidgets import (
 )
 from qfluentwidgets import setTheme, Theme, LineEdit, ComboBox, PrimaryPushButton, PushButton
 
+from pages_qt.page_fetcher import PageFetcher
+from pages_qt.row_pool import RowPool
+
 
 def _label(text: str, *, color: str | None = None, size: int = 13, bold: bool = False) -> QLabel:
     lbl = QLabel(text)
@@ -77,16 +80,24 @@ class ReportRow(QFrame):
         self.setStyleSheet(f"background-color:{PALETTE['card2']}; border-radius:10px;")
         g = QGridLayout(self); g.setContentsMargins(12,8,12,8); g.setHorizontalSpacing(8)
         g.setColumnStretch(0, 16); g.setColumnStretch(1, 12); g.setColumnStretch(2, 12); g.setColumnStretch(3, 12)
-        g.addWidget(_label(r.get('date','—')), 0, 0)
-        g.addWidget(_label(r.get('type','—'), color=PALETTE['muted']), 0, 1)
-        g.addWidget(_label(f"{float(r.get('amount',0)):.0f} DA"), 0, 2)
-        g.addWidget(_label(r.get('note',''), color=PALETTE['muted']), 0, 3)
+        self.lbl_date = _label(""); g.addWidget(self.lbl_date, 0, 0)
+        self.lbl_type = _label("", color=PALETTE['muted']); g.addWidget(self.lbl_type, 0, 1)
+        self.lbl_amount = _label(""); g.addWidget(self.lbl_amount, 0, 2)
+        self.lbl_note = _label("", color=PALETTE['muted']); g.addWidget(self.lbl_note, 0, 3)
+        self.bind(r)
+
+    def bind(self, r: Dict[str, Any]):
+        self.lbl_date.setText(r.get('date','—'))
+        self.lbl_type.setText(r.get('type','—'))
+        self.lbl_amount.setText(f"{float(r.get('amount',0)):.0f} DA")
+        self.lbl_note.setText(r.get('note',''))
 
 
 class ReportsPage(QWidget):
     def __init__(self, services: Optional[object] = None, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.services = services
+        self._fetcher = PageFetcher(self)
 
         self.setObjectName("ReportsPage")
         self.setStyleSheet(
@@ -137,20 +148,19 @@ class ReportsPage(QWidget):
         self.scroll = QScrollArea(); self.scroll.setWidgetResizable(True)
         self.wrap = QWidget(); self.vbox = QVBoxLayout(self.wrap); self.vbox.setContentsMargins(8,6,8,8); self.vbox.setSpacing(6)
         self.scroll.setWidget(self.wrap)
+        self.rows = RowPool(ReportRow)  # refreshes rebind these rows in place
+        self.vbox.addWidget(self.rows); self.vbox.addStretch(1)
         list_card.layout().addWidget(self.scroll)  # type: ignore
         root.addWidget(list_card, 2, 0, 1, 2)
 
         self._refresh()
 
     # ----- data -----
-    def _fetch(self) -> Dict[str, Any]:
+    def _fetch(self, period: str, start: Optional[str], end: Optional[str]) -> Dict[str, Any]:
+        # pool thread: filters are read on the GUI thread by _refresh
         if self.services and hasattr(self.services, "reports") and hasattr(self.services.reports, "summary"):
             try:
-                data = self.services.reports.summary(
-                    period=self.opt_period.currentText(),
-                    start=self.ent_from.text().strip() or None,
-                    end=self.ent_to.text().strip() or None,
-                )
+                data = self.services.reports.summary(period=period, start=start, end=end)
                 if data: return data
             except Exception:
                 pass
@@ -172,19 +182,19 @@ class ReportsPage(QWidget):
         return {"rows": rows, "total": total, "refunds": refunds, "net": net, "receipts": receipts, "avg": avg}
 
     def _refresh(self):
-        data = self._fetch()
+        # reports lane: a scan or checkout submitted meanwhile runs first
+        self._fetcher.fetch("summary", self._fetch, self.opt_period.currentText(),
+                            self.ent_from.text().strip() or None, self.ent_to.text().strip() or None,
+                            lane="report", on_result=self._render)
+
+    def _render(self, data: Dict[str, Any]):
         self.k_total_sales.value_lbl.setText(f"{int(data.get('total',0)):,} DA")
         self.k_refunds.value_lbl.setText(f"{int(data.get('refunds',0)):,} DA")
         self.k_net.value_lbl.setText(f"{int(data.get('net',0)):,} DA")
         self.k_receipts.value_lbl.setText(str(int(data.get('receipts',0))))
         self.k_avg.value_lbl.setText(f"{int(data.get('avg',0)):,} DA")
-        while self.vbox.count():
-            it = self.vbox.takeAt(0); w = it.widget();
-            if w: w.setParent(None)
         rows: List[Dict[str, Any]] = data.get("rows", [])
-        for r in rows:
-            self.vbox.addWidget(ReportRow(r))
-        self.vbox.addStretch(1)
+        self.rows.set_rows(rows)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+# pages_qt/row_pool.py
+# GymPro — Recycled row widgets for the list pages that are not on model/view yet
+#
+#   python -m pages_qt.row_pool [--rows 500] [--repeat 5]     (benchmark, runs offscreen)
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication, QScrollArea, QVBoxLayout, QWidget
+
+KEEP_SPARE = 64  # hidden rows kept for the next refresh; more than this are deleted
+
+
+class RowPool(QWidget):
+    """
+    A vertical list of row widgets that are rebound, not rebuilt:
+      - set_rows(rows): the first len(rows) widgets get row.bind(data) in place; only missing
+        ones are created with make(data); the surplus is hidden (kept as spares)
+      - spares beyond keep_spare are deleted on the next event-loop turn, so a list that
+        shrank for good gives its memory back without slowing the refresh that shrank it
+      - the whole pass runs with updates disabled: one layout + one repaint per refresh
+    Row widgets implement bind(data) and route their callbacks through the bound data.
+    """
+    def __init__(self, make: Callable[[Dict[str, Any]], QWidget], *, spacing: int = 6,
+                 keep_spare: int = KEEP_SPARE, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._make = make
+        self._rows: List[QWidget] = []
+        self._shown = 0
+        self.keep_spare = keep_spare
+        self._trim_pending = False
+        self.created = 0  # counters for the benchmark / debugging
+        self.rebound = 0
+        self._lay = QVBoxLayout(self)
+        self._lay.setContentsMargins(0, 0, 0, 0)
+        self._lay.setSpacing(spacing)
+
+    def set_rows(self, rows: Sequence[Dict[str, Any]]) -> None:
+        n = len(rows)
+        self.setUpdatesEnabled(False)
+        try:
+            for i, data in enumerate(rows):
+                if i < len(self._rows):
+                    w = self._rows[i]
+                    w.bind(data)  # type: ignore[attr-defined]
+                    self.rebound += 1
+                    if i >= self._shown:
+                        w.show()
+                else:
+                    w = self._make(data)
+                    self._lay.addWidget(w)
+                    self._rows.append(w)
+                    self.created += 1
+                    w.show()
+            for w in self._rows[n:self._shown]:
+                w.hide()
+            self._shown = n
+        finally:
+            self.setUpdatesEnabled(True)
+        if len(self._rows) - n > self.keep_spare and not self._trim_pending:
+            self._trim_pending = True
+            QTimer.singleShot(0, self._trim)
+
+    def _trim(self) -> None:
+        self._trim_pending = False
+        keep = self._shown + self.keep_spare
+        for w in self._rows[keep:]:
+            self._lay.removeWidget(w)
+            w.deleteLater()
+        del self._rows[keep:]
+
+    def rows(self) -> List[QWidget]:
+        """The widgets currently showing, in order."""
+        return self._rows[:self._shown]
+
+    def __len__(self) -> int:
+        return self._shown
+
+
+# -------- benchmark --------
+def _rebuild(vbox: QVBoxLayout, make: Callable[[Dict[str, Any]], QWidget], rows: Sequence[Dict[str, Any]]) -> None:
+    # what the list pages did before RowPool
+    while vbox.count():
+        it = vbox.takeAt(0); w = it.widget()
+        if w: w.setParent(None)
+    for r in rows:
+        vbox.addWidget(make(r))
+
+
+def bench_refresh(rows: int = 500, repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    ms per refresh of a `rows`-row list, for each list page's row widget: delete + re-create
+    (the old path) vs RowPool rebinding. Each refresh gets new data and is laid out and painted
+    (processEvents) before the clock stops.
+    """
+    from pages_qt.inventory import ProductRow
+    from pages_qt.accounting_old import InvoiceRow
+    from pages_qt.reports import ReportRow
+    from pages_qt.mark_attendance import MemberRow
+
+    def product(i: int, k: int) -> Dict[str, Any]:
+        return {"id": i, "name": f"Product {i}-{k}", "price": 100 + (i * 7 + k) % 900, "stock_qty": (i + k) % 30,
+                "low_stock_threshold": 5, "is_active": (i + k) % 11 != 0, "category": "Snacks"}
+
+    def invoice(i: int, k: int) -> Dict[str, Any]:
+        return {"no": f"INV-{k:02d}-{i:04d}", "date": "2025-01-01", "typ": "POS", "who": f"Member {i + k}",
+                "method": "Cash", "total": 1000 + i, "paid": 500, "status": ("open", "partial", "paid")[(i + k) % 3]}
+
+    def report(i: int, k: int) -> Dict[str, Any]:
+        return {"date": "2025-01-01", "type": ("POS", "Subscription", "Refund")[(i + k) % 3],
+                "amount": 100 + i + k, "note": f"note {k}"}
+
+    def member(i: int, k: int) -> Dict[str, Any]:
+        return {"id": i, "uid": f"UID{i + k:05d}", "name": f"Member {i}-{k}", "phone": "0550000000",
+                "status": ("Active", "Inactive")[(i + k) % 2], "avatar": None, "days_per_month": 30,
+                "granted_left": (i + k) % 3}
+
+    cases = [
+        ("ProductRow", lambda d: ProductRow(d, on_edit=lambda _p: None), product),
+        ("InvoiceRow", InvoiceRow, invoice),
+        ("ReportRow", ReportRow, report),
+        ("MemberRow", lambda d: MemberRow(d, on_mark=lambda _r: None), member),
+    ]
+    app = QApplication.instance() or QApplication([])
+    results = []
+    for name, make, data in cases:
+        batches = [[data(i, k) for i in range(rows)] for k in range(repeat + 1)]
+
+        scroll = QScrollArea(); scroll.setWidgetResizable(True); scroll.resize(1200, 800)
+        wrap = QWidget(); vbox = QVBoxLayout(wrap); scroll.setWidget(wrap); scroll.show()
+        _rebuild(vbox, make, batches[0]); app.processEvents()
+        t0 = time.perf_counter()
+        for batch in batches[1:]:
+            _rebuild(vbox, make, batch); app.processEvents()
+        rebuild_ms = (time.perf_counter() - t0) * 1000.0 / repeat
+        scroll.close(); scroll.deleteLater()
+
+        scroll = QScrollArea(); scroll.setWidgetResizable(True); scroll.resize(1200, 800)
+        pool = RowPool(make); scroll.setWidget(pool); scroll.show()
+        pool.set_rows(batches[0]); app.processEvents()
+        t0 = time.perf_counter()
+        for batch in batches[1:]:
+            pool.set_rows(batch); app.processEvents()
+        pool_ms = (time.perf_counter() - t0) * 1000.0 / repeat
+        scroll.close(); scroll.deleteLater()
+        app.processEvents()
+
+        results.append({"row": name, "rows": rows, "rebuild_ms": rebuild_ms, "pool_ms": pool_ms,
+                        "created": pool.created, "rebound": pool.rebound})
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m pages_qt.row_pool")
+    ap.add_argument("--rows", type=int, default=500)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    for r in bench_refresh(args.rows, args.repeat):
+        print("  ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in r.items()))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Dict, Optional
 
 try:
     from router_qt import PALETTE
@@ -12,9 +12,15 @@ except Exception:
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QGridLayout, QFrame, QLabel, QPushButton, QLineEdit, QListWidget, QListWidgetItem, QHBoxLayout
+    QWidget, QVBoxLayout, QGridLayout, QFrame, QLabel, QPushButton, QLineEdit, QListWidget, QListWidgetItem, QHBoxLayout,
+    QCheckBox,
 )
 
+try:
+    from pages_logic import permissions
+except Exception:
+    permissions = None
+
 
 def _label(text: str, *, color: Optional[str] = None, size: int = 13, bold: bool = False) -> QLabel:
     lbl = QLabel(text)
@@ -46,11 +52,26 @@ class SettingsRolesPage(QWidget):
         g = QGridLayout(card); g.setContentsMargins(12,10,12,10); g.setHorizontalSpacing(8); g.setVerticalSpacing(8)
 
         self.roles = QListWidget(); self.roles.setStyleSheet(f"QListWidget {{ background:{PALETTE['card2']}; color:{PALETTE['text']}; border:none; border-radius:8px; }}")
-        for r in ["Admin","Cashier","Trainer","Auditor"]:
+        # role name -> capability bitmask (pages_logic.permissions)
+        self._masks: Dict[str, int] = self._fetch_roles()
+        for r in self._masks:
             self.roles.addItem(QListWidgetItem(r))
+        self.roles.currentTextChanged.connect(self._show_role)
         g.addWidget(_label("Defined Roles", color=PALETTE['muted']), 0, 0)
         g.addWidget(self.roles, 1, 0, 1, 2)
 
+        # capability toggles of the selected role
+        caps = QFrame(); cv = QVBoxLayout(caps); cv.setContentsMargins(8,0,0,0); cv.setSpacing(6)
+        cv.addWidget(_label("Capabilities", color=PALETTE['muted']))
+        self._checks: Dict[str, QCheckBox] = {}
+        for name in (permissions.CAPABILITIES if permissions else {}):
+            cb = QCheckBox(name); cb.setStyleSheet(f"color:{PALETTE['text']};")
+            cb.toggled.connect(lambda _on, n=name: self._toggle(n))
+            cv.addWidget(cb); self._checks[name] = cb
+        cv.addStretch(1)
+        self.lbl_status = _label("", color=PALETTE['muted'], size=12); cv.addWidget(self.lbl_status)
+        g.addWidget(caps, 0, 2, 3, 1)
+
         self.ent_role = QLineEdit(); self.ent_role.setPlaceholderText("New role name…")
         btn_add = QPushButton("Add Role"); btn_add.setProperty("cssClass","primary")
         btn_add.clicked.connect(self._add_role)
@@ -59,9 +80,57 @@ class SettingsRolesPage(QWidget):
 
         root.addWidget(card, 1, 0)
 
+        if self.roles.count():
+            self.roles.setCurrentRow(0)
+
+    def _auth(self):
+        auth = getattr(self.services, "auth", None) if self.services else None
+        return auth if auth is not None and hasattr(auth, "save_role") else None
+
+    def _fetch_roles(self) -> Dict[str, int]:
+        auth = self._auth()
+        if auth is not None:
+            try:
+                return {r["name"]: r["mask"] for r in auth.list_roles()}
+            except Exception:
+                pass
+        return dict(permissions.DEFAULT_ROLES) if permissions else {r: 0 for r in ("Admin","Cashier","Trainer","Auditor")}
+
+    def _save(self, name: str, mask: int) -> bool:
+        auth = self._auth()
+        if auth is not None:
+            try:
+                auth.save_role(name, mask)
+            except Exception as e:  # PermissionDenied / ValueError
+                self.lbl_status.setText(str(e))
+                return False
+        self._masks[name] = mask
+        self.lbl_status.setText("")
+        return True
+
+    def _show_role(self, name: str):
+        mask = self._masks.get(name, 0)
+        for cap, cb in self._checks.items():
+            cb.blockSignals(True)
+            cb.setChecked(bool(mask & permissions.CAPABILITIES[cap]))
+            cb.blockSignals(False)
+
+    def _toggle(self, cap: str):
+        item = self.roles.currentItem()
+        if item is None:
+            return
+        name = item.text()
+        bit = permissions.CAPABILITIES[cap]
+        mask = self._masks.get(name, 0) ^ bit
+        if not self._save(name, mask):
+            self._show_role(name)  # revert the checkbox
+
     def _add_role(self):
         name = (self.ent_role.text() or "").strip()
-        if not name:
+        if not name or name in self._masks:
+            return
+        if not self._save(name, 0):
             return
         self.roles.addItem(QListWidgetItem(name))
+        self.roles.setCurrentRow(self.roles.count() - 1)
         self.ent_role.setText("")
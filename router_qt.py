@@ -1,8 +1,29 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, QObject, QEvent, pyqtSignal
+
+try:
+    from pages_logic import permissions
+except Exception:
+    permissions = None
+try:
+    from pages_logic.route_stats import RouteStats, default_stats_path
+except Exception:
+    RouteStats = None
+try:
+    from pages_logic import startup_trace
+except Exception:
+    startup_trace = None
+try:
+    from pages_logic import fetch_pool
+except Exception:
+    fetch_pool = None
 from PyQt6.QtWidgets import (
     QWidget,
     QMainWindow,
@@ -43,78 +64,280 @@ class MissingPage(QWidget):
         lay.addWidget(card)
 
 
+class LoadingPage(QWidget):
+    """Stand-in shown for a route until its page has been imported and built."""
+    def __init__(self, name: str, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setObjectName("LoadingPage")
+        self.setStyleSheet(f"QWidget#LoadingPage {{ background-color:{PALETTE['surface']}; }}")
+        lay = QVBoxLayout(self)
+        lay.addWidget(_label(f"Loading {name}…", color=PALETTE["muted"], size=15), alignment=Qt.AlignmentFlag.AlignCenter)
+
+
+# route -> (module, class, fallback modules)
+ROUTES: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "Home": ("pages_qt.home", "HomePage", ()),
+    "Dashboard": ("pages_qt.dashboard_qt", "DashboardPage", ()),
+    "Members": ("pages_qt.members", "MembersPage", ()),
+    "Member Profile": ("pages_qt.member_profile", "MemberProfilePage", ()),
+    "Subscriptions": ("pages_qt.subscriptions", "SubscriptionsPage", ()),
+    "Attendance": ("pages_qt.attendance", "AttendancePage", ()),
+    "POS": ("pages_qt.pos", "POSPage", ("pages_qt.pos_pyqt",)),
+    "Inventory": ("pages_qt.inventory", "InventoryPage", ()),
+    "Accounting": ("pages_qt.accounting_old", "AccountingPage", ()),
+    "Reports": ("pages_qt.reports", "ReportsPage", ()),
+    "Settings": ("pages_qt.settings_hub", "SettingsHubPage", ()),
+}
+
+
+PAGE_BUDGET = 4            # resident pages (besides pinned ones) before hidden pages get evicted
+PINNED_ROUTES = ("Home",)
+
+
 class RouterQt:
-    def __init__(self, stack: QStackedWidget, services=None):
+    """
+    Lazy router: routes are registered by module path and every stack slot starts as a
+    LoadingPage. The first goto(route) shows that placeholder, then imports and builds the
+    real page on the next event-loop turn and swaps it into the same index.
+    build_times[route] = {"import_ms", "build_ms"} for every page built so far.
+
+    Memory budget: at most `budget` unpinned pages stay resident. Beyond that the least
+    recently shown hidden page is destroyed (its slot gets a placeholder again) if it
+    implements snapshot_state() -> dict | None; the dict is handed to restore_state(dict)
+    when the route is rebuilt. snapshot_state() returning None means "busy, keep me";
+    pages without the pair are never evicted.
+    """
+    def __init__(self, stack: QStackedWidget, services=None, *, budget: int = PAGE_BUDGET,
+                 pinned: Tuple[str, ...] = PINNED_ROUTES):
         self.stack = stack
         self.services = services
         self.route_to_index: Dict[str, int] = {}
         # Map route name -> filename for file-backed routes (for Home tiles)
         self.route_files: Dict[str, str] = {}
+        self.routes: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+        self.build_times: Dict[str, Dict[str, float]] = {}
+        self.page_built: List[Callable[[str, QWidget], None]] = []  # listeners: (route, page)
+        self._built: "OrderedDict[str, QWidget]" = OrderedDict()  # least recently shown first
+        self._pending: set = set()
+        self.budget = int(budget)
+        self.pinned = set(pinned)
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self.evictions = 0
         self._build_routes()
 
     def _add_page(self, route: str, widget: QWidget):
         idx = self.stack.addWidget(widget)
         self.route_to_index[route] = idx
 
+    def register(self, route: str, module: str, cls: str, fallbacks: Tuple[str, ...] = ()):
+        self.routes[route] = (module, cls, tuple(fallbacks))
+        self._add_page(route, LoadingPage(route))
+        self.route_files[route] = f"{module.split('.')[-1]}.py"
+
     def _build_routes(self):
-        mapping = {
-            "Home": ("pages_qt.home", "HomePage"),
-            "Dashboard": ("pages_qt.dashboard_qt", "DashboardPage"),
-            "Members": ("pages_qt.members", "MembersPage"),
-            "Member Profile": ("pages_qt.member_profile", "MemberProfilePage"),
-            "Subscriptions": ("pages_qt.subscriptions", "SubscriptionsPage"),
-            "Attendance": ("pages_qt.attendance", "AttendancePage"),
-            "POS": ("pages_qt.pos", "POSPage"),
-            "Inventory": ("pages_qt.inventory", "InventoryPage"),
-            "Accounting": ("pages_qt.accounting_old", "AccountingPage"),
-            "Reports": ("pages_qt.reports", "ReportsPage"),
-            "Settings": ("pages_qt.settings_hub", "SettingsHubPage"),
-        }
-        for route, (mod, cls) in mapping.items():
-            selected_mod = mod
+        for route, (mod, cls, fallbacks) in ROUTES.items():
+            self.register(route, mod, cls, fallbacks)
+
+    def is_built(self, route: str) -> bool:
+        return route in self._built
+
+    def import_page(self, route: str) -> Tuple[Optional[type], str]:
+        """(page class or None, module used). Touches no widgets, so it may run off the GUI thread."""
+        mod, cls, fallbacks = self.routes[route]
+        for candidate in (mod,) + fallbacks:
+            try:
+                return getattr(importlib.import_module(candidate), cls), candidate
+            except Exception:
+                continue
+        return None, mod
+
+    def ensure_built(self, route: str) -> Optional[QWidget]:
+        """Import + construct the page of `route` now (no-op when already built)."""
+        if route in self._built:
+            return self._built[route]
+        if route not in self.routes:
+            return None
+        if startup_trace is not None and startup_trace.enabled():
+            with startup_trace.span(f"page: {route}", "page"):
+                return self._build(route)
+        return self._build(route)
+
+    def _build(self, route: str) -> QWidget:
+        t0 = time.perf_counter()
+        page_cls, selected_mod = self.import_page(route)
+        t1 = time.perf_counter()
+        w: QWidget
+        try:
+            w = page_cls(services=self.services) if page_cls is not None else MissingPage(route)
+        except Exception:
+            w = MissingPage(route)
+        state = self._snapshots.pop(route, None)
+        if state is not None and callable(getattr(w, "restore_state", None)):
             try:
-                module = __import__(mod, fromlist=[cls])
-                page_cls = getattr(module, cls)
-                w = page_cls(services=self.services)
+                w.restore_state(state)
             except Exception:
-                # Fallbacks for specific routes
-                if route == "POS":
-                    try:
-                        selected_mod = "pages_qt.pos_pyqt"
-                        module = __import__(selected_mod, fromlist=[cls])
-                        page_cls = getattr(module, cls)
-                        w = page_cls(services=self.services)
-                    except Exception:
-                        w = MissingPage(route)
-                else:
-                    w = MissingPage(route)
-            self._add_page(route, w)
-            # record backing filename for tiles
+                pass
+        t2 = time.perf_counter()
+        self.build_times[route] = {"import_ms": (t1 - t0) * 1000.0, "build_ms": (t2 - t1) * 1000.0}
+
+        # swap into the placeholder's slot (indices stay stable)
+        showing = self._swap(route, w)
+        self._built[route] = w
+        if not showing:
+            self._built.move_to_end(route, last=False)  # preloaded: first to go
+        self._pending.discard(route)
+
+        fname = f"{selected_mod.split('.')[-1]}.py"
+        if fname != self.route_files.get(route):
+            self.route_files[route] = fname
+            self._push_file_routes()
+        if route == "Home":
+            self._push_file_routes()
+        for cb in list(self.page_built):
             try:
-                fname = f"{selected_mod.split('.')[-1]}.py"
-                self.route_files[route] = fname
+                cb(route, w)
             except Exception:
                 pass
+        self._evict()
+        return w
+
+    def _swap(self, route: str, w: QWidget) -> bool:
+        """Put `w` into the route's slot (deleting what was there); True when it is the current page."""
+        idx = self.route_to_index[route]
+        old = self.stack.widget(idx)
+        showing = self.stack.currentIndex() == idx
+        self.stack.insertWidget(idx, w)
+        self.stack.removeWidget(old)
+        old.deleteLater()
+        if showing:
+            self.stack.setCurrentIndex(idx)
+        return showing
+
+    # ---------- memory budget ----------
+    def resident(self) -> int:
+        return sum(1 for r in self._built if r not in self.pinned)
+
+    def has_room(self) -> bool:
+        return self.resident() < self.budget
 
+    def _evict(self):
+        current = self.stack.currentIndex()
+        excess = self.resident() - self.budget
+        for route in list(self._built):
+            if excess <= 0:
+                break
+            if route in self.pinned or self.route_to_index[route] == current:
+                continue
+            page = self._built[route]
+            snap = getattr(page, "snapshot_state", None)
+            if not callable(snap):
+                continue
+            try:
+                state = snap()
+            except Exception:
+                continue
+            if state is None:
+                continue
+            self._snapshots[route] = state
+            del self._built[route]
+            self._swap(route, LoadingPage(route))
+            self.evictions += 1
+            excess -= 1
+
+    def _push_file_routes(self):
         # If Home supports receiving file routes, pass them
+        home_w = self._built.get("Home")
         try:
-            home_idx = self.route_to_index.get("Home")
-            if home_idx is not None:
-                home_w = self.stack.widget(home_idx)
-                if hasattr(home_w, "set_file_routes") and callable(getattr(home_w, "set_file_routes")):
-                    home_w.set_file_routes(self.route_files)
+            if home_w is not None and callable(getattr(home_w, "set_file_routes", None)):
+                home_w.set_file_routes(self.route_files)
         except Exception:
             pass
 
-    def goto(self, route: str):
+    def busy(self) -> bool:
+        """True while a navigation is waiting for its page to be built."""
+        return bool(self._pending)
+
+    def goto(self, route: str) -> bool:
         idx = self.route_to_index.get(route)
         if idx is None:
-            return
+            return False
+        if permissions is not None and not permissions.can_visit(route):
+            return False
         self.stack.setCurrentIndex(idx)
-    
+        if route in self._built:
+            self._built.move_to_end(route)
+            self._evict()
+        elif route not in self._pending:
+            # let the placeholder paint first, then build
+            self._pending.add(route)
+            QTimer.singleShot(0, lambda r=route: self.ensure_built(r))
+        return True
+
     def iter_pages(self):
-        for route, idx in self.route_to_index.items():
-            yield route, self.stack.widget(idx)
+        """Pages built so far (placeholders are skipped)."""
+        for route, w in list(self._built.items()):
+            yield route, w
+
+
+# -------- preloading --------
+PRELOAD_COUNT = 3                          # most-visited routes warmed after first paint
+PRELOAD_DEFAULT = ("Members", "POS")       # until the user has a history
+PRELOAD_SLICE_MS = 0                       # zero-timer: one page per event-loop turn
+
+
+class PagePreloader(QObject):
+    """
+    Warms routes in idle time: imports run on a daemon thread (module import only, no
+    widgets), then each page is constructed on the GUI thread in its own zero-timer slice,
+    so input and paint events interleave between pages. A slice is skipped (retried on
+    the next turn) while the user is waiting on a lazily-built page.
+    """
+    imported = pyqtSignal(str)
+
+    def __init__(self, router: "RouterQt", parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.router = router
+        self._queue: List[str] = []
+        self._stopped = False
+        self.imported.connect(self._enqueue)
+
+    def start(self, routes: List[str]):
+        routes = [r for r in routes if r in self.router.routes and not self.router.is_built(r)
+                  and (permissions is None or permissions.can_visit(r))]
+        if not routes:
+            return
+
+        def work():
+            for r in routes:
+                if self._stopped:
+                    return
+                self.router.import_page(r)
+                self.imported.emit(r)  # queued to the GUI thread
+
+        threading.Thread(target=work, name="page-preload", daemon=True).start()
+
+    def stop(self):
+        self._stopped = True
+        self._queue.clear()
+
+    def _enqueue(self, route: str):
+        if self._stopped:
+            return
+        self._queue.append(route)
+        if len(self._queue) == 1:
+            QTimer.singleShot(PRELOAD_SLICE_MS, self._slice)
+
+    def _slice(self):
+        if self._stopped or not self._queue:
+            return
+        if self.router.busy():
+            QTimer.singleShot(PRELOAD_SLICE_MS, self._slice)
+            return
+        route = self._queue.pop(0)
+        if not self.router.is_built(route) and self.router.has_room():
+            self.router.ensure_built(route)
+        if self._queue:
+            QTimer.singleShot(PRELOAD_SLICE_MS, self._slice)
 
 
 class AppShellQt(QMainWindow):
@@ -140,13 +363,10 @@ class AppShellQt(QMainWindow):
         # Navigation state & injection for pages
         self.current_route: Optional[str] = None
         self.history: list[str] = []
-        # Inject navigation callbacks to pages that support it
-        try:
-            for route, widget in self.router.iter_pages():
-                if hasattr(widget, "set_nav_callback") and callable(getattr(widget, "set_nav_callback")):
-                    widget.set_nav_callback(self._navigate)
-        except Exception:
-            pass
+        # Inject navigation callbacks to pages that support it (as they get built)
+        self.router.page_built.append(self._wire_page)
+        for route, widget in self.router.iter_pages():
+            self._wire_page(route, widget)
 
         # Bind ESC to go back
         try:
@@ -155,17 +375,86 @@ class AppShellQt(QMainWindow):
         except Exception:
             pass
 
+        # Route histogram (per user) + idle preloading once the first page has painted
+        self.route_stats = getattr(services, "route_stats", None)
+        if self.route_stats is None and RouteStats is not None:
+            try:
+                self.route_stats = RouteStats(default_stats_path())
+            except Exception:
+                self.route_stats = None
+        self.preloader = PagePreloader(self.router, self)
+        self._first_page: Optional[QWidget] = None
+        self.router.page_built.append(self._watch_first_paint)
+
         # Start on requested route
         self._navigate(start_route if start_route else "Home")
 
+    def _wire_page(self, route: str, widget: QWidget):
+        try:
+            if hasattr(widget, "set_nav_callback") and callable(getattr(widget, "set_nav_callback")):
+                widget.set_nav_callback(self._navigate)
+        except Exception:
+            pass
+
+    # ---------- preloading ----------
+    def _watch_first_paint(self, route: str, widget: QWidget):
+        self.router.page_built.remove(self._watch_first_paint)
+        self._first_page = widget
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self._first_page and event.type() == QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            self._first_page = None
+            if startup_trace is not None:
+                startup_trace.mark("first-paint", "startup", route=self.current_route)
+            QTimer.singleShot(0, self._warm_services)  # after this paint has been flushed
+            QTimer.singleShot(0, self._start_preload)
+        return super().eventFilter(obj, event)
+
+    def _warm_services(self):
+        # services that open lazily (main_qt.Services) open in the background from here on
+        warm = getattr(self.services, "warm", None)
+        if callable(warm):
+            try:
+                warm()
+            except Exception:
+                pass
+
+    def _user_key(self) -> str:
+        user = permissions.current_user() if permissions is not None else None
+        return (user or {}).get("username", "") if isinstance(user, dict) else ""
+
+    def _start_preload(self):
+        routes: List[str] = []
+        if self.route_stats is not None:
+            routes = self.route_stats.top(self._user_key(), PRELOAD_COUNT, exclude=[self.current_route or ""])
+        if not routes:
+            routes = [r for r in PRELOAD_DEFAULT if r != self.current_route]
+        self.preloader.start(routes)
+
+    def closeEvent(self, event):
+        self.preloader.stop()
+        if self.route_stats is not None:
+            try:
+                self.route_stats.flush()
+            except Exception:
+                pass
+        if fetch_pool is not None:
+            fetch_pool.shutdown()  # drop queued page fetches; running ones finish on daemon threads
+        super().closeEvent(event)
+
     def _navigate(self, route: str):
         if not route:
             return
-        if self.current_route and self.current_route != route:
-            self.history.append(self.current_route)
         try:
-            self.router.goto(route)
+            if not self.router.goto(route):
+                return  # unknown route or not permitted: stay put
+            if self.current_route and self.current_route != route:
+                self.history.append(self.current_route)
             self.current_route = route
+            if self.route_stats is not None:
+                self.route_stats.record(self._user_key(), route)
         except Exception:
             try:
                 self.router.goto("Home")
@@ -176,5 +465,5 @@ class AppShellQt(QMainWindow):
     def _go_back(self):
         if self.history:
             prev = self.history.pop()
-            self.router.goto(prev)
-            self.current_route = prev
+            if self.router.goto(prev):
+                self.current_route = prev